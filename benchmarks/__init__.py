@@ -0,0 +1 @@
+"""Benchmarks for pystitch, see suite.py. Run with python -m benchmarks."""
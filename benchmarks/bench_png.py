@@ -0,0 +1,112 @@
+"""PNG rasteriser benchmark.
+
+Run from the repository root::
+
+    python benchmarks/bench_png.py
+    python benchmarks/bench_png.py --stitches 100000 --linewidth 5 --fancy
+    python benchmarks/bench_png.py --encode
+
+Rasterises the same synthetic pattern with each rasteriser and reports the best
+of ``--repeat`` runs, excluding PNG encoding. ``plot`` is the per-pixel reference, ``spans`` the pure
+Python span rasteriser and ``numpy`` the vectorised path, when NumPy is
+installed. All modes must produce identical images. ``--encode`` instead times
+PNG encoding of the rendered image for each compression level and row filter.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bench_writers import build_pattern  # noqa: E402
+from pystitch import PngWriter  # noqa: E402
+
+
+PngBuffer = PngWriter.PngBuffer
+
+
+class SpanBuffer(PngBuffer):
+    def __init__(self, width, height):
+        PngBuffer.__init__(self, width, height)
+        self.use_numpy = False
+
+
+class PlotBuffer(SpanBuffer):
+    """Draws every line pixel by pixel through plot()."""
+
+    def draw_line(self, x0, y0, x1, y1):
+        self.plot_line(x0, y0, x1, y1)
+
+
+MODES = {"plot": PlotBuffer, "spans": SpanBuffer}
+if PngWriter.numpy is not None:
+    MODES["numpy"] = PngBuffer
+
+
+def rasterise(pattern, buffer_class, linewidth, fancy):
+    """Draws the stitch blocks as PngWriter.write() does, timing only the drawing."""
+    extends = pattern.bounds()
+    pattern = pattern.copy()
+    pattern.translate(-extends[0], -extends[1])
+    draw_buff = buffer_class(int(extends[2] - extends[0]), int(extends[3] - extends[1]))
+    draw_buff.line_width = linewidth
+    draw_buff.fancy = fancy
+    start = time.perf_counter()
+    for block, thread in pattern.get_as_stitchblock():
+        draw_buff.set_color(thread.get_red(), thread.get_green(), thread.get_blue(), 255)
+        draw_buff.draw_polyline([(int(stitch[0]), int(stitch[1])) for stitch in block])
+    return time.perf_counter() - start, bytes(draw_buff.buf)
+
+
+def bench_encode(pattern, repeat):
+    _, image = rasterise(pattern, PngBuffer, 3, True)
+    extends = pattern.bounds()
+    width = int(extends[2] - extends[0]) + 3
+    height = int(extends[3] - extends[1]) + 3
+    print("%d x %d pixels, best of %d" % (width, height, repeat))
+    print("%-9s %5s %10s %12s" % ("filter", "level", "ms", "bytes"))
+    for png_filter in ("none", "sub", "up", "paeth", "adaptive"):
+        for level in (1, 6, 9):
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                data = PngWriter.write_png(image, width, height, level, png_filter)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print("%-9s %5d %10.1f %12d" % (png_filter, level, best * 1000.0, len(data)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modes", nargs="*", default=list(MODES))
+    parser.add_argument("--stitches", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--linewidth", type=int, default=3)
+    parser.add_argument("--fancy", action="store_true")
+    parser.add_argument("--encode", action="store_true")
+    args = parser.parse_args(argv)
+
+    pattern = build_pattern(args.stitches)
+    if args.encode:
+        bench_encode(pattern, args.repeat)
+        return
+    print(
+        "%d stitches, linewidth %d, fancy %s, best of %d"
+        % (len(pattern.stitches), args.linewidth, args.fancy, args.repeat)
+    )
+    reference = None
+    for mode in args.modes:
+        best = None
+        for _ in range(args.repeat):
+            elapsed, image = rasterise(pattern, MODES[mode], args.linewidth, args.fancy)
+            best = elapsed if best is None else min(best, elapsed)
+        if reference is None:
+            reference = image
+        same = "same" if image == reference else "DIFFERENT"
+        print("%-6s %10.1f ms  %s" % (mode, best * 1000.0, same))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Write-throughput benchmarks for the binary embroidery writers.
+
+Run from the repository root::
+
+    python benchmarks/bench_writers.py
+    python benchmarks/bench_writers.py pes vp3 --stitches 200000 --repeat 7
+    python benchmarks/bench_writers.py --sink unbuffered
+
+Each format writes the same synthetic pattern to an in-memory stream. Stitch
+encoding is done once up front so only the writer itself is timed. The best of
+``--repeat`` runs is reported together with the output size and throughput.
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pystitch  # noqa: E402
+from pystitch import EmbPattern  # noqa: E402
+
+BINARY_FORMATS = ("dst", "exp", "jef", "pec", "pes", "pmv", "tbf", "u01", "vp3", "xxx")
+
+
+def build_pattern(stitch_count, colors=12, seed=1):
+    """Random walk of stitches and jumps spread over several colours."""
+    rng = random.Random(seed)
+    pattern = EmbPattern()
+    per_color = max(1, stitch_count // colors)
+    x = y = 0.0
+    for color in range(colors):
+        pattern.add_thread({"color": rng.randint(0, 0xFFFFFF), "description": "Color %d" % color})
+        for i in range(per_color):
+            x = max(-1000.0, min(1000.0, x + rng.uniform(-40, 40)))
+            y = max(-1000.0, min(1000.0, y + rng.uniform(-40, 40)))
+            if i % 500 == 0:
+                pattern.move_abs(x, y)
+            else:
+                pattern.stitch_abs(x, y)
+        pattern.trim()
+        if color != colors - 1:
+            pattern.color_change()
+    pattern.end()
+    return pattern
+
+
+def normalized_for(writer, pattern, settings=None):
+    """Returns the pattern as write_embroidery hands it to writer.write()."""
+    captured = []
+
+    class Capture:
+        def __getattr__(self, name):
+            return getattr(writer, name)
+
+        @staticmethod
+        def write(normalized, f, settings=None):
+            captured.append(normalized)
+
+    EmbPattern.write_embroidery(Capture(), pattern, io.BytesIO(), settings)
+    return captured[0]
+
+
+def open_sink(sink):
+    if sink == "unbuffered":
+        # Every write is a system call, as with sockets and pipes.
+        return tempfile.TemporaryFile(buffering=0)
+    return io.BytesIO()
+
+
+def bench_format(pattern, extension, repeat, settings=None, sink="memory"):
+    """Times writer.write() alone, excluding stitch encoding, best of repeat."""
+    writer = pystitch.format_registry.get_writer(extension)
+    normalized = normalized_for(writer, pattern, settings)
+    best = None
+    size = 0
+    for _ in range(repeat):
+        # Writers may adjust the pattern (colour counts, stops) as they go.
+        copy = normalized.copy()
+        stream = open_sink(sink)
+        start = time.perf_counter()
+        writer.write(copy, stream, settings)
+        elapsed = time.perf_counter() - start
+        size = stream.tell()
+        stream.close()
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("formats", nargs="*", default=BINARY_FORMATS)
+    parser.add_argument("--stitches", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sink", choices=("memory", "unbuffered"), default="memory")
+    args = parser.parse_args(argv)
+
+    pattern = build_pattern(args.stitches)
+    print(
+        "%d stitches, best of %d, %s sink" % (len(pattern.stitches), args.repeat, args.sink)
+    )
+    print("%-6s %10s %12s %10s" % ("format", "ms", "bytes", "MB/s"))
+    for extension in args.formats:
+        settings = {"date": "20240101000000"} if extension == "jef" else None
+        elapsed, size = bench_format(pattern, extension, args.repeat, settings, args.sink)
+        print(
+            "%-6s %10.2f %12d %10.2f"
+            % (extension, elapsed * 1000.0, size, size / elapsed / 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main()
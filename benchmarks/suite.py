@@ -0,0 +1,209 @@
+"""Read, encode and write benchmarks across formats and pattern sizes.
+
+Run from the repository root::
+
+    python -m benchmarks
+    python -m benchmarks --sizes 10000 100000 --formats dst pes json
+    python -m benchmarks --output new.json --compare baseline.json
+
+or ``nox -s bench -- --compare baseline.json``.
+
+Each size builds one synthetic pattern with bench_writers.build_pattern(). For
+every format up to three phases are measured: ``normalize``
+(get_normalized_pattern() with the writer's settings, for formats that encode),
+``write`` (writer.write() on the normalized pattern) and ``read`` (reading the
+written bytes back, for formats with a reader). The best of ``--repeat`` runs is
+kept. Peak memory is measured with tracemalloc in a separate, untimed run so
+tracing does not skew the timings.
+
+Results are saved as JSON. With ``--compare`` each phase is checked against an
+earlier results file; a phase slower, or using more memory, than the baseline by
+more than ``--threshold`` is reported as a regression and the exit status is 1.
+"""
+
+import argparse
+import datetime
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from .bench_writers import BINARY_FORMATS, build_pattern, normalized_for
+
+import pystitch
+from pystitch import EmbPattern
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+DEFAULT_FORMATS = BINARY_FORMATS + ("csv", "json", "pyst")
+PHASES = ("normalize", "write", "read")
+SETTINGS = {"deterministic": True}
+
+
+def best_time(function, repeat):
+    """Returns the fastest of repeat calls to function and its last result."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def peak_memory(function):
+    """Returns the peak bytes allocated while function runs."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        function()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def phase_functions(pattern, extension):
+    """Returns {phase: function} for the phases extension supports."""
+    writer = pystitch.format_registry.get_writer(extension)
+    reader = pystitch.format_registry.get_reader(extension)
+    text_mode = getattr(writer, "WRITE_FILE_IN_TEXT_MODE", False)
+    normalized = normalized_for(writer, pattern, SETTINGS)
+
+    def normalize():
+        return normalized_for(writer, pattern, SETTINGS)
+
+    def write():
+        # Writers may adjust the pattern (colour counts, stops) as they go.
+        stream = io.StringIO() if text_mode else io.BytesIO()
+        writer.write(normalized.copy(), stream, SETTINGS)
+        data = stream.getvalue()
+        return data.encode("utf8") if text_mode else data
+
+    functions = {"write": write}
+    if getattr(writer, "ENCODE", True):
+        functions["normalize"] = normalize
+    if reader is not None:
+        data = write()
+
+        def read():
+            return EmbPattern.read_embroidery(reader, data)
+
+        functions["read"] = read
+    return functions
+
+
+def run(sizes, formats, repeat, log=None):
+    """Runs every phase for each size and format, returning the results dict."""
+    results = {}
+    for size in sizes:
+        pattern = build_pattern(size)
+        stitches = len(pattern.stitches)
+        for extension in formats:
+            functions = phase_functions(pattern, extension)
+            for phase in PHASES:
+                if phase not in functions:
+                    continue
+                seconds, value = best_time(functions[phase], repeat)
+                entry = {
+                    "format": extension,
+                    "stitches": stitches,
+                    "phase": phase,
+                    "seconds": seconds,
+                    "stitches_per_second": stitches / seconds if seconds else None,
+                    "peak_bytes": peak_memory(functions[phase]),
+                }
+                if phase == "write":
+                    entry["output_bytes"] = len(value)
+                key = "%s/%d/%s" % (extension, size, phase)
+                results[key] = entry
+                if log is not None:
+                    print(
+                        "%-24s %10.2f ms %12.0f st/s %10.1f MB peak"
+                        % (
+                            key,
+                            seconds * 1000.0,
+                            entry["stitches_per_second"] or 0,
+                            entry["peak_bytes"] / 1e6,
+                        ),
+                        file=log,
+                    )
+    return results
+
+
+def environment():
+    try:
+        from importlib.metadata import version
+
+        pystitch_version = version("pystitch")
+    except Exception:
+        pystitch_version = "unknown"
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "pystitch": pystitch_version,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Returns (key, metric, baseline, current, ratio) for each regression.
+
+    Only keys present in both results are compared."""
+    regressions = []
+    for key, entry in sorted(results.items()):
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            old = previous.get(metric)
+            new = entry.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            if ratio > 1.0 + threshold:
+                regressions.append((key, metric, old, new, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--formats", nargs="+", default=DEFAULT_FORMATS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output", default="bench_results.json", help="results file (default bench_results.json)"
+    )
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown or memory growth flagged as a regression (default 0.10)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.formats, args.repeat, log=sys.stdout)
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+        f.write("\n")
+    print("results written to %s" % args.output)
+
+    if args.compare is None:
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline["results"], args.threshold)
+    for key, metric, old, new, ratio in regressions:
+        print("REGRESSION %-24s %-10s %.6g -> %.6g (x%.2f)" % (key, metric, old, new, ratio))
+    if regressions:
+        return 1
+    print("no regressions beyond %d%% against %s" % (args.threshold * 100, args.compare))
+    return 0
@@ -74,3 +74,10 @@ def audit(session: nox.Session) -> None:
     """Run dependency vulnerability audit with waiver policy."""
     install_dev(session)
     session.run("python", ".ci/audit_with_waivers.py")
+
+
+@nox.session(python=["3.13"])
+def bench(session: nox.Session) -> None:
+    """Run the benchmark suite; pass options after --, e.g. -- --compare baseline.json."""
+    session.install("-e", ".")
+    session.run("python", "-m", "benchmarks", *session.posargs)
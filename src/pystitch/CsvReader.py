@@ -9,27 +9,19 @@ def read(f: TextIO, out: EmbPattern, settings=None):
     import csv
 
     csv_reader = csv.reader(f, delimiter=",")
-    command_dict = get_command_dictionary()
+    # Stitch rows are collected and appended to the pattern in bulk.
+    stitches = []
     for row in csv_reader:
         if len(row) == 0:
             continue
         if "*" in row[0]:
-            split = row[2].split(" ")
-            command = command_dict[split[0]]
-            for sp in split[1:]:
-                if sp[0] == "n":
-                    needle = int(sp[1:])
-                    command |= (needle + 1) << 16
-                if sp[0] == "o":
-                    order = int(sp[1:])
-                    command |= (order + 1) << 24
-                if sp[0] == "t":
-                    thread = int(sp[1:])
-                    command |= (thread + 1) << 8
+            command = decode_command_name(row[2])
             if len(row) == 3:
+                out.add_stitches_absolute(stitches)
+                stitches = []
                 out.add_command(command)
             else:
-                out.add_stitch_absolute(command, float(row[3]), float(row[4]))
+                stitches.append([float(row[3]), float(row[4]), command])
         elif "#" in row[0]:
             continue
         elif "@" in row[0]:
@@ -75,3 +67,4 @@ def read(f: TextIO, out: EmbPattern, settings=None):
                 except IndexError:
                     pass
             out.add_thread(thread_add)
+    out.add_stitches_absolute(stitches)
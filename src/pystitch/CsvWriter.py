@@ -1,4 +1,5 @@
 import math
+from itertools import islice
 from typing import BinaryIO
 
 from .EmbFunctions import *
@@ -10,14 +11,26 @@ ENCODE = False
 WRITES_SPEEDS = True
 SEQUIN_CONTINGENCY = CONTINGENCY_SEQUIN_UTILIZE
 
+ROW_CHUNK = 4096  # rows joined into a single write.
+
+
+def csv_row(count):
+    """Returns the format string for a row of count quoted values."""
+    return ",".join(['"%s"'] * count) + "\n"
+
 
 def csv(f: BinaryIO, values):
-    string = ""
-    for v in values:
-        if len(string) > 0:
-            string += ","
-        string += '"%s"' % v
-    write_string_utf8(f, string + "\n")
+    write_string_utf8(f, csv_row(len(values)) % tuple(values))
+
+
+def write_rows(f: BinaryIO, rows):
+    """Writes formatted rows, ROW_CHUNK at a time."""
+    rows = iter(rows)
+    while True:
+        chunk = "".join(islice(rows, ROW_CHUNK))
+        if not chunk:
+            break
+        write_string_utf8(f, chunk)
 
 
 def distance(dx, dy):
@@ -131,8 +144,21 @@ def decoded_name(names, data):
     return name
 
 
+class CommandNames(dict):
+    """Maps command values to their decoded names, decoding each value once."""
+
+    def __init__(self):
+        super().__init__()
+        self.names = get_common_name_dictionary()
+
+    def __missing__(self, data):
+        name = decoded_name(self.names, data)
+        self[data] = name
+        return name
+
+
 def write_stitches_displacement(pattern: EmbPattern, f: BinaryIO):
-    names = get_common_name_dictionary()
+    names = CommandNames()
     csv(
         f,
         (
@@ -148,59 +174,51 @@ def write_stitches_displacement(pattern: EmbPattern, f: BinaryIO):
         ),
     )
 
-    current_x = 0
-    current_y = 0
-    for i, stitch in enumerate(pattern.stitches):
-        name = decoded_name(names, stitch[2])
-        dx = stitch[0] - current_x
-        dy = stitch[1] - current_y
-        csv(
-            f,
-            (
-                "*",
-                str(i),
-                name,
-                str(stitch[0]),
-                str(stitch[1]),
-                str(dx),
-                str(dy),
-                str(distance(dx, dy)),
-                str(angle(dx, dy)),
-            ),
-        )
-        current_x = stitch[0]
-        current_y = stitch[1]
+    def rows():
+        row = '"*",' + csv_row(8)
+        current_x = 0
+        current_y = 0
+        for i, stitch in enumerate(pattern.stitches):
+            x = stitch[0]
+            y = stitch[1]
+            dx = x - current_x
+            dy = y - current_y
+            yield row % (i, names[stitch[2]], x, y, dx, dy, distance(dx, dy), angle(dx, dy))
+            current_x = x
+            current_y = y
+
+    write_rows(f, rows())
 
 
 def write_stitches_deltas(pattern: EmbPattern, f: BinaryIO):
-    names = get_common_name_dictionary()
+    names = CommandNames()
     csv(f, ("#", "[STITCH_INDEX]", "[STITCH_TYPE]", "[X]", "[Y]", "[DX]", "[DY]"))
-    current_x = 0
-    current_y = 0
-    for i, stitch in enumerate(pattern.stitches):
-        name = decoded_name(names, stitch[2])
-        dx = stitch[0] - current_x
-        dy = stitch[1] - current_y
-        csv(f, ("*", str(i), name, str(stitch[0]), str(stitch[1]), str(dx), str(dy)))
-        current_x = stitch[0]
-        current_y = stitch[1]
+
+    def rows():
+        row = '"*",' + csv_row(6)
+        current_x = 0
+        current_y = 0
+        for i, stitch in enumerate(pattern.stitches):
+            x = stitch[0]
+            y = stitch[1]
+            yield row % (i, names[stitch[2]], x, y, x - current_x, y - current_y)
+            current_x = x
+            current_y = y
+
+    write_rows(f, rows())
 
 
 def write_stitches(pattern: EmbPattern, f: BinaryIO):
-    names = get_common_name_dictionary()
+    names = CommandNames()
     csv(f, ("#", "[STITCH_INDEX]", "[STITCH_TYPE]", "[X]", "[Y]"))
-    for i, stitch in enumerate(pattern.stitches):
-        name = decoded_name(names, stitch[2])
-        csv(
-            f,
-            (
-                "*",
-                str(i),
-                name,
-                str(stitch[0]),
-                str(stitch[1]),
-            ),
-        )
+    row = '"*",' + csv_row(4)
+    write_rows(
+        f,
+        (
+            row % (i, names[stitch[2]], stitch[0], stitch[1])
+            for i, stitch in enumerate(pattern.stitches)
+        ),
+    )
 
 
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
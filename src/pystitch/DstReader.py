@@ -1,6 +1,8 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
+from .EmbProgress import progress_for
+from .ReadHelper import read_view
 
 
 def getbit(b, pos):
@@ -71,26 +73,32 @@ def dst_read_header(f: BinaryIO, out: EmbPattern):
 
 def dst_read_stitches(f: BinaryIO, out: EmbPattern, settings=None):
     sequin_mode = False
-    while True:
-        byte = bytearray(f.read(3))
-        if len(byte) != 3:
+    data = read_view(f)
+    progress = progress_for(settings, len(data))
+    checkpoint = progress.next
+    for i in range(0, len(data) - 2, 3):
+        if i >= checkpoint:
+            checkpoint = progress.update(i)
+        b0 = data[i]
+        b1 = data[i + 1]
+        b2 = data[i + 2]
+        dx = decode_dx(b0, b1, b2)
+        dy = decode_dy(b0, b1, b2)
+        if b2 & 0b11110011 == 0b11110011:
             break
-        dx = decode_dx(byte[0], byte[1], byte[2])
-        dy = decode_dy(byte[0], byte[1], byte[2])
-        if byte[2] & 0b11110011 == 0b11110011:
-            break
-        elif byte[2] & 0b11000011 == 0b11000011:
+        elif b2 & 0b11000011 == 0b11000011:
             out.color_change(dx, dy)
-        elif byte[2] & 0b01000011 == 0b01000011:
+        elif b2 & 0b01000011 == 0b01000011:
             out.sequin_mode(dx, dy)
             sequin_mode = not sequin_mode
-        elif byte[2] & 0b10000011 == 0b10000011:
+        elif b2 & 0b10000011 == 0b10000011:
             if sequin_mode:
                 out.sequin_eject(dx, dy)
             else:
                 out.move(dx, dy)
         else:
             out.stitch(dx, dy)
+    progress.finish()
     out.end()
 
     count_max = 3
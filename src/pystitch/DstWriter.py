@@ -2,7 +2,7 @@ from typing import BinaryIO
 
 from .EmbConstant import *
 from .EmbPattern import EmbPattern
-from .WriteHelper import write_string_utf8
+from .WriteHelper import buffered, pad_to, write_string_utf8
 
 SEQUIN_CONTINGENCY = CONTINGENCY_SEQUIN_UTILIZE
 FULL_JUMP = False
@@ -107,6 +107,7 @@ def encode_record(x, y, flags):
     return bytes(bytearray([b0, b1, b2]))
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     extended_header = False
     trim_at = 3
@@ -162,8 +163,7 @@ def write(pattern: EmbPattern, f: BinaryIO, settings=None):
                     % (thread.hex_color(), thread.description, thread.catalog_number),
                 )
     f.write(b"\x1a")
-    for i in range(f.tell(), DSTHEADERSIZE):
-        f.write(b"\x20")  # space
+    pad_to(f, DSTHEADERSIZE, b"\x20")  # space
 
     stitches = pattern.stitches
     xx = 0
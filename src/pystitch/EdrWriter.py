@@ -1,11 +1,12 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
-from .WriteHelper import write_int_8
+from .WriteHelper import buffered, write_int_8
 
 ENCODE = False
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     if len(pattern.threadlist) > 0:
         for thread in pattern.threadlist:
@@ -0,0 +1,136 @@
+"""Converts many files at once across a pool of worker processes."""
+
+import os
+import pickle
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .EmbPattern import EmbPattern
+
+
+class ConvertResult:
+    """The outcome of one convert_many() job.
+
+    error holds the exception raised by the job, or None if it succeeded, and
+    traceback its formatted traceback. elapsed is the time the job took in
+    seconds, measured in the worker."""
+
+    __slots__ = ("index", "source", "destination", "error", "traceback", "elapsed")
+
+    def __init__(self, index, source, destination, error=None, traceback=None, elapsed=0.0):
+        self.index = index
+        self.source = source
+        self.destination = destination
+        self.error = error
+        self.traceback = traceback
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.error is None:
+            status = "ok"
+        else:
+            status = "error=%r" % self.error
+        return "ConvertResult(%d, %r -> %r, %s, %.3fs)" % (
+            self.index,
+            self.source,
+            self.destination,
+            status,
+            self.elapsed,
+        )
+
+
+def _picklable(error):
+    try:
+        pickle.dumps(error)
+    except Exception:
+        return RuntimeError(repr(error))
+    return error
+
+
+def _convert_job(index, source, destination, settings):
+    from . import read, write
+
+    start = time.perf_counter()
+    try:
+        pattern = read(source, settings)
+        if pattern is None:
+            raise IOError(
+                "Conversion from file type '{extension}' is not supported".format(
+                    extension=EmbPattern.get_extension_by_filename(source)
+                )
+            )
+        write(pattern, destination, settings)
+    except Exception as e:
+        return ConvertResult(
+            index,
+            source,
+            destination,
+            _picklable(e),
+            traceback.format_exc(),
+            time.perf_counter() - start,
+        )
+    return ConvertResult(index, source, destination, elapsed=time.perf_counter() - start)
+
+
+def _convert_chunk(chunk):
+    return [_convert_job(*job) for job in chunk]
+
+
+def _normalize_jobs(jobs):
+    normalized = []
+    for index, job in enumerate(jobs):
+        if len(job) == 2:
+            source, destination = job
+            settings = None
+        else:
+            source, destination, settings = job
+        normalized.append((index, source, destination, settings))
+    return normalized
+
+
+def iter_convert_many(jobs, workers=None, chunksize=None, ordered=True):
+    """Converts each (source, destination[, settings]) job, yielding ConvertResults.
+
+    Jobs are sent to a pool of `workers` processes (default os.cpu_count())
+    `chunksize` jobs at a time. Results are yielded in job order, or as each
+    chunk completes when ordered is False. A job that fails, or whose worker
+    dies, yields a result carrying the error instead of stopping the batch.
+    With workers=1 the jobs run in this process."""
+    jobs = _normalize_jobs(jobs)
+    if not jobs:
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+    if workers == 1:
+        for job in jobs:
+            yield _convert_job(*job)
+        return
+    if chunksize is None:
+        # A few chunks per worker balances uneven job sizes against overhead.
+        chunksize = max(1, min(64, len(jobs) // (workers * 4)))
+    chunks = [jobs[i : i + chunksize] for i in range(0, len(jobs), chunksize)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_convert_chunk, chunk): chunk for chunk in chunks}
+        for future in futures if ordered else as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                results = [
+                    ConvertResult(index, source, destination, e, traceback.format_exc())
+                    for index, source, destination, settings in futures[future]
+                ]
+            for result in results:
+                yield result
+
+
+def convert_many(jobs, workers=None, chunksize=None, ordered=True):
+    """Converts each (source, destination[, settings]) job, in parallel.
+
+    Returns the list of ConvertResults, see iter_convert_many()."""
+    return list(iter_convert_many(jobs, workers, chunksize, ordered))
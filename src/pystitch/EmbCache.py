@@ -0,0 +1,262 @@
+"""Content-addressed on-disk cache of converted files."""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from .EmbPattern import EmbPattern
+
+# Bumped when the key or the layout of the cache directory changes.
+CACHE_VERSION = 1
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+# A full cache is evicted down to this fraction of max_size, so the directory
+# is only scanned once every so many stores rather than on each one.
+EVICT_TARGET = 0.9
+TEMP_PREFIX = ".tmp-"
+
+_library_version = None
+
+
+def library_version():
+    global _library_version
+    if _library_version is None:
+        try:
+            from importlib.metadata import PackageNotFoundError, version
+        except ImportError:
+            _library_version = "unknown"
+        else:
+            try:
+                _library_version = version("pystitch")
+            except PackageNotFoundError:
+                _library_version = "unknown"
+    return _library_version
+
+
+def resolve_settings(settings=None):
+    """Returns a copy of settings with deterministic output turned on, unless
+    it was turned off explicitly, so cached and fresh outputs match."""
+    if settings is None:
+        settings = {}
+    else:
+        settings = dict(settings)
+    settings.setdefault("deterministic", True)
+    return settings
+
+
+def pattern_digest(pattern):
+    """Returns a sha256 hex digest of the stitches, threads and extras of pattern."""
+    digest = hashlib.sha256()
+    digest.update(repr(pattern.stitches).encode("utf8"))
+    for thread in pattern.threadlist:
+        digest.update(
+            repr(
+                (
+                    thread.color,
+                    thread.description,
+                    thread.catalog_number,
+                    thread.details,
+                    thread.brand,
+                    thread.chart,
+                    thread.weight,
+                )
+            ).encode("utf8")
+        )
+    extras = sorted(pattern.extras.items(), key=lambda item: str(item[0]))
+    digest.update(repr(extras).encode("utf8"))
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """Caches writer output on disk, keyed by a hash of what produced it.
+
+    The key covers the input (file bytes or pattern contents), the source and
+    target formats, the resolved settings and the library version. Entries are
+    written atomically, so concurrent processes may share a directory. When
+    the entries exceed max_size bytes the least recently used are removed.
+
+    The total size is scanned once, then kept as a running estimate updated
+    by each store; eviction rescans the directory and corrects it. Entries
+    other processes add are only counted from the next eviction."""
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, digest, source_extension, extension, settings=None):
+        """Returns the cache key for an input digest converted with settings."""
+        settings = resolve_settings(settings)
+        # These observe or abort a conversion without changing its output.
+        for key in ("instrument", "progress", "cancel"):
+            settings.pop(key, None)
+        description = json.dumps(
+            {
+                "cache": CACHE_VERSION,
+                "version": library_version(),
+                "input": digest,
+                "from": source_extension.lower(),
+                "to": extension.lower(),
+                "settings": settings,
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(description.encode("utf8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """Returns the cached bytes for key, or None."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except (IOError, OSError):
+            return None
+        self._touch(path)
+        return data
+
+    def put(self, key, data):
+        """Stores data under key."""
+        handle, temp = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=self.directory)
+        try:
+            with os.fdopen(handle, "wb") as f:
+                f.write(data)
+        except BaseException:
+            os.remove(temp)
+            raise
+        self._store(key, temp)
+
+    def convert(self, filename_from, filename_to, settings=None):
+        """Converts like pystitch.convert(), reusing a cached output when the
+        source bytes, formats and settings match an earlier conversion.
+
+        Returns True if the output came from the cache."""
+        from . import format_registry
+
+        with open(filename_from, "rb") as f:
+            data = f.read()
+        source_extension = EmbPattern.get_extension_by_filename(filename_from)
+        extension = EmbPattern.get_extension_by_filename(filename_to)
+        key = self.key(hashlib.sha256(data).hexdigest(), source_extension, extension, settings)
+        if self._copy_out(key, filename_to):
+            return True
+        self.misses += 1
+        reader = format_registry.get_reader(source_extension)
+        pattern = EmbPattern.read_embroidery(reader, data, settings)
+        if pattern is None:
+            return False
+        self._write_through(key, pattern, filename_to, settings)
+        return False
+
+    def write(self, pattern, filename, settings=None):
+        """Writes like pystitch.write(), reusing a cached output when the
+        pattern contents, format and settings match an earlier write.
+
+        Returns True if the output came from the cache."""
+        extension = EmbPattern.get_extension_by_filename(filename)
+        key = self.key(pattern_digest(pattern), "", extension, settings)
+        if self._copy_out(key, filename):
+            return True
+        self.misses += 1
+        self._write_through(key, pattern, filename, settings)
+        return False
+
+    def size(self):
+        """Returns the total size in bytes of the cached entries."""
+        return sum(size for path, size, accessed in self._entries())
+
+    def evict(self, max_size=None):
+        """Removes least recently used entries until at most max_size bytes remain."""
+        if max_size is None:
+            max_size = self.max_size
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for path, size, accessed in entries)
+        for path, size, accessed in entries:
+            if total <= max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._size = total
+
+    def clear(self):
+        self.evict(0)
+
+    def _entries(self):
+        for directory, subdirectories, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith(TEMP_PREFIX):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    status = os.stat(path)
+                except OSError:
+                    continue
+                yield path, status.st_size, status.st_mtime
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _copy_out(self, key, filename):
+        path = self.path(key)
+        try:
+            shutil.copyfile(path, filename)
+        except (IOError, OSError):
+            return False
+        self._touch(path)
+        self.hits += 1
+        return True
+
+    def _write_through(self, key, pattern, filename, settings):
+        from . import format_registry
+
+        extension = EmbPattern.get_extension_by_filename(filename).lower()
+        if format_registry.get(extension) is None:
+            raise IOError(
+                "Conversion to file type '{extension}' is not supported".format(extension=extension)
+            )
+        writer = format_registry.get_writer(extension)
+        if not writer:
+            raise IOError("No supported writer found.")
+        handle, temp = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=self.directory)
+        os.close(handle)
+        try:
+            EmbPattern.write_embroidery(writer, pattern, temp, resolve_settings(settings))
+            shutil.copyfile(temp, filename)
+        except BaseException:
+            os.remove(temp)
+            raise
+        self._store(key, temp)
+
+    def _store(self, key, temp):
+        if self._size is None:
+            self._size = self.size()
+        path = self.path(key)
+        try:
+            added = os.path.getsize(temp)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                added -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(temp, path)
+        except OSError:
+            os.remove(temp)
+            raise
+        self._size += added
+        if self._size > self.max_size:
+            self.evict(int(self.max_size * EVICT_TARGET))
+
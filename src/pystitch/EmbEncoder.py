@@ -2,6 +2,7 @@ import math
 
 from .EmbFunctions import *
 from .EmbMatrix import EmbMatrix
+from .EmbProgress import make_progress
 
 
 class Transcoder:
@@ -28,6 +29,8 @@ class Transcoder:
 
         self.writes_speeds = settings.get("writes_speeds", True)
         self.explicit_trim = settings.get("explicit_trim", False)
+        self.progress = settings.get("progress")
+        self.cancel = settings.get("cancel")
 
         self.tie_on_contingency = settings.get("tie_on", CONTINGENCY_TIE_ON_NONE)
         if self.tie_on_contingency is True:
@@ -197,8 +200,12 @@ class Transcoder:
         if self.thread_change_command == NEEDLE_SET:
             self.destination_pattern.threadlist.extend(self.source_pattern.threadlist)
 
+        progress = make_progress(self.progress, self.cancel, len(source))
+        checkpoint = progress.next
         flags = NO_COMMAND
         for self.position, self.stitch in enumerate(source):
+            if self.position >= checkpoint:
+                checkpoint = progress.update(self.position)
             p = self.matrix.point_in_matrix_space(self.stitch)
             x = p[0]
             y = p[1]
@@ -347,6 +354,7 @@ class Transcoder:
                 self.matrix.post_rotate(self.stitch[0], q[0], q[1])
             elif flags == MATRIX_RESET:
                 self.matrix.reset()
+        progress.finish()
         if flags != END:
             self.end_here()
 
@@ -0,0 +1,153 @@
+"""Indexed registry of the file formats pystitch can read and write."""
+
+import importlib
+import sys
+import threading
+from types import MappingProxyType
+
+REQUIRED_KEYS = ("description", "extension", "mimetype", "category")
+
+
+def _normalize_extension(extension):
+    return extension.lower().lstrip(".")
+
+
+def _extensions_of(entry):
+    extensions = entry.get("extensions", ())
+    if isinstance(extensions, str):
+        extensions = (extensions,)
+    return extensions
+
+
+def resolve(value):
+    """Returns the reader/writer for a format entry value.
+
+    Entries may hold the module (or any object with read/write functions)
+    itself, or its import path as a string, which is imported on first use."""
+    if isinstance(value, str):
+        module = sys.modules.get(value)
+        if module is None:
+            module = importlib.import_module(value)
+        return module
+    return value
+
+
+class FormatRegistry:
+    """Immutable, lazily built index of supported formats.
+
+    The builtin formats come from ``provider``, a callable returning format
+    dicts in the shape yielded by ``pystitch.supported_formats()``. Readers and
+    writers may be given as import paths so that no format module is imported
+    until it is used. Nothing is built until the first lookup. Registering or
+    removing a format builds a new set of tables and swaps them in, so readers
+    of the registry never observe a partially updated index.
+    """
+
+    def __init__(self, provider):
+        self._provider = provider
+        self._registered = ()
+        self._tables = None
+        self._lock = threading.Lock()
+
+    def _get_tables(self):
+        tables = self._tables
+        if tables is None:
+            with self._lock:
+                tables = self._tables
+                if tables is None:
+                    tables = self._build(self._provider(), self._registered)
+                    self._tables = tables
+        return tables
+
+    @staticmethod
+    def _build(builtin, registered):
+        entries = {}
+        for source in (builtin, registered):
+            for file_type in source:
+                entry = MappingProxyType(dict(file_type))
+                # Re-registering an extension replaces the entry in place.
+                entries[_normalize_extension(entry["extension"])] = entry
+        formats = tuple(entries.values())
+
+        # Secondary extensions are only looked up for reading: writers produce
+        # the primary variant, which would be wrong under another extension,
+        # e.g. plain SVG text in a .svgz file.
+        by_extension = dict(entries)
+        for entry in formats:
+            for extension in _extensions_of(entry):
+                # Secondary extensions never shadow another format's primary one.
+                by_extension.setdefault(_normalize_extension(extension), entry)
+
+        by_mimetype = {}
+        for entry in formats:
+            by_mimetype.setdefault(entry["mimetype"], []).append(entry)
+        by_mimetype = {key: tuple(value) for key, value in by_mimetype.items()}
+
+        readable = frozenset(
+            extension for extension, entry in by_extension.items() if "reader" in entry
+        )
+        writable = frozenset(
+            extension for extension, entry in entries.items() if "writer" in entry
+        )
+        return formats, by_extension, by_mimetype, readable, writable, entries
+
+    def formats(self):
+        """Returns all formats, in registration order, as read-only mappings."""
+        return self._get_tables()[0]
+
+    def get(self, extension):
+        """Returns the format for the given primary or secondary extension, or
+        None if unsupported."""
+        return self._get_tables()[1].get(_normalize_extension(extension))
+
+    def get_by_mimetype(self, mimetype):
+        """Returns a tuple of the formats sharing the given mimetype."""
+        return self._get_tables()[2].get(mimetype, ())
+
+    def get_reader(self, extension):
+        """Returns the reader for the given extension, importing it if needed, or None."""
+        entry = self.get(extension)
+        if entry is None or "reader" not in entry:
+            return None
+        return resolve(entry["reader"])
+
+    def get_writer(self, extension):
+        """Returns the writer for the given primary extension, importing it if
+        needed, or None."""
+        entry = self._get_tables()[5].get(_normalize_extension(extension))
+        if entry is None or "writer" not in entry:
+            return None
+        return resolve(entry["writer"])
+
+    def can_read(self, extension):
+        return _normalize_extension(extension) in self._get_tables()[3]
+
+    def can_write(self, extension):
+        return _normalize_extension(extension) in self._get_tables()[4]
+
+    def register(self, file_type):
+        """Adds a format, replacing any format with the same primary extension.
+
+        file_type is a dict like those yielded by ``supported_formats()`` and
+        must provide a reader, a writer, or both, as objects or import paths."""
+        missing = [key for key in REQUIRED_KEYS if key not in file_type]
+        if missing:
+            raise ValueError("Format is missing required keys: %s" % ", ".join(missing))
+        if "reader" not in file_type and "writer" not in file_type:
+            raise ValueError("Format must provide a reader or a writer.")
+        entry = dict(file_type)
+        entry.setdefault("extensions", (entry["extension"],))
+        with self._lock:
+            self._registered = self._registered + (entry,)
+            self._tables = None
+
+    def unregister(self, extension):
+        """Removes previously registered formats with the given primary extension."""
+        extension = _normalize_extension(extension)
+        with self._lock:
+            self._registered = tuple(
+                entry
+                for entry in self._registered
+                if _normalize_extension(entry["extension"]) != extension
+            )
+            self._tables = None
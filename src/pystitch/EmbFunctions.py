@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from .EmbConstant import *
 
 
@@ -125,3 +127,27 @@ def get_common_name_dictionary():
         CONTINGENCY_LONG_STITCH_JUMP_NEEDLE: "CONTINGENCY_LONG_STITCH_JUMP_NEEDLE",
         CONTINGENCY_LONG_STITCH_SEW_TO: "CONTINGENCY_LONG_STITCH_SEW_TO",
     }
+
+
+_COMMAND_DICTIONARY = get_command_dictionary()
+
+
+@lru_cache(maxsize=1024)
+def decode_command_name(name):
+    """Returns the command code for a name such as "COLOR_CHANGE t1 n2 o3".
+
+    This reverses the names written by the CSV and JSON writers. Results are
+    cached per distinct string, since a file only uses a handful of them."""
+    split = name.split(" ")
+    command = _COMMAND_DICTIONARY[split[0]]
+    for sp in split[1:]:
+        if sp[0] == "n":
+            needle = int(sp[1:])
+            command |= (needle + 1) << 16
+        if sp[0] == "o":
+            order = int(sp[1:])
+            command |= (order + 1) << 24
+        if sp[0] == "t":
+            thread = int(sp[1:])
+            command |= (thread + 1) << 8
+    return command
@@ -0,0 +1,241 @@
+"""Phase timing hooks for reading, encoding and writing patterns.
+
+An instrument is any callable taking a PhaseRecord. It is given either as
+settings["instrument"] to read/write/convert, or made active for a block with
+`with Instrument():`. While no instrument is active the hooks cost one context
+variable lookup per phase."""
+
+import time
+import tracemalloc
+from contextvars import ContextVar
+from functools import wraps
+
+_active = ContextVar("pystitch_instrument", default=None)
+_open_phase = ContextVar("pystitch_phase", default=None)
+
+
+class PhaseRecord:
+    """Measurements of one phase.
+
+    depth is 0 for outermost phases and counts the phases enclosing this one,
+    e.g. an interpolate_trims post-pass run by a reader is inside "read".
+    peak_memory is the tracemalloc peak in bytes above the memory in use when
+    the phase started, or None when memory is not measured."""
+
+    __slots__ = ("phase", "depth", "elapsed", "stitches_in", "stitches_out", "peak_memory")
+
+    def __init__(self, phase, depth, elapsed, stitches_in, stitches_out, peak_memory=None):
+        self.phase = phase
+        self.depth = depth
+        self.elapsed = elapsed
+        self.stitches_in = stitches_in
+        self.stitches_out = stitches_out
+        self.peak_memory = peak_memory
+
+    def __repr__(self):
+        text = "PhaseRecord(%r, depth=%d, %.6fs, %d -> %d stitches" % (
+            self.phase,
+            self.depth,
+            self.elapsed,
+            self.stitches_in,
+            self.stitches_out,
+        )
+        if self.peak_memory is not None:
+            text += ", peak %d bytes" % self.peak_memory
+        return text + ")"
+
+
+class Instrument:
+    """Collects a PhaseRecord for each phase of the reads and writes it sees.
+
+    Use as settings["instrument"], or as a context manager to instrument every
+    read and write within the block. With memory=True tracemalloc peaks are
+    recorded too; tracing slows down the phases it measures."""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.records = []
+        self._activations = []
+
+    def __call__(self, record):
+        self.records.append(record)
+
+    def __enter__(self):
+        activation = Activation(self)
+        activation.__enter__()
+        self._activations.append(activation)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self._activations.pop().__exit__(exc_type, exc_value, tb)
+        return False
+
+    def totals(self):
+        """Returns {phase: total seconds} in the order the phases first finished."""
+        totals = {}
+        for record in self.records:
+            totals[record.phase] = totals.get(record.phase, 0.0) + record.elapsed
+        return totals
+
+
+class Activation:
+    """Makes instrument the active instrument for a with block."""
+
+    __slots__ = ("instrument", "token")
+
+    def __init__(self, instrument):
+        self.instrument = instrument
+        self.token = None
+
+    def __enter__(self):
+        self.token = _active.set(self.instrument)
+        return self.instrument
+
+    def __exit__(self, exc_type, exc_value, tb):
+        _active.reset(self.token)
+        return False
+
+
+class NoPhase:
+    """Shared no-op stand-in for Phase when nothing is instrumented."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+    def output(self, pattern):
+        pass
+
+
+NO_PHASE = NoPhase()
+
+
+class Phase:
+    """Measures one phase on pattern and reports it to instrument on exit."""
+
+    __slots__ = (
+        "instrument",
+        "name",
+        "pattern",
+        "stitches_in",
+        "depth",
+        "parent",
+        "token",
+        "start",
+        "memory",
+        "base_memory",
+        "peak",
+        "started_tracing",
+    )
+
+    def __init__(self, instrument, name, pattern):
+        self.instrument = instrument
+        self.name = name
+        self.pattern = pattern
+        self.memory = getattr(instrument, "memory", False)
+
+    def output(self, pattern):
+        """Sets the pattern the phase produced, for its stitches_out."""
+        self.pattern = pattern
+
+    def __enter__(self):
+        self.parent = parent = _open_phase.get()
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.token = _open_phase.set(self)
+        self.stitches_in = len(self.pattern.stitches)
+        self.started_tracing = False
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            # The enclosing phases keep the peak reached so far before it is reset.
+            self._raise_parents(peak)
+            tracemalloc.reset_peak()
+            self.base_memory = current
+            self.peak = current
+        self.start = time.perf_counter()
+        return self
+
+    def _raise_parents(self, peak):
+        phase = self.parent
+        while phase is not None:
+            if phase.memory and peak > phase.peak:
+                phase.peak = peak
+            phase = phase.parent
+
+    def __exit__(self, exc_type, exc_value, tb):
+        elapsed = time.perf_counter() - self.start
+        peak_memory = None
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            if peak > self.peak:
+                self.peak = peak
+            self._raise_parents(peak)
+            if self.started_tracing:
+                tracemalloc.stop()
+            peak_memory = self.peak - self.base_memory
+        _open_phase.reset(self.token)
+        if exc_type is None:
+            self.instrument(
+                PhaseRecord(
+                    self.name,
+                    self.depth,
+                    elapsed,
+                    self.stitches_in,
+                    len(self.pattern.stitches),
+                    peak_memory,
+                )
+            )
+        return False
+
+
+def active():
+    """Returns the active instrument, or None."""
+    return _active.get()
+
+
+def activate(settings):
+    """Returns a context manager making settings["instrument"] active, if it is
+    given and not already active."""
+    if not settings:
+        return NO_PHASE
+    instrument = settings.get("instrument")
+    if instrument is None or instrument is _active.get():
+        return NO_PHASE
+    return Activation(instrument)
+
+
+def phase(name, pattern):
+    """Returns a context manager measuring the phase name on pattern for the
+    active instrument, or NO_PHASE if there is none."""
+    instrument = _active.get()
+    if instrument is None:
+        return NO_PHASE
+    return Phase(instrument, name, pattern)
+
+
+def measured(name):
+    """Decorates a pattern method so each call is measured as the phase name.
+
+    A returned pattern, as from get_normalized_pattern(), is the phase output."""
+
+    def decorate(method):
+        @wraps(method)
+        def measured_method(self, *args, **kwargs):
+            instrument = _active.get()
+            if instrument is None:
+                return method(self, *args, **kwargs)
+            with Phase(instrument, name, self) as measuring:
+                result = method(self, *args, **kwargs)
+                if hasattr(result, "stitches"):
+                    measuring.output(result)
+            return result
+
+        return measured_method
+
+    return decorate
@@ -1,12 +1,21 @@
+import io
+import mmap
 import os
+import random
 from typing import Any
 
 from .EmbEncoder import Transcoder as Normalizer
 from .EmbFunctions import *
-from .EmbThread import EmbThread
+from .EmbInstrument import activate, measured, phase
+from .EmbProgress import check_cancelled
+from .EmbThread import EmbThread, intern_thread
+from .ReadHelper import BufferReader
 
 
 class EmbPattern:
+    # Seeds the colours of filler threads, see get_thread_or_filler().
+    filler_seed = None
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self.stitches: list = []
         self.threadlist: list = []
@@ -132,6 +141,7 @@ class EmbPattern:
         emb_pattern.extras.update(self.extras)
         emb_pattern._previousX = self._previousX
         emb_pattern._previousY = self._previousY
+        emb_pattern.filler_seed = self.filler_seed
         return emb_pattern
 
     def clear(self):
@@ -280,15 +290,25 @@ class EmbPattern:
         return len(self.threadlist)
 
     @staticmethod
-    def get_random_thread():
+    def get_random_thread(rng=None):
+        """Returns a thread of random color, drawn from rng if given."""
         thread = EmbThread()
-        thread.set("random")
+        if rng is None:
+            thread.set("random")
+        else:
+            thread.color = rng.randint(0, 0xFFFFFF)
         thread.description = "Random"
         return thread
 
     def get_thread_or_filler(self, index):
+        """Returns the thread at index, or a random filler thread if there is none.
+
+        When filler_seed is set the filler's color depends only on the seed
+        and index, so repeated writes produce the same threads."""
         if len(self.threadlist) <= index:
-            return self.get_random_thread()
+            if self.filler_seed is None:
+                return self.get_random_thread()
+            return self.get_random_thread(random.Random("%s:%d" % (self.filler_seed, index)))
         else:
             return self.threadlist[index]
 
@@ -426,6 +446,15 @@ class EmbPattern:
         self._previousX = x
         self._previousY = y
 
+    def add_stitches_absolute(self, stitches):
+        """Add [x, y, cmd] stitch lists at their absolute locations in one step.
+        The lists are appended as given and become owned by the pattern."""
+        self.stitches.extend(stitches)
+        if self.stitches:
+            last = self.stitches[-1]
+            self._previousX = last[0]
+            self._previousY = last[1]
+
     def add_stitch_relative(self, cmd, dx=0, dy=0):
         """Add a command relative to the previous location"""
         x = self._previousX + dx
@@ -564,6 +593,7 @@ class EmbPattern:
                 self.stitches[i][2] = NO_COMMAND
         self.extras.update(pattern.extras)
 
+    @measured("interpolate_duplicate_color_as_stop")
     def interpolate_duplicate_color_as_stop(self):
         """Processes a pattern replacing any duplicate colors in the threadlist as a stop."""
         thread_index = 0
@@ -590,6 +620,7 @@ class EmbPattern:
                 init_color = True
                 last_change = position
 
+    @measured("interpolate_stop_as_duplicate_color")
     def interpolate_stop_as_duplicate_color(self, thread_change_command=COLOR_CHANGE):
         """Processes a pattern replacing any stop as a duplicate color, and color_change
         or another specified thread_change_command"""
@@ -608,6 +639,7 @@ class EmbPattern:
                 except IndexError:  # There are no colors to duplicate
                     return
 
+    @measured("interpolate_frame_eject")
     def interpolate_frame_eject(self):
         """Processes a pattern replacing jump-stop-jump/jump-stop-end sequences with FRAME_EJECT."""
         mode = 0
@@ -650,6 +682,7 @@ class EmbPattern:
             position = sequence_start_position
             self.stitches.insert(position, [stop_x, stop_y, FRAME_EJECT])
 
+    @measured("interpolate_trims")
     def interpolate_trims(
         self, jumps_to_require_trim=None, distance_to_require_trim=None, clipping=True
     ):
@@ -776,9 +809,11 @@ class EmbPattern:
         stable_pattern.extras.update(self.extras)
         return stable_pattern
 
+    @measured("encode")
     def get_normalized_pattern(self, encode_settings=None):
         """Encodes pattern typically for saving."""
         normal_pattern = EmbPattern()
+        normal_pattern.filler_seed = self.filler_seed
         transcoder = Normalizer(encode_settings)
         transcoder.transcode(self, normal_pattern)
         return normal_pattern
@@ -796,18 +831,36 @@ class EmbPattern:
 
     @staticmethod
     def read_embroidery(reader, f, settings=None, pattern=None):
-        """Reads fileobject or filename with reader."""
+        """Reads fileobject, filename or in-memory buffer with reader.
+
+        bytes, bytearray, memoryview and mmap objects are read in place. When
+        reading a filename with settings {"mmap": True}, binary formats are
+        memory-mapped rather than read through a file object. With
+        {"intern_threads": True} the threads read are replaced by shared,
+        interned threads, see EmbThread.intern_thread().
+
+        settings["instrument"] is given a PhaseRecord for the read and for
+        each post-pass the reader runs, see EmbInstrument. settings["progress"]
+        and settings["cancel"] report on and cancel the read, see EmbProgress."""
         if reader is None:
             return None
         if pattern is None:
             pattern = EmbPattern()
+        check_cancelled(settings)
+        with activate(settings), phase("read", pattern):
+            EmbPattern._read_into(reader, f, pattern, settings)
+        if settings is not None and settings.get("intern_threads", False):
+            pattern.threadlist = [intern_thread(thread) for thread in pattern.threadlist]
+        return pattern
 
+    @staticmethod
+    def _read_into(reader, f, pattern, settings):
+        text_mode = False
+        try:
+            text_mode = reader.READ_FILE_IN_TEXT_MODE
+        except AttributeError:
+            pass
         if isinstance(f, str):
-            text_mode = False
-            try:
-                text_mode = reader.READ_FILE_IN_TEXT_MODE
-            except AttributeError:
-                pass
             if text_mode:
                 try:
                     with open(f, "r", errors="ignore") as stream:
@@ -817,19 +870,87 @@ class EmbPattern:
                     pass
             else:
                 with open(f, "rb") as stream:
+                    if settings is not None and settings.get("mmap", False):
+                        EmbPattern._read_mapped(reader, stream, pattern, settings)
+                    else:
+                        reader.read(stream, pattern, settings)
+        elif EmbPattern._is_buffer(f):
+            with BufferReader(f) as buffer:
+                if text_mode:
+                    stream = io.TextIOWrapper(buffer, errors="ignore")
                     reader.read(stream, pattern, settings)
+                    stream.detach()
+                else:
+                    reader.read(buffer, pattern, settings)
         else:
             reader.read(f, pattern, settings)
-        return pattern
+
+    @staticmethod
+    def _is_buffer(f):
+        if isinstance(f, (bytes, bytearray, memoryview, mmap.mmap)):
+            return True
+        if hasattr(f, "read"):
+            return False
+        try:
+            memoryview(f).release()
+        except TypeError:
+            return False
+        return True
+
+    @staticmethod
+    def _read_mapped(reader, stream, pattern, settings):
+        try:
+            mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped.
+            reader.read(stream, pattern, settings)
+            return
+        try:
+            with BufferReader(mapped) as buffer:
+                reader.read(buffer, pattern, settings)
+        except BaseException:
+            # Views of the map held by the traceback keep it from closing until
+            # they are released; the reader's error is the one to report.
+            try:
+                mapped.close()
+            except BufferError:
+                pass
+            raise
+        mapped.close()
 
     @staticmethod
     def write_embroidery(writer, pattern, stream, settings=None):
+        """Writes pattern to the filename or stream with writer.
+
+        With settings {"deterministic": True} writing the same pattern always
+        produces the same bytes: filler threads are seeded (by the "seed"
+        setting, default 0) and writers that embed the current date use a
+        fixed one. "seed" may also be given on its own.
+
+        settings["instrument"] is given a PhaseRecord for the encoding, the
+        write and each post-pass the writer runs, see EmbInstrument.
+        settings["progress"] and settings["cancel"] report on and cancel the
+        encoding and PNG rendering, see EmbProgress."""
         if pattern is None:
             return
         if settings is None:
             settings = {}
         else:
             settings = settings.copy()
+        check_cancelled(settings)
+        if settings.get("deterministic", False):
+            settings.setdefault("seed", 0)
+        if settings.get("seed") is not None:
+            pattern = pattern.copy()
+            pattern.filler_seed = settings["seed"]
+        with activate(settings):
+            pattern = EmbPattern._encoded_for(writer, pattern, settings)
+            with phase("write", pattern):
+                EmbPattern._write_to(writer, pattern, stream, settings)
+
+    @staticmethod
+    def _encoded_for(writer, pattern, settings):
+        """Fills in the writer's encoder settings and returns the pattern encoded
+        with them, unless encoding is turned off."""
         try:
             encode = writer.ENCODE
         except AttributeError:
@@ -892,7 +1013,10 @@ class EmbPattern:
                 except AttributeError:
                     pass
             pattern = pattern.get_normalized_pattern(settings)
+        return pattern
 
+    @staticmethod
+    def _write_to(writer, pattern, stream, settings):
         if isinstance(stream, str):
             text_mode = False
             try:
@@ -0,0 +1,103 @@
+"""Progress reporting and cooperative cancellation for long reads and writes.
+
+settings["progress"] is called as progress(done, total) while the stitch
+readers, the encoder and the PNG rasteriser work through a pattern, at most
+about PROGRESS_STEPS times per phase. settings["cancel"] is a CancelToken; once
+cancelled, the next progress check raises ConversionCancelled."""
+
+import sys
+import threading
+
+# Progress is reported roughly this many times per phase, plus once at the end.
+PROGRESS_STEPS = 100
+
+
+class ConversionCancelled(Exception):
+    """Raised when the CancelToken given as settings["cancel"] is cancelled."""
+
+
+class CancelToken:
+    """Thread-safe cancellation flag shared with a running read or write."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise ConversionCancelled()
+
+
+class Progress:
+    """Reports progress through total units of work.
+
+    Loops compare their position against next and call update() once they
+    reach it, which keeps the cost per item to a single comparison."""
+
+    __slots__ = ("callback", "token", "total", "step", "next")
+
+    def __init__(self, callback, token, total):
+        self.callback = callback
+        self.token = token
+        self.total = total
+        self.step = max(1, total // PROGRESS_STEPS)
+        self.next = 0
+
+    def update(self, done):
+        """Reports done, raising ConversionCancelled if cancelled, and returns
+        the position of the next update."""
+        if self.token is not None:
+            self.token.raise_if_cancelled()
+        if self.callback is not None:
+            self.callback(done, self.total)
+        self.next = done + self.step
+        return self.next
+
+    def finish(self):
+        self.update(self.total)
+
+
+class NoProgress:
+    """Stand-in for Progress when nothing is reported; next is never reached."""
+
+    __slots__ = ()
+
+    # An int, as comparing ints with a float is slower in the readers' loops.
+    next = sys.maxsize
+
+    def finish(self):
+        pass
+
+
+NO_PROGRESS = NoProgress()
+
+
+def progress_for(settings, total):
+    """Returns a Progress over total for the settings' progress callback and
+    cancel token, or NO_PROGRESS when neither is given."""
+    if not settings:
+        return NO_PROGRESS
+    return make_progress(settings.get("progress"), settings.get("cancel"), total)
+
+
+def make_progress(callback, token, total):
+    """Returns a Progress over total, or NO_PROGRESS if callback and token are None."""
+    if callback is None and token is None:
+        return NO_PROGRESS
+    return Progress(callback, token, total)
+
+
+def check_cancelled(settings):
+    """Raises ConversionCancelled if the settings' cancel token is cancelled."""
+    if settings:
+        token = settings.get("cancel")
+        if token is not None:
+            token.raise_if_cancelled()
@@ -1,44 +1,218 @@
+import weakref
+from copy import copy
 from typing import Any, Optional
 
 
+GRID_THRESHOLD = 128  # palettes larger than this are bucketed in a 3-D grid.
+GRID_SHIFT = 5  # channel bits dropped per grid cell, 8 cells per channel.
+MEMO_SIZE = 4096
+
+
+def _grid_shells():
+    """Returns the cell offsets of each cube shell around a cell, innermost first."""
+    span = 1 << (8 - GRID_SHIFT)
+    shells = [[] for _ in range(span)]
+    for dr in range(1 - span, span):
+        for dg in range(1 - span, span):
+            for db in range(1 - span, span):
+                shells[max(abs(dr), abs(dg), abs(db))].append((dr, dg, db))
+    return tuple(tuple(shell) for shell in shells)
+
+
+class ThreadPalette:
+    """Read-only nearest colour index over a list of threads.
+
+    The channels of each thread are unpacked once, nearest queries are
+    memoised by colour, and palettes larger than GRID_THRESHOLD bucket their
+    threads in a 3-D grid so a query only measures threads in nearby cells.
+    Results match find_nearest_color_index, including its preference for the
+    later of equally near threads. None entries are never matched.
+    """
+
+    _shells = None
+
+    def __init__(self, threads):
+        self.threads = tuple(threads)
+        self.channels = tuple(
+            None if t is None else (t.get_red(), t.get_green(), t.get_blue())
+            for t in self.threads
+        )
+        self._memo = {}
+        self._grid = None
+        if len(self.threads) > GRID_THRESHOLD:
+            if ThreadPalette._shells is None:
+                ThreadPalette._shells = _grid_shells()
+            grid = {}
+            for index, channel in enumerate(self.channels):
+                if channel is None:
+                    continue
+                r, g, b = channel
+                cell = (r >> GRID_SHIFT, g >> GRID_SHIFT, b >> GRID_SHIFT)
+                grid.setdefault(cell, []).append(index)
+            self._grid = grid
+
+    def __len__(self):
+        return len(self.threads)
+
+    def __getitem__(self, index):
+        return self.threads[index]
+
+    def __iter__(self):
+        return iter(self.threads)
+
+    def copies(self):
+        """Returns a ThreadCopies of the palette, for a reader to add threads from."""
+        return ThreadCopies(self)
+
+    def nearest(self, color, exclude=()):
+        """Returns the index of the thread nearest to color, or None.
+
+        Indexes in exclude are skipped, as if their entries were None."""
+        if isinstance(color, EmbThread):
+            color = color.color
+        color = int(color)
+        if not exclude:
+            index = self._memo.get(color, -1)
+            if index != -1:
+                return index
+        red = (color >> 16) & 0xFF
+        green = (color >> 8) & 0xFF
+        blue = color & 0xFF
+        if self._grid is None:
+            index = self._nearest_scan(red, green, blue, range(len(self.channels)), exclude)[1]
+        else:
+            index = self._nearest_grid(red, green, blue, exclude)
+        if not exclude:
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            self._memo[color] = index
+        return index
+
+    def _nearest_scan(self, red, green, blue, indexes, exclude, best=None, best_index=None):
+        channels = self.channels
+        for index in indexes:
+            channel = channels[index]
+            if channel is None or index in exclude:
+                continue
+            r, g, b = channel
+            red_mean = int(round((red + r) / 2))
+            r -= red
+            g -= green
+            b -= blue
+            dist = (
+                (((512 + red_mean) * r * r) >> 8)
+                + 4 * g * g
+                + (((767 - red_mean) * b * b) >> 8)
+            )
+            if best is None or dist < best or (dist == best and index > best_index):
+                best = dist
+                best_index = index
+        return best, best_index
+
+    def _nearest_grid(self, red, green, blue, exclude):
+        grid = self._grid
+        cell_r = red >> GRID_SHIFT
+        cell_g = green >> GRID_SHIFT
+        cell_b = blue >> GRID_SHIFT
+        cell_size = 1 << GRID_SHIFT
+        best = None
+        best_index = None
+        for ring, shell in enumerate(self._shells):
+            if best is not None and ring > 0:
+                # Every thread in this shell differs by at least this much in
+                # one channel, and each channel weighs at least 2 per unit squared.
+                reach = (ring - 1) * cell_size + 1
+                if 2 * reach * reach > best:
+                    break
+            for dr, dg, db in shell:
+                indexes = grid.get((cell_r + dr, cell_g + dg, cell_b + db))
+                if indexes is not None:
+                    best, best_index = self._nearest_scan(
+                        red, green, blue, indexes, exclude, best, best_index
+                    )
+        return best_index
+
+
+class ThreadCopies:
+    """Indexes like the palette it is made from, but gives a copy of each
+    thread, made on first access, so patterns read never hold the palette's
+    own threads. Repeated lookups of an index give the same copy."""
+
+    __slots__ = ("palette", "_copies")
+
+    def __init__(self, palette):
+        self.palette = palette
+        self._copies = {}
+
+    def __len__(self):
+        return len(self.palette)
+
+    def __getitem__(self, index):
+        try:
+            return self._copies[index]
+        except KeyError:
+            pass
+        thread = self.palette[index]
+        if thread is not None:
+            thread = copy(thread)
+        self._copies[index] = thread
+        return thread
+
+
+_shared_palettes = {}
+
+
+def shared_palette(get_thread_set):
+    """Returns the ThreadPalette of the chart get_thread_set() returns, built
+    once on first use and shared by every reader and writer of that chart."""
+    palette = _shared_palettes.get(get_thread_set)
+    if palette is None:
+        palette = _shared_palettes[get_thread_set] = ThreadPalette(get_thread_set())
+    return palette
+
+
 def build_unique_palette(thread_palette, threadlist):
     """Turns a threadlist into a unique index list with the thread palette"""
+    if not isinstance(thread_palette, ThreadPalette):
+        thread_palette = ThreadPalette(thread_palette)
     chart = [None] * len(thread_palette)  # Create a lookup chart.
+    used = set()
     for thread in set(
         threadlist
     ):  # for each unique color, move closest remaining thread to lookup chart.
-        index = thread.find_nearest_color_index(thread_palette)
+        index = thread_palette.nearest(thread.color, used)
         if index is None:
             break  # No more threads remain in palette
-        thread_palette[index] = None  # entries may not be reused.
+        used.add(index)  # entries may not be reused.
         chart[index] = thread  # assign the given index to the lookup.
 
+    chart = ThreadPalette(chart)
     palette = []
     for thread in threadlist:  # for each thread, return the index.
-        palette.append(thread.find_nearest_color_index(chart))
+        palette.append(chart.nearest(thread.color))
     return palette
 
 
 def build_palette(thread_palette, threadlist):
+    if not isinstance(thread_palette, ThreadPalette):
+        thread_palette = ThreadPalette(thread_palette)
     palette = []
     for thread in threadlist:  # for each thread, return the index.
-        palette.append(thread.find_nearest_color_index(thread_palette))
+        palette.append(thread_palette.nearest(thread.color))
     return palette
 
 
 def build_nonrepeat_palette(thread_palette, threadlist):
+    if not isinstance(thread_palette, ThreadPalette):
+        thread_palette = ThreadPalette(thread_palette)
     last_index = None
     last_thread = None
     palette = []
     for thread in threadlist:  # for each thread, return the index.
-        index = thread.find_nearest_color_index(thread_palette)
+        index = thread_palette.nearest(thread.color)
         if last_index == index and last_thread != thread:
-            repeated_thread = thread_palette[index]
-            repeated_index = index
-            thread_palette[index] = None
-            index = thread.find_nearest_color_index(thread_palette)
             # index will no longer be repeated.
-            thread_palette[repeated_index] = repeated_thread
+            index = thread_palette.nearest(thread.color, (index,))
         palette.append(index)
         last_index = index
         last_thread = thread
@@ -47,6 +221,8 @@ def build_nonrepeat_palette(thread_palette, threadlist):
 
 
 def find_nearest_color_index(find_color, values):
+    if isinstance(values, ThreadPalette):
+        return values.nearest(find_color)
     if isinstance(find_color, EmbThread):
         find_color = find_color.color
     red = (find_color >> 16) & 0xFF
@@ -87,7 +263,203 @@ def color_distance_red_mean(r1, g1, b1, r2, g2, b2):
     # https://www.compuphase.com/cmetric.htm
 
 
+COLOR_NAMES = {
+    "aliceblue": color_rgb(240, 248, 255),
+    "antiquewhite": color_rgb(250, 235, 215),
+    "aqua": color_rgb(0, 255, 255),
+    "aquamarine": color_rgb(127, 255, 212),
+    "azure": color_rgb(240, 255, 255),
+    "beige": color_rgb(245, 245, 220),
+    "bisque": color_rgb(255, 228, 196),
+    "black": color_rgb(0, 0, 0),
+    "blanchedalmond": color_rgb(255, 235, 205),
+    "blue": color_rgb(0, 0, 255),
+    "blueviolet": color_rgb(138, 43, 226),
+    "brown": color_rgb(165, 42, 42),
+    "burlywood": color_rgb(222, 184, 135),
+    "cadetblue": color_rgb(95, 158, 160),
+    "chartreuse": color_rgb(127, 255, 0),
+    "chocolate": color_rgb(210, 105, 30),
+    "coral": color_rgb(255, 127, 80),
+    "cornflowerblue": color_rgb(100, 149, 237),
+    "cornsilk": color_rgb(255, 248, 220),
+    "crimson": color_rgb(220, 20, 60),
+    "cyan": color_rgb(0, 255, 255),
+    "darkblue": color_rgb(0, 0, 139),
+    "darkcyan": color_rgb(0, 139, 139),
+    "darkgoldenrod": color_rgb(184, 134, 11),
+    "darkgray": color_rgb(169, 169, 169),
+    "darkgreen": color_rgb(0, 100, 0),
+    "darkgrey": color_rgb(169, 169, 169),
+    "darkkhaki": color_rgb(189, 183, 107),
+    "darkmagenta": color_rgb(139, 0, 139),
+    "darkolivegreen": color_rgb(85, 107, 47),
+    "darkorange": color_rgb(255, 140, 0),
+    "darkorchid": color_rgb(153, 50, 204),
+    "darkred": color_rgb(139, 0, 0),
+    "darksalmon": color_rgb(233, 150, 122),
+    "darkseagreen": color_rgb(143, 188, 143),
+    "darkslateblue": color_rgb(72, 61, 139),
+    "darkslategray": color_rgb(47, 79, 79),
+    "darkslategrey": color_rgb(47, 79, 79),
+    "darkturquoise": color_rgb(0, 206, 209),
+    "darkviolet": color_rgb(148, 0, 211),
+    "deeppink": color_rgb(255, 20, 147),
+    "deepskyblue": color_rgb(0, 191, 255),
+    "dimgray": color_rgb(105, 105, 105),
+    "dimgrey": color_rgb(105, 105, 105),
+    "dodgerblue": color_rgb(30, 144, 255),
+    "firebrick": color_rgb(178, 34, 34),
+    "floralwhite": color_rgb(255, 250, 240),
+    "forestgreen": color_rgb(34, 139, 34),
+    "fuchsia": color_rgb(255, 0, 255),
+    "gainsboro": color_rgb(220, 220, 220),
+    "ghostwhite": color_rgb(248, 248, 255),
+    "gold": color_rgb(255, 215, 0),
+    "goldenrod": color_rgb(218, 165, 32),
+    "gray": color_rgb(128, 128, 128),
+    "grey": color_rgb(128, 128, 128),
+    "green": color_rgb(0, 128, 0),
+    "greenyellow": color_rgb(173, 255, 47),
+    "honeydew": color_rgb(240, 255, 240),
+    "hotpink": color_rgb(255, 105, 180),
+    "indianred": color_rgb(205, 92, 92),
+    "indigo": color_rgb(75, 0, 130),
+    "ivory": color_rgb(255, 255, 240),
+    "khaki": color_rgb(240, 230, 140),
+    "lavender": color_rgb(230, 230, 250),
+    "lavenderblush": color_rgb(255, 240, 245),
+    "lawngreen": color_rgb(124, 252, 0),
+    "lemonchiffon": color_rgb(255, 250, 205),
+    "lightblue": color_rgb(173, 216, 230),
+    "lightcoral": color_rgb(240, 128, 128),
+    "lightcyan": color_rgb(224, 255, 255),
+    "lightgoldenrodyellow": color_rgb(250, 250, 210),
+    "lightgray": color_rgb(211, 211, 211),
+    "lightgreen": color_rgb(144, 238, 144),
+    "lightgrey": color_rgb(211, 211, 211),
+    "lightpink": color_rgb(255, 182, 193),
+    "lightsalmon": color_rgb(255, 160, 122),
+    "lightseagreen": color_rgb(32, 178, 170),
+    "lightskyblue": color_rgb(135, 206, 250),
+    "lightslategray": color_rgb(119, 136, 153),
+    "lightslategrey": color_rgb(119, 136, 153),
+    "lightsteelblue": color_rgb(176, 196, 222),
+    "lightyellow": color_rgb(255, 255, 224),
+    "lime": color_rgb(0, 255, 0),
+    "limegreen": color_rgb(50, 205, 50),
+    "linen": color_rgb(250, 240, 230),
+    "magenta": color_rgb(255, 0, 255),
+    "maroon": color_rgb(128, 0, 0),
+    "mediumaquamarine": color_rgb(102, 205, 170),
+    "mediumblue": color_rgb(0, 0, 205),
+    "mediumorchid": color_rgb(186, 85, 211),
+    "mediumpurple": color_rgb(147, 112, 219),
+    "mediumseagreen": color_rgb(60, 179, 113),
+    "mediumslateblue": color_rgb(123, 104, 238),
+    "mediumspringgreen": color_rgb(0, 250, 154),
+    "mediumturquoise": color_rgb(72, 209, 204),
+    "mediumvioletred": color_rgb(199, 21, 133),
+    "midnightblue": color_rgb(25, 25, 112),
+    "mintcream": color_rgb(245, 255, 250),
+    "mistyrose": color_rgb(255, 228, 225),
+    "moccasin": color_rgb(255, 228, 181),
+    "navajowhite": color_rgb(255, 222, 173),
+    "navy": color_rgb(0, 0, 128),
+    "oldlace": color_rgb(253, 245, 230),
+    "olive": color_rgb(128, 128, 0),
+    "olivedrab": color_rgb(107, 142, 35),
+    "orange": color_rgb(255, 165, 0),
+    "orangered": color_rgb(255, 69, 0),
+    "orchid": color_rgb(218, 112, 214),
+    "palegoldenrod": color_rgb(238, 232, 170),
+    "palegreen": color_rgb(152, 251, 152),
+    "paleturquoise": color_rgb(175, 238, 238),
+    "palevioletred": color_rgb(219, 112, 147),
+    "papayawhip": color_rgb(255, 239, 213),
+    "peachpuff": color_rgb(255, 218, 185),
+    "peru": color_rgb(205, 133, 63),
+    "pink": color_rgb(255, 192, 203),
+    "plum": color_rgb(221, 160, 221),
+    "powderblue": color_rgb(176, 224, 230),
+    "purple": color_rgb(128, 0, 128),
+    "red": color_rgb(255, 0, 0),
+    "rosybrown": color_rgb(188, 143, 143),
+    "royalblue": color_rgb(65, 105, 225),
+    "saddlebrown": color_rgb(139, 69, 19),
+    "salmon": color_rgb(250, 128, 114),
+    "sandybrown": color_rgb(244, 164, 96),
+    "seagreen": color_rgb(46, 139, 87),
+    "seashell": color_rgb(255, 245, 238),
+    "sienna": color_rgb(160, 82, 45),
+    "silver": color_rgb(192, 192, 192),
+    "skyblue": color_rgb(135, 206, 235),
+    "slateblue": color_rgb(106, 90, 205),
+    "slategray": color_rgb(112, 128, 144),
+    "slategrey": color_rgb(112, 128, 144),
+    "snow": color_rgb(255, 250, 250),
+    "springgreen": color_rgb(0, 255, 127),
+    "steelblue": color_rgb(70, 130, 180),
+    "tan": color_rgb(210, 180, 140),
+    "teal": color_rgb(0, 128, 128),
+    "thistle": color_rgb(216, 191, 216),
+    "tomato": color_rgb(255, 99, 71),
+    "turquoise": color_rgb(64, 224, 208),
+    "violet": color_rgb(238, 130, 238),
+    "wheat": color_rgb(245, 222, 179),
+    "white": color_rgb(255, 255, 255),
+    "whitesmoke": color_rgb(245, 245, 245),
+    "yellow": color_rgb(255, 255, 0),
+    "yellowgreen": color_rgb(154, 205, 50),
+}
+
+
+_interned_threads = weakref.WeakValueDictionary()
+
+
+def intern_thread(thread):
+    """Returns the shared thread of the same type and definition as thread.
+
+    Identical threads interned from many patterns become one object, so
+    interned threads must not be modified. Threads with unhashable fields
+    are returned as they are."""
+    if thread is None:
+        return None
+    key = (
+        type(thread),
+        thread.color,
+        thread.description,
+        thread.catalog_number,
+        thread.details,
+        thread.brand,
+        thread.chart,
+        thread.weight,
+    )
+    extras = getattr(thread, "__dict__", None)
+    if extras:
+        # Subclasses without __slots__ may carry attributes of their own.
+        key += tuple(sorted(extras.items()))
+    try:
+        shared = _interned_threads.get(key)
+    except TypeError:
+        return thread
+    if shared is None:
+        _interned_threads[key] = shared = thread
+    return shared
+
+
 class EmbThread:
+    __slots__ = (
+        "color",
+        "description",
+        "catalog_number",
+        "details",
+        "brand",
+        "chart",
+        "weight",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         thread: Any = None,
@@ -244,154 +616,5 @@ class EmbThread:
             return random.randint(0, 0xFFFFFF)
         if color[0:1] == "#":
             return color_hex(color[1:])
-        color_dict = {
-            "aliceblue": color_rgb(240, 248, 255),
-            "antiquewhite": color_rgb(250, 235, 215),
-            "aqua": color_rgb(0, 255, 255),
-            "aquamarine": color_rgb(127, 255, 212),
-            "azure": color_rgb(240, 255, 255),
-            "beige": color_rgb(245, 245, 220),
-            "bisque": color_rgb(255, 228, 196),
-            "black": color_rgb(0, 0, 0),
-            "blanchedalmond": color_rgb(255, 235, 205),
-            "blue": color_rgb(0, 0, 255),
-            "blueviolet": color_rgb(138, 43, 226),
-            "brown": color_rgb(165, 42, 42),
-            "burlywood": color_rgb(222, 184, 135),
-            "cadetblue": color_rgb(95, 158, 160),
-            "chartreuse": color_rgb(127, 255, 0),
-            "chocolate": color_rgb(210, 105, 30),
-            "coral": color_rgb(255, 127, 80),
-            "cornflowerblue": color_rgb(100, 149, 237),
-            "cornsilk": color_rgb(255, 248, 220),
-            "crimson": color_rgb(220, 20, 60),
-            "cyan": color_rgb(0, 255, 255),
-            "darkblue": color_rgb(0, 0, 139),
-            "darkcyan": color_rgb(0, 139, 139),
-            "darkgoldenrod": color_rgb(184, 134, 11),
-            "darkgray": color_rgb(169, 169, 169),
-            "darkgreen": color_rgb(0, 100, 0),
-            "darkgrey": color_rgb(169, 169, 169),
-            "darkkhaki": color_rgb(189, 183, 107),
-            "darkmagenta": color_rgb(139, 0, 139),
-            "darkolivegreen": color_rgb(85, 107, 47),
-            "darkorange": color_rgb(255, 140, 0),
-            "darkorchid": color_rgb(153, 50, 204),
-            "darkred": color_rgb(139, 0, 0),
-            "darksalmon": color_rgb(233, 150, 122),
-            "darkseagreen": color_rgb(143, 188, 143),
-            "darkslateblue": color_rgb(72, 61, 139),
-            "darkslategray": color_rgb(47, 79, 79),
-            "darkslategrey": color_rgb(47, 79, 79),
-            "darkturquoise": color_rgb(0, 206, 209),
-            "darkviolet": color_rgb(148, 0, 211),
-            "deeppink": color_rgb(255, 20, 147),
-            "deepskyblue": color_rgb(0, 191, 255),
-            "dimgray": color_rgb(105, 105, 105),
-            "dimgrey": color_rgb(105, 105, 105),
-            "dodgerblue": color_rgb(30, 144, 255),
-            "firebrick": color_rgb(178, 34, 34),
-            "floralwhite": color_rgb(255, 250, 240),
-            "forestgreen": color_rgb(34, 139, 34),
-            "fuchsia": color_rgb(255, 0, 255),
-            "gainsboro": color_rgb(220, 220, 220),
-            "ghostwhite": color_rgb(248, 248, 255),
-            "gold": color_rgb(255, 215, 0),
-            "goldenrod": color_rgb(218, 165, 32),
-            "gray": color_rgb(128, 128, 128),
-            "grey": color_rgb(128, 128, 128),
-            "green": color_rgb(0, 128, 0),
-            "greenyellow": color_rgb(173, 255, 47),
-            "honeydew": color_rgb(240, 255, 240),
-            "hotpink": color_rgb(255, 105, 180),
-            "indianred": color_rgb(205, 92, 92),
-            "indigo": color_rgb(75, 0, 130),
-            "ivory": color_rgb(255, 255, 240),
-            "khaki": color_rgb(240, 230, 140),
-            "lavender": color_rgb(230, 230, 250),
-            "lavenderblush": color_rgb(255, 240, 245),
-            "lawngreen": color_rgb(124, 252, 0),
-            "lemonchiffon": color_rgb(255, 250, 205),
-            "lightblue": color_rgb(173, 216, 230),
-            "lightcoral": color_rgb(240, 128, 128),
-            "lightcyan": color_rgb(224, 255, 255),
-            "lightgoldenrodyellow": color_rgb(250, 250, 210),
-            "lightgray": color_rgb(211, 211, 211),
-            "lightgreen": color_rgb(144, 238, 144),
-            "lightgrey": color_rgb(211, 211, 211),
-            "lightpink": color_rgb(255, 182, 193),
-            "lightsalmon": color_rgb(255, 160, 122),
-            "lightseagreen": color_rgb(32, 178, 170),
-            "lightskyblue": color_rgb(135, 206, 250),
-            "lightslategray": color_rgb(119, 136, 153),
-            "lightslategrey": color_rgb(119, 136, 153),
-            "lightsteelblue": color_rgb(176, 196, 222),
-            "lightyellow": color_rgb(255, 255, 224),
-            "lime": color_rgb(0, 255, 0),
-            "limegreen": color_rgb(50, 205, 50),
-            "linen": color_rgb(250, 240, 230),
-            "magenta": color_rgb(255, 0, 255),
-            "maroon": color_rgb(128, 0, 0),
-            "mediumaquamarine": color_rgb(102, 205, 170),
-            "mediumblue": color_rgb(0, 0, 205),
-            "mediumorchid": color_rgb(186, 85, 211),
-            "mediumpurple": color_rgb(147, 112, 219),
-            "mediumseagreen": color_rgb(60, 179, 113),
-            "mediumslateblue": color_rgb(123, 104, 238),
-            "mediumspringgreen": color_rgb(0, 250, 154),
-            "mediumturquoise": color_rgb(72, 209, 204),
-            "mediumvioletred": color_rgb(199, 21, 133),
-            "midnightblue": color_rgb(25, 25, 112),
-            "mintcream": color_rgb(245, 255, 250),
-            "mistyrose": color_rgb(255, 228, 225),
-            "moccasin": color_rgb(255, 228, 181),
-            "navajowhite": color_rgb(255, 222, 173),
-            "navy": color_rgb(0, 0, 128),
-            "oldlace": color_rgb(253, 245, 230),
-            "olive": color_rgb(128, 128, 0),
-            "olivedrab": color_rgb(107, 142, 35),
-            "orange": color_rgb(255, 165, 0),
-            "orangered": color_rgb(255, 69, 0),
-            "orchid": color_rgb(218, 112, 214),
-            "palegoldenrod": color_rgb(238, 232, 170),
-            "palegreen": color_rgb(152, 251, 152),
-            "paleturquoise": color_rgb(175, 238, 238),
-            "palevioletred": color_rgb(219, 112, 147),
-            "papayawhip": color_rgb(255, 239, 213),
-            "peachpuff": color_rgb(255, 218, 185),
-            "peru": color_rgb(205, 133, 63),
-            "pink": color_rgb(255, 192, 203),
-            "plum": color_rgb(221, 160, 221),
-            "powderblue": color_rgb(176, 224, 230),
-            "purple": color_rgb(128, 0, 128),
-            "red": color_rgb(255, 0, 0),
-            "rosybrown": color_rgb(188, 143, 143),
-            "royalblue": color_rgb(65, 105, 225),
-            "saddlebrown": color_rgb(139, 69, 19),
-            "salmon": color_rgb(250, 128, 114),
-            "sandybrown": color_rgb(244, 164, 96),
-            "seagreen": color_rgb(46, 139, 87),
-            "seashell": color_rgb(255, 245, 238),
-            "sienna": color_rgb(160, 82, 45),
-            "silver": color_rgb(192, 192, 192),
-            "skyblue": color_rgb(135, 206, 235),
-            "slateblue": color_rgb(106, 90, 205),
-            "slategray": color_rgb(112, 128, 144),
-            "slategrey": color_rgb(112, 128, 144),
-            "snow": color_rgb(255, 250, 250),
-            "springgreen": color_rgb(0, 255, 127),
-            "steelblue": color_rgb(70, 130, 180),
-            "tan": color_rgb(210, 180, 140),
-            "teal": color_rgb(0, 128, 128),
-            "thistle": color_rgb(216, 191, 216),
-            "tomato": color_rgb(255, 99, 71),
-            "turquoise": color_rgb(64, 224, 208),
-            "violet": color_rgb(238, 130, 238),
-            "wheat": color_rgb(245, 222, 179),
-            "white": color_rgb(255, 255, 255),
-            "whitesmoke": color_rgb(245, 245, 245),
-            "yellow": color_rgb(255, 255, 0),
-            "yellowgreen": color_rgb(154, 205, 50),
-        }
-        return color_dict.get(color.lower(), 0x000000)
+        return COLOR_NAMES.get(color.lower(), 0x000000)
         # return color or black.
@@ -1,4 +1,4 @@
-from .EmbThread import EmbThread
+from .EmbThread import EmbThread, shared_palette
 
 
 def get_thread_set():
@@ -35,7 +35,13 @@ def get_thread_set():
     ]
 
 
+def get_thread_palette():
+    return shared_palette(get_thread_set)
+
+
 class EmbThreadHus(EmbThread):
+    __slots__ = ()
+
     def __init__(self, color, description, catalog_number=None):
         EmbThread.__init__(self)
         self.set(color)
@@ -1,4 +1,4 @@
-from .EmbThread import EmbThread
+from .EmbThread import EmbThread, shared_palette
 
 
 def get_thread_set():
@@ -71,7 +71,13 @@ def get_thread_set():
     ]
 
 
+def get_thread_palette():
+    return shared_palette(get_thread_set)
+
+
 class EmbThreadPec(EmbThread):
+    __slots__ = ()
+
     def __init__(self, red, green, blue, description, catalog_number):
         EmbThread.__init__(self)
         self.set_color(red, green, blue)
@@ -1,26 +1,34 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
-from .ReadHelper import signed8
+from .EmbProgress import progress_for
+from .ReadHelper import read_view, signed8
 
 
-def read_exp_stitches(f: BinaryIO, out: EmbPattern):
-    while True:
-        b = bytearray(f.read(2))
-        if len(b) != 2:
-            break
-        if b[0] != 0x80:
-            x = signed8(b[0])
-            y = -signed8(b[1])
+def read_exp_stitches(f: BinaryIO, out: EmbPattern, settings=None):
+    data = read_view(f)
+    progress = progress_for(settings, len(data))
+    checkpoint = progress.next
+    i = 0
+    end = len(data) - 1
+    while i < end:
+        if i >= checkpoint:
+            checkpoint = progress.update(i)
+        b0 = data[i]
+        b1 = data[i + 1]
+        i += 2
+        if b0 != 0x80:
+            x = signed8(b0)
+            y = -signed8(b1)
             out.stitch(x, y)
             continue
 
-        control = b[1]
-        b = bytearray(f.read(2))  # 07 00
-        if len(b) != 2:
+        control = b1
+        if i >= end:  # 07 00
             break
-        x = signed8(b[0])
-        y = -signed8(b[1])
+        x = signed8(data[i])
+        y = -signed8(data[i + 1])
+        i += 2
         if control == 0x80:  # Trim
             out.trim()
             continue
@@ -37,8 +45,9 @@ def read_exp_stitches(f: BinaryIO, out: EmbPattern):
                 out.move(x, y)
             continue
         break  # Uncaught Control
+    progress.finish()
     out.end()
 
 
 def read(f: BinaryIO, out: EmbPattern, settings=None):
-    read_exp_stitches(f, out)
+    read_exp_stitches(f, out, settings)
@@ -2,6 +2,7 @@ from typing import BinaryIO
 
 from .EmbConstant import *
 from .EmbPattern import EmbPattern
+from .WriteHelper import buffered
 
 SEQUIN_CONTINGENCY = CONTINGENCY_SEQUIN_JUMP
 FULL_JUMP = True
@@ -10,6 +11,7 @@ MAX_JUMP_DISTANCE = 127
 MAX_STITCH_DISTANCE = 127
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     stitches = pattern.stitches
     xx = 0
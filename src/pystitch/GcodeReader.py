@@ -1,72 +1,67 @@
+import re
 from typing import BinaryIO
 
+from .EmbConstant import STITCH
 from .EmbPattern import EmbPattern
 
+CHUNK_SIZE = 0x10000
 
-def parse(f: BinaryIO):
-    comment = None
-    code = ""
-    value = ""
-    command_map = {}
-    ord_a = ord("a")
-    ord_A = ord("A")
-    ord_z = ord("z")
-    ord_Z = ord("Z")
+# "(" or ";" starts a comment that runs to ")" or the end of the line.
+COMMENT = re.compile(rb"[(;]([^)]*)\)?")
+# Whitespace, block-delete "/" and any other non-word characters are ignored.
+IGNORED = re.compile(rb"[^A-Za-z0-9+\-.]+")
+WORD = re.compile(rb"([A-Za-z])([0-9+\-.]*)")
+# Code letters are case-insensitive and reported in lowercase.
+CODES = {bytes((letter,)): chr(letter).lower() for letter in b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"}
+CODES.update({key.lower(): value for key, value in CODES.items()})
+
+
+def read_lines(f: BinaryIO, chunk_size=CHUNK_SIZE):
+    """Yields the lines of a binary stream, reading it in large chunks."""
+    # Chunks of an unfinished line are only joined once it ends, so a long
+    # line is not copied again for every chunk.
+    pending = []
     while True:
-        byte = f.read(1)
-        if byte is None:
+        chunk = f.read(chunk_size)
+        if not chunk:
             break
-        if len(byte) == 0:
-            break
-        is_end = byte == b"\n" or byte == b"\r"
-        if comment is not None:
-            if byte == b")" or is_end:
-                command_map["comment"] = comment
-                comment = None
-                if not is_end:
-                    continue
-            else:
-                try:
-                    comment += byte.decode("utf8")
-                except UnicodeDecodeError:
-                    pass  # skip utf8 fail
-                continue
-        if byte == b"(":
-            comment = ""
-            continue
-        elif byte == b";":
-            comment = ""
-            continue
-        elif byte == b"\t":
-            continue
-        elif byte == b" ":
-            continue
-        elif byte == b"/" and len(code) == 0:
-            continue
-        b = ord(byte)
-        if ord("0") <= b <= ord("9") or byte == b"+" or byte == b"-" or byte == b".":
-            value += byte.decode("utf8")
+        pending.append(chunk)
+        if b"\n" not in chunk and b"\r" not in chunk:
             continue
+        lines = b"".join(pending).splitlines()
+        if chunk.endswith((b"\n", b"\r")):
+            pending = []
+        else:
+            pending = [lines.pop()]
+        yield from lines
+    if pending:
+        yield b"".join(pending)
 
-        if ord_A <= b <= ord_Z:
-            b = b - ord_A + ord_a
-            byte = chr(b)
-        is_letter = ord_a <= b <= ord_z
-        if (is_letter or is_end) and len(code) != 0:
-            command_map[code] = float(value)
-            code = ""
-            value = ""
-        if is_letter:
-            code += str(byte)
-            continue
-        elif is_end:
-            if len(command_map) == 0:
-                continue
+
+def parse_line(line):
+    """Returns the command map for a single line of gcode.
+
+    Codes are lowercase letters mapped to their float values. The text of the
+    last comment on the line, if any, is stored as "comment"."""
+    comment = None
+    if b"(" in line or b";" in line:
+        for match in COMMENT.finditer(line):
+            comment = match.group(1)
+        line = COMMENT.sub(b"", line)
+    command_map = {
+        CODES[code]: float(value) for code, value in WORD.findall(IGNORED.sub(b"", line)) if value
+    }
+    if comment is not None:
+        command_map["comment"] = comment.decode("utf8", errors="ignore")
+    return command_map
+
+
+def parse(f: BinaryIO, chunk_size=CHUNK_SIZE):
+    """Generates a command map for each non-empty line of gcode."""
+    for line in read_lines(f, chunk_size):
+        command_map = parse_line(line)
+        if command_map:
             yield command_map
-            command_map = {}
-            code = ""
-            value = ""
-            continue
 
 
 def read(f: BinaryIO, out: EmbPattern, settings=None):
@@ -74,6 +69,8 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     flip_x = -1  # Assumes the GCode is flip_x, -1 is flip, 1 is normal
     flip_y = -1  # Assumes the Gcode is flip_y,  -1 is flip, 1 is normal
     scale = 10.0  # Initially assume mm mode G20.
+    # Runs of absolute stitches are collected and appended to the pattern in bulk.
+    stitches = []
     for gc in parse(f):
         if "comment" in gc:
             comment = gc["comment"]
@@ -84,8 +81,10 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
         if "g" in gc:
             if "x" in gc and "y" in gc and gc["g"] == 0.0 or gc["g"] == 1.0:
                 if absolute_mode:
-                    out.stitch_abs(gc["x"] * scale * flip_x, gc["y"] * scale * flip_y)
+                    stitches.append([gc["x"] * scale * flip_x, gc["y"] * scale * flip_y, STITCH])
                 else:
+                    out.add_stitches_absolute(stitches)
+                    stitches = []
                     out.stitch(gc["x"] * scale * flip_x, gc["y"] * scale * flip_y)
                 continue
             if gc["g"] == 21.0 or gc["g"] == 71.0:
@@ -99,6 +98,11 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
         if "m" in gc:
             v = gc["m"]
             if v == 30 or v == 2:
+                out.add_stitches_absolute(stitches)
+                stitches = []
                 out.end()
             elif v == 0 or v == 1:
+                out.add_stitches_absolute(stitches)
+                stitches = []
                 out.color_change()
+    out.add_stitches_absolute(stitches)
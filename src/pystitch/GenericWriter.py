@@ -1,6 +1,6 @@
+from string import Formatter
 from typing import BinaryIO
 
-import pystitch
 from pystitch import (
     CONTINGENCY_SEQUIN_UTILIZE,
     decode_embroidery_command,
@@ -24,12 +24,157 @@ from pystitch.WriteHelper import write_string_utf8
 WRITES_SPEEDS = True
 SEQUIN_CONTINGENCY = CONTINGENCY_SEQUIN_UTILIZE
 
+WRITE_CHUNK = 4096  # formatted strings joined into a single write.
+
+COMMAND_NAMES = get_common_name_dictionary()
+
+TEMPLATE_KEYS = (
+    "metadata_entry",
+    "thread_entry",
+    "pattern_start",
+    "pattern_end",
+    "document_start",
+    "document_end",
+    "color_start",
+    "color_end",
+    "color_join",
+    "block_start",
+    "block_end",
+    "block_join",
+    "segment_start",
+    "segment",
+    "segment_end",
+    "segment_join",
+    "stitch",
+    "stop",
+    "jump",
+    "trim",
+    "needle_set",
+    "color_change",
+    "sequin",
+    "sequin_mode",
+    "slow",
+    "fast",
+    "end",
+)
+
+COMMAND_TEMPLATES = (
+    (SEQUIN_MODE, "sequin_mode"),
+    (SEQUIN_EJECT, "sequin"),
+    (STITCH, "stitch"),
+    (TRIM, "trim"),
+    (JUMP, "jump"),
+    (COLOR_CHANGE, "color_change"),
+    (NEEDLE_SET, "needle_set"),
+    (STOP, "stop"),
+    (SLOW, "slow"),
+    (FAST, "fast"),
+    (END, "end"),
+)
+
+POSITION_FIELDS = (
+    "x",
+    "y",
+    "z",
+    "_x",
+    "_y",
+    "dx",
+    "dy",
+    "idx",
+    "idy",
+    "_idx",
+    "_idy",
+    "ix",
+    "iy",
+    "_ix",
+    "_iy",
+    "last_x",
+    "last_y",
+    "_last_x",
+    "_last_y",
+)
+
+COMMAND_FIELDS = (
+    "index",
+    "command",
+    "cmd_str",
+    "cmd",
+    "cmd_thread",
+    "cmd_needle",
+    "cmd_order",
+)
+
+# Structure levels opened before and closed after each command's segment:
+# 1 document, 2 document and color, 3 document, color and block.
+OPEN_LEVELS = {
+    SEQUIN_MODE: 3,
+    SEQUIN_EJECT: 3,
+    STITCH: 3,
+    TRIM: 2,
+    JUMP: 3,
+    COLOR_CHANGE: 1,
+    NEEDLE_SET: 2,
+    STOP: 3,
+    SLOW: 3,
+    FAST: 3,
+    END: 3,
+}
+CLOSE_LEVELS = {
+    TRIM: 1,
+    COLOR_CHANGE: 2,
+    END: 3,
+}
+
 
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     writer = GenericWriter(pattern, f, settings)
     writer.write()
 
 
+def template_fields(template):
+    """Returns the format dictionary keys referenced by a template."""
+    if isinstance(template, dict):
+        key, default = template[None]
+        fields = template_fields(key) | template_fields(default)
+        for value in template.values():
+            if not isinstance(value, tuple):
+                fields |= template_fields(value)
+        return fields
+    fields = set()
+    if template is None:
+        return fields
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        if field_name is None:
+            continue
+        fields.add(field_name.partition(".")[0].partition("[")[0])
+        if format_spec:
+            fields |= template_fields(format_spec)
+    return fields
+
+
+def compile_template(template):
+    """Returns a callable formatting the template with a format dictionary.
+
+    Templates without replacement fields are formatted once, up front. A dict
+    template keeps its shape, with its key template, default and values
+    compiled."""
+    if template is None:
+        return None
+    if isinstance(template, dict):
+        key, default = template[None]
+        compiled = {
+            value_key: compile_template(value)
+            for value_key, value in template.items()
+            if value_key is not None
+        }
+        compiled[None] = compile_template(key), compile_template(default)
+        return compiled
+    if not template_fields(template):
+        text = template.format_map({})
+        return lambda format_dictionary: text
+    return template.format_map
+
+
 class GenericWriter:
     """
     Generic Writer will write generic data fit to a formatted set of strings.
@@ -48,6 +193,8 @@ class GenericWriter:
     trims and jumps occurring after a color change belong to the next color.
 
     Missing segments are treated as if they never existed. Value properties will differ if segments are excluded.
+
+    Templates are analysed once: per-stitch values are only computed for the fields the templates reference.
     """
 
     def __init__(self, pattern: EmbPattern, f: BinaryIO, settings):
@@ -84,6 +231,24 @@ class GenericWriter:
         self.fast = settings.get("fast", None)
         self.end = settings.get("end", None)
 
+        self.templates = {key: compile_template(settings.get(key, None)) for key in TEMPLATE_KEYS}
+        segment = self.templates["segment"]
+        self.command_segments = {}
+        for command, key in COMMAND_TEMPLATES:
+            template = self.templates[key]
+            self.command_segments[command] = template if template is not None else segment
+
+        fields = set()
+        for key in TEMPLATE_KEYS:
+            fields |= template_fields(settings.get(key, None))
+        self.position_fields = tuple(
+            (key, i) for i, key in enumerate(POSITION_FIELDS) if key in fields
+        )
+        self.command_fields = tuple(
+            (key, i) for i, key in enumerate(COMMAND_FIELDS) if key in fields
+        )
+        self.buffer = []
+
         self.format_dictionary = {}
         self.pattern_established = False
         self.document_established = False
@@ -123,85 +288,51 @@ class GenericWriter:
         self.color_opening = False
         self.document_opening = False
 
+    def write_template(self, key):
+        template = self.templates[key]
+        if template is not None:
+            self.write_string(template(self.format_dictionary))
+
+    def write_string(self, string):
+        buffer = self.buffer
+        buffer.append(string)
+        if len(buffer) >= WRITE_CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            write_string_utf8(self.f, "".join(self.buffer))
+            self.buffer.clear()
+
     def write_opens(self):
         if self.document_opening:
             self.document_opening = False
-            if self.document_start is not None:
-                write_string_utf8(self.f, self.document_start.format_map(self.format_dictionary))
+            self.write_template("document_start")
         if self.color_opening:
             self.color_opening = False
-            if self.color_join is not None and self.color_index != 0:
-                write_string_utf8(self.f, self.color_join.format_map(self.format_dictionary))
-            if self.color_start is not None:
-                write_string_utf8(self.f, self.color_start.format_map(self.format_dictionary))
+            if self.color_index != 0:
+                self.write_template("color_join")
+            self.write_template("color_start")
         if self.block_opening:
             self.block_opening = False
-            if self.block_join is not None and self.block_index != 0:
-                write_string_utf8(self.f, self.block_join.format_map(self.format_dictionary))
-            if self.block_start is not None:
-                write_string_utf8(self.f, self.block_start.format_map(self.format_dictionary))
+            if self.block_index != 0:
+                self.write_template("block_join")
+            self.write_template("block_start")
 
     def write_closes(self):
         if self.block_closing:
             self.block_closing = False
-            if self.block_end is not None:
-                write_string_utf8(self.f, self.block_end.format_map(self.format_dictionary))
+            self.write_template("block_end")
         if self.color_closing:
             self.color_closing = False
-            if self.color_end is not None:
-                write_string_utf8(self.f, self.color_end.format_map(self.format_dictionary))
+            self.write_template("color_end")
         if self.document_closing:
             self.document_closing = False
-            if self.document_end is not None:
-                write_string_utf8(self.f, self.document_end.format_map(self.format_dictionary))
+            self.write_template("document_end")
 
     def get_write_segment(self, cmd):
-        # SEQUIN_MODE
-        if cmd == SEQUIN_MODE and self.sequin_mode is not None:
-            return self.sequin_mode
-
-        # SEQUIN
-        if cmd == SEQUIN_EJECT and self.sequin is not None:
-            return self.sequin
-
-        # STITCH
-        if cmd == STITCH and self.stitch is not None:
-            return self.stitch
-
-        # TRIM
-        if cmd == TRIM and self.trim is not None:
-            return self.trim
-
-        # JUMP
-        if cmd == JUMP and self.jump is not None:
-            return self.jump
-
-        # COLOR CHANGE
-        if cmd == COLOR_CHANGE and self.color_change is not None:
-            return self.color_change
-
-        # NEEDLE SET
-        if cmd == NEEDLE_SET and self.needle_set is not None:
-            return self.needle_set
-
-        # STOP COMMAND
-        if cmd == STOP and self.stop is not None:
-            return self.stop
-
-        # SLOW COMMAND
-        if cmd == SLOW and self.slow is not None:
-            return self.slow
-
-        # FAST COMMAND
-        if cmd == FAST and self.fast is not None:
-            return self.fast
-
-        # END COMMAND
-        if cmd == END and self.end is not None:
-            return self.end
-
-        # GENERIC SEGMENT
-        return self.segment
+        # Specific commands override the generic segment.
+        return self.command_segments.get(cmd, self.templates["segment"])
 
     def set_document_statistics(self):
         pattern = self.pattern
@@ -219,10 +350,8 @@ class GenericWriter:
             else:
                 stitch_counts[command] = 1
 
-        names = get_common_name_dictionary()
-        for name in names:
-            value = names[name].lower()
-            self.format_dictionary[value + "_count"] = stitch_counts.get(name,0)
+        for name, value in COMMAND_NAMES.items():
+            self.format_dictionary[value.lower() + "_count"] = stitch_counts.get(name, 0)
         self.format_dictionary.update(
             {
                 "stitch_total": pattern.count_stitches(),
@@ -243,35 +372,24 @@ class GenericWriter:
         )
 
     def update_positions(self, x, y, cmd):
-        self.dx = x - self.last_x
-        self.dy = y - self.last_y
+        last_x = self.last_x
+        last_y = self.last_y
+        self.dx = x - last_x
+        self.dy = y - last_y
         idx = int(round(x - self.xx))
         idy = int(round(y - self.yy))
         self.xx += idx
         self.yy += idy
-        self.format_dictionary.update(
-            {
-                "x": x,
-                "y": y,
-                "z": self.z,
-                "_x": -x,
-                "_y": -y,
-                "dx": self.dx,
-                "dy": self.dy,
-                "idx": idx,
-                "idy": idy,
-                "_idx": -idx,
-                "_idy": -idy,
-                "ix": self.xx,
-                "iy": self.yy,
-                "_ix": -self.xx,
-                "_iy": -self.yy,
-                "last_x": self.last_x,
-                "last_y": self.last_y,
-                "_last_x": -self.last_x,
-                "_last_y": -self.last_y,
-            }
-        )
+        if self.position_fields:
+            xx = self.xx
+            yy = self.yy
+            values = (
+                x, y, self.z, -x, -y, self.dx, self.dy, idx, idy, -idx, -idy,
+                xx, yy, -xx, -yy, last_x, last_y, -last_x, -last_y,
+            )
+            format_dictionary = self.format_dictionary
+            for key, i in self.position_fields:
+                format_dictionary[key] = values[i]
         if cmd == STITCH:
             self.z += self.z_increment
         self.last_x = x
@@ -285,7 +403,7 @@ class GenericWriter:
             self.cmd, self.thread, self.needle, self.order = decode_embroidery_command(
                 self.command
             )
-            self.cmd_str = pystitch.get_common_name_dictionary()[self.cmd]
+            self.cmd_str = COMMAND_NAMES[self.cmd]
         except IndexError:
             self.current_stitch = None
             self.x = None
@@ -296,25 +414,24 @@ class GenericWriter:
             self.needle = None
             self.order = None
             self.cmd_str = None
-        self.format_dictionary.update(
-            {
-                "index": self.command_index,
-                "command": self.command,
-                "cmd_str": self.cmd_str,
-                "cmd": self.cmd,
-                "cmd_thread": self.thread,
-                "cmd_needle": self.needle,
-                "cmd_order": self.order,
-            }
-        )
+        if self.command_fields:
+            values = (
+                self.command_index,
+                self.command,
+                self.cmd_str,
+                self.cmd,
+                self.thread,
+                self.needle,
+                self.order,
+            )
+            format_dictionary = self.format_dictionary
+            for key, i in self.command_fields:
+                format_dictionary[key] = values[i]
 
     def open_pattern(self):
         if not self.pattern_established:
             self.pattern_established = True
-            if self.pattern_start is not None:
-                write_string_utf8(
-                    self.f, self.pattern_start.format_map(self.format_dictionary)
-                )
+            self.write_template("pattern_start")
 
     def open_document(self):
         # DOCUMENT START
@@ -375,26 +492,20 @@ class GenericWriter:
 
     def write_segment(self, segment):
         # SEGMENT
-        if self.segment_start is not None:
-            write_string_utf8(self.f, self.segment_start.format_map(self.format_dictionary))
+        self.write_template("segment_start")
 
-        write_string_utf8(self.f, segment.format_map(self.format_dictionary))
+        self.write_string(segment(self.format_dictionary))
 
         # SEGMENT JOIN
-        if self.segment_join is not None:
-            write_string_utf8(self.f, self.segment_join.format_map(self.format_dictionary))
+        self.write_template("segment_join")
 
         # SEGMENT_END
-        if self.segment_end is not None:
-            write_string_utf8(self.f, self.segment_end.format_map(self.format_dictionary))
+        self.write_template("segment_end")
 
     def close_pattern(self):
         if self.pattern_established:
             self.pattern_established = False
-            if self.pattern_end is not None:
-                write_string_utf8(
-                    self.f, self.pattern_end.format_map(self.format_dictionary)
-                )
+            self.write_template("pattern_end")
 
     def close_document(self):
         # DOCUMENT END
@@ -427,9 +538,7 @@ class GenericWriter:
                     "metadata_key": str(key),
                     "metadata_value": str(value),
                 })
-                write_string_utf8(
-                    self.f, self.metadata_entry.format_map(self.format_dictionary)
-                )
+                self.write_template("metadata_entry")
 
         if self.thread_entry is not None:
             for i, thread in enumerate(self.pattern.threadlist):
@@ -446,9 +555,7 @@ class GenericWriter:
                     "thread_green": thread.get_green(),
                     "thread_blue": thread.get_blue(),
                 })
-                write_string_utf8(
-                    self.f, self.thread_entry.format_map(self.format_dictionary)
-                )
+                self.write_template("thread_entry")
         for self.command_index in range(0, len(self.pattern.stitches)):
             self.update_command()
             write_segment = self.get_write_segment(self.cmd)
@@ -457,117 +564,26 @@ class GenericWriter:
             if write_segment is not None:
                 if isinstance(write_segment, dict):
                     key, default = write_segment[None]
-                    key = key.format_map(self.format_dictionary)
+                    key = key(self.format_dictionary)
                     write_segment = write_segment.get(key, default)
                 self.update_positions(self.x, self.y, self.cmd)
-                if self.cmd == SEQUIN_MODE:
-                    self.open_document()
-                    self.open_color()
-                    self.open_block()
-
-                # SEQUIN
-                if self.cmd == SEQUIN_EJECT:
-                    self.open_document()
-                    self.open_color()
-                    self.open_block()
-
-                # STITCH
-                if self.cmd == STITCH:
-                    self.open_document()
-                    self.open_color()
-                    self.open_block()
-
-                # TRIM
-                if self.cmd == TRIM:
-                    self.open_document()
-                    self.open_color()
-
-                # JUMP
-                if self.cmd == JUMP:
-                    self.open_document()
-                    self.open_color()
-                    self.open_block()
-
-                # COLOR CHANGE
-                if self.cmd == COLOR_CHANGE:
-                    self.open_document()
-
-                # NEEDLE SET
-                if self.cmd == NEEDLE_SET:
-                    self.open_document()
-                    self.open_color()
-
-                # STOP COMMAND
-                if self.cmd == STOP:
-                    self.open_document()
-                    self.open_color()
-                    self.open_block()
-
-                # SLOW COMMAND
-                if self.cmd == SLOW:
-                    self.open_document()
-                    self.open_color()
-                    self.open_block()
-
-                # FAST COMMAND
-                if self.cmd == FAST:
-                    self.open_document()
-                    self.open_color()
-                    self.open_block()
-
-                # END COMMAND
-                if self.cmd == END:
+                level = OPEN_LEVELS.get(self.cmd, 0)
+                if level >= 1:
                     self.open_document()
+                if level >= 2:
                     self.open_color()
+                if level >= 3:
                     self.open_block()
 
                 self.write_opens()
                 self.write_segment(write_segment)
 
-                if self.cmd == SEQUIN_MODE:
-                    pass
-
-                # SEQUIN
-                if self.cmd == SEQUIN_EJECT:
-                    pass
-
-                # STITCH
-                if self.cmd == STITCH:
-                    pass
-
-                # TRIM
-                if self.cmd == TRIM:
-                    self.close_block()
-
-                # JUMP
-                if self.cmd == JUMP:
-                    pass
-
-                # COLOR CHANGE
-                if self.cmd == COLOR_CHANGE:
-                    self.close_block()
-                    self.close_color()
-
-                # NEEDLE SET
-                if self.cmd == NEEDLE_SET:
-                    pass
-
-                # STOP COMMAND
-                if self.cmd == STOP:
-                    pass
-
-                # SLOW COMMAND
-                if self.cmd == SLOW:
-                    pass
-
-                # FAST COMMAND
-                if self.cmd == FAST:
-                    pass
-
-                # END COMMAND
-                if self.cmd == END:
+                level = CLOSE_LEVELS.get(self.cmd, 0)
+                if level >= 1:
                     self.close_block()
+                if level >= 2:
                     self.close_color()
+                if level >= 3:
                     self.close_document()
                 self.write_closes()
 
@@ -575,3 +591,4 @@ class GenericWriter:
         self.close_color()
         self.close_document()
         self.close_pattern()
+        self.flush()
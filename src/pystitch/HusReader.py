@@ -2,7 +2,7 @@ from typing import BinaryIO
 
 from .EmbCompress import expand
 from .EmbPattern import EmbPattern
-from .EmbThreadHus import get_thread_set
+from .EmbThreadHus import get_thread_palette
 from .ReadHelper import read_int_16le, read_int_32le, read_string_8, signed8, signed16
 
 
@@ -24,7 +24,7 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
 
     unknown_16_bit = read_int_16le(f)
 
-    hus_thread_set = get_thread_set()
+    hus_thread_set = get_thread_palette().copies()
     for i in range(0, number_of_colors):
         index = read_int_16le(f)
         out.add_thread(hus_thread_set[index])
@@ -1,24 +1,29 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
-from .WriteHelper import write_int_8, write_int_16be, write_int_32be, write_string_utf8
+from .WriteHelper import (
+    buffered,
+    patch,
+    placeholder,
+    write_int_8,
+    write_int_16be,
+    write_int_32be,
+    write_string_utf8,
+)
 
 ENCODE = False
 
 
 def patch_byte_offset(stream, offset):
-    current_pos = stream.tell()
-    stream.seek(offset, 0)  # Absolute position seek.
-    position = current_pos - offset - 4  # 4 bytes int32
-    write_int_32be(stream, position)
-    stream.seek(current_pos, 0)  # Absolute position seek.
+    position = stream.tell() - offset - 4  # 4 bytes int32
+    patch(stream, offset, ">I", position)
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     write_int_32be(f, 1)
     write_int_32be(f, 8)
-    placeholder = f.tell()
-    write_int_32be(f, 0)  # Placeholder.
+    placeholder_end = placeholder(f, ">I")
     write_int_32be(f, len(pattern.threadlist))
     index = 0
     for thread in pattern.threadlist:
@@ -41,4 +46,4 @@ def write(pattern: EmbPattern, f: BinaryIO, settings=None):
         write_int_8(f, 0)
         write_string_utf8(f, chart)
         write_int_8(f, 0)
-    patch_byte_offset(f, placeholder)
+    patch_byte_offset(f, placeholder_end)
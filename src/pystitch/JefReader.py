@@ -1,27 +1,35 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
-from .EmbThreadJef import get_thread_set
-from .ReadHelper import read_int_32le, signed8
+from .EmbProgress import progress_for
+from .EmbThreadJef import get_thread_palette
+from .ReadHelper import read_int_32le, read_view, signed8
 
 
 def read_jef_stitches(f: BinaryIO, out: EmbPattern, settings=None):
     color_index = 1
-    while True:
-        b = bytearray(f.read(2))
-        if len(b) != 2:
-            break
-        if b[0] != 0x80:
-            x = signed8(b[0])
-            y = -signed8(b[1])
+    data = read_view(f)
+    progress = progress_for(settings, len(data))
+    checkpoint = progress.next
+    i = 0
+    end = len(data) - 1
+    while i < end:
+        if i >= checkpoint:
+            checkpoint = progress.update(i)
+        b0 = data[i]
+        b1 = data[i + 1]
+        i += 2
+        if b0 != 0x80:
+            x = signed8(b0)
+            y = -signed8(b1)
             out.stitch(x, y)
             continue
-        ctrl = b[1]
-        b = bytearray(f.read(2))
-        if len(b) != 2:
+        ctrl = b1
+        if i >= end:
             break
-        x = signed8(b[0])
-        y = -signed8(b[1])
+        x = signed8(data[i])
+        y = -signed8(data[i + 1])
+        i += 2
         if ctrl == 0x02:
             if x == 0 and y == 0:
                 # My Janome MC400E only trims if there are three jumps in a
@@ -44,6 +52,7 @@ def read_jef_stitches(f: BinaryIO, out: EmbPattern, settings=None):
         if ctrl == 0x10:
             break
         break  # Uncaught Control
+    progress.finish()
     out.end(0, 0)
 
     clipping = True
@@ -63,7 +72,7 @@ def read_jef_stitches(f: BinaryIO, out: EmbPattern, settings=None):
 
 
 def read(f: BinaryIO, out: EmbPattern, settings=None):
-    jef_threads = get_thread_set()
+    jef_threads = get_thread_palette().copies()
     stitch_offset = read_int_32le(f)
     f.seek(20, 1)
     count_colors = read_int_32le(f)
@@ -3,8 +3,8 @@ from typing import BinaryIO
 
 from .EmbConstant import *
 from .EmbPattern import EmbPattern
-from .EmbThreadJef import get_thread_set
-from .WriteHelper import write_int_8, write_int_32le, write_string_utf8
+from .EmbThreadJef import get_thread_palette
+from .WriteHelper import buffered, write_int_8, write_int_32le, write_string_utf8
 
 SEQUIN_CONTINGENCY = CONTINGENCY_SEQUIN_JUMP
 FULL_JUMP = True
@@ -19,7 +19,11 @@ HOOP_140X200 = 2
 HOOP_126X110 = 3
 HOOP_200X200 = 4
 
+# Header date used with the deterministic setting.
+DETERMINISTIC_DATE = "20000101000000"
 
+
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     trims = False
     command_count_max = 3
@@ -28,13 +32,15 @@ def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     if settings is not None:
         trims = settings.get("trims", trims)
         command_count_max = settings.get("trim_at", command_count_max)
+        if settings.get("deterministic", False):
+            date_string = DETERMINISTIC_DATE
         date_string = settings.get("date", date_string)
 
     pattern.fix_color_count()
     # REMOVE BUG: color_count = pattern.count_threads(). #
 
     # PATCH
-    jef_threads = get_thread_set()
+    jef_threads = get_thread_palette()
     last_index = None
     last_thread = None
     palette = []
@@ -52,12 +58,8 @@ def write(pattern: EmbPattern, f: BinaryIO, settings=None):
             index_of_jefthread = thread.find_nearest_color_index(jef_threads)
             if last_index == index_of_jefthread and last_thread != thread:
                 # Last thread and current thread pigeonhole to same jefcolor.
-                # We set that thread to None. And get the second closest color.
-                repeated_thread = jef_threads[index_of_jefthread]
-                repeated_index = index_of_jefthread
-                jef_threads[index_of_jefthread] = None
-                index_of_jefthread = thread.find_nearest_color_index(jef_threads)
-                jef_threads[repeated_index] = repeated_thread
+                # We exclude that thread and get the second closest color.
+                index_of_jefthread = jef_threads.nearest(thread, (index_of_jefthread,))
             palette.append(index_of_jefthread)
             last_index = index_of_jefthread
             last_thread = thread
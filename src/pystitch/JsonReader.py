@@ -6,26 +6,14 @@ from .EmbThread import EmbThread
 
 
 def decoded_command(command_dict, name):
-    split = name.split(" ")
-    command = command_dict[split[0]]
-    for sp in split[1:]:
-        if sp[0] == "n":
-            needle = int(sp[1:])
-            command |= (needle + 1) << 16
-        if sp[0] == "o":
-            order = int(sp[1:])
-            command |= (order + 1) << 24
-        if sp[0] == "t":
-            thread = int(sp[1:])
-            command |= (thread + 1) << 8
-    return command
+    # Kept for compatibility, names always decode with the standard commands.
+    return decode_command_name(name)
 
 
 def read(f: BinaryIO, out: EmbPattern, settings=None):
     import json
 
     json_object = json.load(f)
-    command_dict = get_command_dictionary()
     stitches = json_object["stitches"]
     extras = json_object["extras"]
     threadlist = json_object["threadlist"]
@@ -39,6 +27,18 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
         thread.chart = t["chart"]
         thread.weight = t["weight"]
         out.add_thread(thread)
+    # Compact files store numeric commands, others the command names. Each
+    # distinct command is decoded once and the parsed lists are reused.
+    commands = {}
     for s in stitches:
-        out.stitches.append([s[0], s[1], decoded_command(command_dict, s[2])])
+        command = s[2]
+        code = commands.get(command)
+        if code is None:
+            if isinstance(command, int):
+                code = command
+            else:
+                code = decode_command_name(command)
+            commands[command] = code
+        s[2] = code
+    out.stitches.extend(stitches)
     out.extras.update(extras)
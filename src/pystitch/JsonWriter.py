@@ -6,6 +6,8 @@ from .EmbPattern import EmbPattern
 ENCODE = False
 WRITE_FILE_IN_TEXT_MODE = True
 
+STITCH_CHUNK = 4096  # stitches encoded per write.
+
 
 def decoded_name(names, data):
     command = decode_embroidery_command(data)
@@ -22,10 +24,32 @@ def decoded_name(names, data):
     return name
 
 
+def stitch_chunks(pattern: EmbPattern, compact):
+    """Yields the stitches as lists of json-ready entries, STITCH_CHUNK at a time.
+
+    Compact entries keep the numeric command, otherwise each distinct command
+    is decoded to its name once."""
+    stitches = pattern.stitches
+    if compact:
+        for i in range(0, len(stitches), STITCH_CHUNK):
+            yield stitches[i : i + STITCH_CHUNK]
+        return
+    names = get_common_name_dictionary()
+    decoded = {}
+    for i in range(0, len(stitches), STITCH_CHUNK):
+        chunk = []
+        for s in stitches[i : i + STITCH_CHUNK]:
+            name = decoded.get(s[2])
+            if name is None:
+                name = decoded[s[2]] = str(decoded_name(names, s[2]))
+            chunk.append([s[0], s[1], name])
+        yield chunk
+
+
 def write(pattern: EmbPattern, f: TextIO, settings=None):
     import json
 
-    names = get_common_name_dictionary()
+    compact = settings is not None and settings.get("compact", False)
 
     metadata = {}
     for item in pattern.extras.items():
@@ -50,9 +74,31 @@ def write(pattern: EmbPattern, f: TextIO, settings=None):
             }
             for thread in pattern.threadlist
         ],
-        "stitches": [
-            [s[0], s[1], str(decoded_name(names, s[2]))] for s in pattern.stitches
-        ],
+        "stitches": [],
         "extras": metadata,
     }
-    json.dump(json_normal, f, indent=4)
+    if compact:
+        document = json.dumps(json_normal, separators=(",", ":"))
+        head, stitches, tail = document.partition('"stitches":[]')
+        f.write(head + '"stitches":[')
+        separator = ""
+        for chunk in stitch_chunks(pattern, True):
+            f.write(separator + json.dumps(chunk, separators=(",", ":"))[1:-1])
+            separator = ","
+        f.write("]" + tail)
+        return
+
+    # The stitches are spliced into the indented document a chunk at a time,
+    # each chunk re-indented to the depth of the stitches list.
+    document = json.dumps(json_normal, indent=4)
+    head, stitches, tail = document.partition('"stitches": []')
+    f.write(head + '"stitches": [')
+    separator = "\n"
+    for chunk in stitch_chunks(pattern, False):
+        lines = json.dumps(chunk, indent=4)[2:-2]
+        f.write(separator + "    " + lines.replace("\n", "\n    "))
+        separator = ",\n"
+    if separator == "\n":
+        f.write("]" + tail)
+    else:
+        f.write("\n    ]" + tail)
@@ -1,8 +1,9 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
-from .EmbThreadPec import get_thread_set
-from .ReadHelper import read_int_8, read_int_24le, read_string_8
+from .EmbProgress import progress_for
+from .EmbThreadPec import get_thread_palette
+from .ReadHelper import read_int_8, read_int_24le, read_string_8, read_view
 
 JUMP_CODE = 0x10
 TRIM_CODE = 0x20
@@ -12,11 +13,11 @@ FLAG_LONG = 0x80
 def read(f: BinaryIO, out: EmbPattern, settings=None):
     pec_string = read_string_8(f, 8)
     # pec_string must equal #PEC0001
-    read_pec(f, out)
+    read_pec(f, out, settings=settings)
     out.interpolate_duplicate_color_as_stop()
 
 
-def read_pec(f: BinaryIO, out: EmbPattern, pes_chart=None):
+def read_pec(f: BinaryIO, out: EmbPattern, pes_chart=None, settings=None):
     f.seek(3, 1)  # LA:
     label = read_string_8(f, 16)  # Label
     if label is not None:
@@ -36,7 +37,7 @@ def read_pec(f: BinaryIO, out: EmbPattern, pes_chart=None):
 
     # 3 bytes, '\x31\xff\xf0', 6 2-byte shorts. 15 total.
     f.seek(0x0F, 1)
-    read_pec_stitches(f, out)
+    read_pec_stitches(f, out, settings)
     f.seek(stitch_block_end, 0)
 
     byte_size = pec_graphic_byte_stride * pec_graphic_icon_height
@@ -57,7 +58,7 @@ def read_pec_graphics(f: BinaryIO, out: EmbPattern, size, stride, count, values)
 
 
 def process_pec_colors(colorbytes, out: EmbPattern, values):
-    thread_set = get_thread_set()
+    thread_set = get_thread_palette().copies()
     max_value = len(thread_set)
     for byte in colorbytes:
         thread_value = thread_set[byte % max_value]
@@ -67,7 +68,7 @@ def process_pec_colors(colorbytes, out: EmbPattern, values):
 
 def process_pec_table(colorbytes, out: EmbPattern, chart, values):
     # This is how PEC actually allocates pre-defined threads to blocks.
-    thread_set = get_thread_set()
+    thread_set = get_thread_palette().copies()
     max_value = len(thread_set)
     thread_map = {}
     for i in range(0, len(colorbytes)):
@@ -113,14 +114,22 @@ def signed7(b):
         return b
 
 
-def read_pec_stitches(f: BinaryIO, out: EmbPattern):
-    while True:
-        val1 = read_int_8(f)
-        val2 = read_int_8(f)
-        if (val1 == 0xFF and val2 == 0x00) or val2 is None:
+def read_pec_stitches(f: BinaryIO, out: EmbPattern, settings=None):
+    data = read_view(f)
+    length = len(data)
+    progress = progress_for(settings, length)
+    checkpoint = progress.next
+    i = 0
+    while i + 1 < length:
+        if i >= checkpoint:
+            checkpoint = progress.update(i)
+        val1 = data[i]
+        val2 = data[i + 1]
+        i += 2
+        if val1 == 0xFF and val2 == 0x00:
             break
         if val1 == 0xFE and val2 == 0xB0:
-            f.seek(1, 1)
+            i += 1
             out.color_change(0, 0)
             continue
         jump = False
@@ -132,9 +141,10 @@ def read_pec_stitches(f: BinaryIO, out: EmbPattern):
                 jump = True
             code = (val1 << 8) | val2
             x = signed12(code)
-            val2 = read_int_8(f)
-            if val2 is None:
+            if i >= length:
                 break
+            val2 = data[i]
+            i += 1
         else:
             x = signed7(val1)
 
@@ -143,9 +153,10 @@ def read_pec_stitches(f: BinaryIO, out: EmbPattern):
                 trim = True
             if val2 & JUMP_CODE != 0:
                 jump = True
-            val3 = read_int_8(f)
-            if val3 is None:
+            if i >= length:
                 break
+            val3 = data[i]
+            i += 1
             code = val2 << 8 | val3
             y = signed12(code)
         else:
@@ -157,4 +168,5 @@ def read_pec_stitches(f: BinaryIO, out: EmbPattern):
             out.move(x, y)
         else:
             out.stitch(x, y)
+    progress.finish()
     out.end()
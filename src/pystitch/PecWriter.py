@@ -4,13 +4,15 @@ from typing import BinaryIO
 from .EmbConstant import *
 from .EmbPattern import EmbPattern
 from .EmbThread import build_unique_palette
-from .EmbThreadPec import get_thread_set
+from .EmbThreadPec import get_thread_palette
 from .PecGraphics import draw_scaled, get_blank
 from .exceptions import TooManyColorChangesError
 from .WriteHelper import (
+    buffered,
+    patch,
+    placeholder,
     write_int_8,
     write_int_16le,
-    write_int_24le,
     write_string_utf8,
 )
 
@@ -30,6 +32,7 @@ PEC_ICON_HEIGHT = 38
 GROUP_LONG = False
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     pattern.fix_color_count()
     pattern.interpolate_stop_as_duplicate_color()
@@ -57,7 +60,7 @@ def write_pec_header(pattern: EmbPattern, f: BinaryIO, threadlist):
     write_int_8(f, int(PEC_ICON_WIDTH / 8))  # PEC BYTE STRIDE
     write_int_8(f, int(PEC_ICON_HEIGHT))  # PEC ICON HEIGHT
 
-    thread_set = get_thread_set()
+    thread_set = get_thread_palette()
 
     color_index_list = build_unique_palette(thread_set, pattern.threadlist)
 
@@ -86,7 +89,7 @@ def write_pec_block(pattern: EmbPattern, f: BinaryIO, extends):
 
     stitch_block_start_position = f.tell()
     f.write(b"\x00\x00")
-    write_int_24le(f, 0)  # Space holder.
+    placeholder(f, "<HB")  # 24 bit stitch block length.
     f.write(b"\x31\xff\xf0")
     write_int_16le(f, int(round(width)))
     write_int_16le(f, int(round(height)))
@@ -96,11 +99,13 @@ def write_pec_block(pattern: EmbPattern, f: BinaryIO, extends):
     pec_encode(pattern, f)
 
     stitch_block_length = f.tell() - stitch_block_start_position
-
-    current_position = f.tell()
-    f.seek(stitch_block_start_position + 2, 0)
-    write_int_24le(f, stitch_block_length)
-    f.seek(current_position, 0)
+    patch(
+        f,
+        stitch_block_start_position + 2,
+        "<HB",
+        stitch_block_length & 0xFFFF,
+        (stitch_block_length >> 16) & 0xFF,
+    )
 
 
 def write_pec_graphics(pattern: EmbPattern, f: BinaryIO, extends):
@@ -17,7 +17,7 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     pes_string = read_string_8(f, 8)
 
     if pes_string == "#PEC0001":
-        read_pec(f, out, loaded_thread_values)
+        read_pec(f, out, loaded_thread_values, settings)
         out.interpolate_duplicate_color_as_stop()
         return
 
@@ -67,7 +67,7 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     else:
         pass  # Header is unrecognised.
     f.seek(pec_block_position, 0)
-    read_pec(f, out, loaded_thread_values)
+    read_pec(f, out, loaded_thread_values, settings)
     out.interpolate_duplicate_color_as_stop()
 
 
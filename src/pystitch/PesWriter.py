@@ -2,9 +2,13 @@ from typing import BinaryIO
 
 from .EmbConstant import *
 from .EmbPattern import EmbPattern
-from .EmbThreadPec import get_thread_set
+from .EmbThread import ThreadPalette
+from .EmbThreadPec import get_thread_palette
 from .PecWriter import write_pec
 from .WriteHelper import (
+    buffered,
+    patch,
+    placeholder,
     write_float_32le,
     write_int_8,
     write_int_16le,
@@ -29,6 +33,7 @@ EMB_ONE = "CEmbOne"
 EMB_SEG = "CSewSeg"
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     pattern.fix_color_count()
     pattern.interpolate_stop_as_duplicate_color()
@@ -64,23 +69,19 @@ def write_truncated_version_1(pattern: EmbPattern, f: BinaryIO):
 def write_truncated_version_6(pattern: EmbPattern, f: BinaryIO):
     chart = pattern.threadlist
     write_string_utf8(f, PES_VERSION_6_SIGNATURE)
-    placeholder_pec_block = f.tell()
-    write_int_32le(f, 0)  # Placeholder for PEC BLOCK
+    placeholder_pec_block = placeholder(f, "<I")  # PEC BLOCK offset
     write_pes_header_v6(pattern, f, chart, 0)
     f.write(bytes(bytearray([0x00] * 5)))
     write_int_16le(f, 0x0000)
     write_int_16le(f, 0x0000)
-    current_position = f.tell()
-    f.seek(placeholder_pec_block, 0)
-    write_int_32le(f, current_position)
-    f.seek(current_position, 0)
+    patch(f, placeholder_pec_block, "<I", f.tell())
     write_pec(pattern, f)
     write_pes_addendum(f, ([0xFF], []))
     write_int_16le(f, 0x0000)  # Found in version 6 not 5,4
 
 
 def write_version_1(pattern: EmbPattern, f: BinaryIO):
-    chart = get_thread_set()
+    chart = get_thread_palette()
     write_string_utf8(f, PES_VERSION_1_SIGNATURE)
 
     extends = pattern.bounds()
@@ -92,8 +93,7 @@ def write_version_1(pattern: EmbPattern, f: BinaryIO):
     right = extends[2] - cx
     bottom = extends[3] - cy
 
-    placeholder_pec_block = f.tell()
-    write_int_32le(f, 0)  # Placeholder for PEC BLOCK
+    placeholder_pec_block = placeholder(f, "<I")  # PEC BLOCK offset
 
     if len(pattern.stitches) == 0:
         write_pes_header_v1(f, 0)
@@ -105,10 +105,7 @@ def write_version_1(pattern: EmbPattern, f: BinaryIO):
         write_int_16le(f, 0x0000)
         write_pes_blocks(f, pattern, chart, left, top, right, bottom, cx, cy)
 
-    current_position = f.tell()
-    f.seek(placeholder_pec_block, 0)
-    write_int_32le(f, current_position)
-    f.seek(current_position, 0)
+    patch(f, placeholder_pec_block, "<I", f.tell())
 
     write_pec(pattern, f)
 
@@ -127,8 +124,7 @@ def write_version_6(pattern: EmbPattern, f: BinaryIO):
     right = extends[2] - cx
     bottom = extends[3] - cy
 
-    placeholder_pec_block = f.tell()
-    write_int_32le(f, 0)  # Placeholder for PEC BLOCK
+    placeholder_pec_block = placeholder(f, "<I")  # PEC BLOCK offset
 
     if len(pattern.stitches) == 0:
         write_pes_header_v6(pattern, f, chart, 0)
@@ -146,10 +142,7 @@ def write_version_6(pattern: EmbPattern, f: BinaryIO):
             write_int_32le(f, i)
             write_int_32le(f, 0)
 
-    current_position = f.tell()
-    f.seek(placeholder_pec_block, 0)
-    write_int_32le(f, current_position)
-    f.seek(current_position, 0)
+    patch(f, placeholder_pec_block, "<I", f.tell())
     color_info = write_pec(pattern, f)
     write_pes_addendum(f, color_info)
     write_int_16le(f, 0x0000)  # Found in version 6 not 5,4
@@ -254,7 +247,7 @@ def write_pes_blocks(f: BinaryIO, pattern: EmbPattern, chart, left, top, right,
         return
 
     write_pes_string_16(f, EMB_ONE)
-    placeholder = write_pes_sewsegheader(f, left, top, right, bottom)
+    placeholder_sections = write_pes_sewsegheader(f, left, top, right, bottom)
     write_int_16le(f, 0xFFFF)
     write_int_16le(f, 0x0000)  # FFFF0000 means more blocks exist
 
@@ -264,10 +257,7 @@ def write_pes_blocks(f: BinaryIO, pattern: EmbPattern, chart, left, top, right,
     sections = data[0]
     colorlog = data[1]
 
-    current_position = f.tell()
-    f.seek(placeholder, 0)
-    write_int_16le(f, sections)
-    f.seek(current_position, 0)  # patch final section count.
+    patch(f, placeholder_sections, "<H", sections)  # patch final section count.
 
     # If there were addition embsewsegheaders or segments they would go here.
 
@@ -312,13 +302,14 @@ def write_pes_sewsegheader(f: BinaryIO, left, top, right, bottom):
     write_int_16le(f, int(height))
     f.write(b"\x00\x00\x00\x00\x00\x00\x00\x00")
 
-    placeholder_needs_section_data = f.tell()
     # sections
-    write_int_16le(f, 0)
+    placeholder_needs_section_data = placeholder(f, "<H")
     return placeholder_needs_section_data
 
 
 def get_as_segments_blocks(pattern: EmbPattern, chart, adjust_x, adjust_y):
+    if not isinstance(chart, ThreadPalette):
+        chart = ThreadPalette(chart)
     color_index = 0
     current_thread = pattern.get_thread_or_filler(color_index)
     color_index += 1
@@ -1,7 +1,7 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
-from .EmbThreadPec import get_thread_set
+from .EmbThreadPec import get_thread_palette
 from .PecReader import read_pec_stitches
 from .ReadHelper import read_int_8, read_int_16le, read_int_32le
 
@@ -10,7 +10,7 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     # should start #PHB0003
     f.seek(0x71, 0)
     color_count = read_int_16le(f)
-    threadset = get_thread_set()
+    threadset = get_thread_palette().copies()
     for i in range(0, color_count):
         out.add_thread(threadset[read_int_8(f) % len(threadset)])
 
@@ -31,5 +31,5 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     # 10 bytes unknown, PEC extends.
     f.seek(color_count2 + 0x15, 1)
 
-    read_pec_stitches(f, out)
+    read_pec_stitches(f, out, settings)
     out.interpolate_duplicate_color_as_stop()
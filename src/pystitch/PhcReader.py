@@ -1,7 +1,7 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
-from .EmbThreadPec import get_thread_set
+from .EmbThreadPec import get_thread_palette
 from .PecReader import read_pec_graphics, read_pec_stitches
 from .ReadHelper import read_int_8, read_int_16le, read_int_32le
 
@@ -12,7 +12,7 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     f.seek(1, 1)
     pec_graphic_byte_stride = read_int_8(f)
     color_count = read_int_16le(f)
-    threadset = get_thread_set()
+    threadset = get_thread_palette().copies()
     for i in range(0, color_count):
         color_index = read_int_8(f)
         if color_index is None:
@@ -33,5 +33,5 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     f.seek(bytes_in_section2 + 10, 1)
     color_count2 = read_int_8(f)
     f.seek(color_count2 + 0x1D, 1)  # 1D toto back
-    read_pec_stitches(f, out)
+    read_pec_stitches(f, out, settings)
     out.interpolate_duplicate_color_as_stop()
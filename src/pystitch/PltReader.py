@@ -1,21 +1,27 @@
 import re
 from typing import TextIO
 
+from .EmbConstant import JUMP, STITCH
 from .EmbPattern import EmbPattern
 
 READ_FILE_IN_TEXT_MODE = True
 
+COORDS = re.compile(r"[-+]?\d+")
+PEN = re.compile(r"\d+")
+
 
 def read(f: TextIO, out: EmbPattern, settings=None):
-    for line in f.readlines():
+    # Pen moves are collected and appended to the pattern in bulk.
+    stitches = []
+    for line in f:
         line = line.strip()
         if line.startswith("PU"):
             try:
                 x, y = get_coords(line)
                 x = float(x) / 4
                 y = float(y) / -4
-                out.move_abs(x, y)
-                out.stitch_abs(x, y)
+                stitches.append([x, y, JUMP])
+                stitches.append([x, y, STITCH])
             except ValueError:
                 pass
 
@@ -24,20 +30,21 @@ def read(f: TextIO, out: EmbPattern, settings=None):
                 x, y = get_coords(line)
                 x = float(x) / 4
                 y = float(y) / -4
-                out.stitch_abs(x, y)
+                stitches.append([x, y, STITCH])
             except ValueError:
                 pass
 
         elif line.startswith("SP"):
-            try:
-                pen_num = re.findall(r"\d+", line)[0]
-                pen = int(pen_num)
-                out.needle_change(pen)
-            except IndexError:
-                pass
+            match = PEN.search(line)
+            if match is not None:
+                out.add_stitches_absolute(stitches)
+                stitches = []
+                out.needle_change(int(match.group()))
 
         elif line == "EN":
             break
+    out.add_stitches_absolute(stitches)
+
 
 def get_coords(line):
-    return re.findall(r"[-+]?\d+", line)
+    return COORDS.findall(line)
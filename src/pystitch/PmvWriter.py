@@ -2,12 +2,13 @@ from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
 from .EmbConstant import *
-from .WriteHelper import write_int_8, write_int_16le, write_string_utf8
+from .WriteHelper import buffered, write_int_8, write_int_16le, write_string_utf8
 
 MAX_STITCH_DISTANCE = 70
 MAX_PERMITTED_STITCHES = 100
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     max_x = -200000000
     min_x = +200000000
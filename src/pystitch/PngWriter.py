@@ -1,15 +1,41 @@
 import struct
 import zlib
+from io import BytesIO
 from typing import BinaryIO
 from math import sqrt
 
+try:
+    import numpy
+except ImportError:  # Optional, the pure Python rasteriser is used without it.
+    numpy = None
+
 from .EmbPattern import EmbPattern
 from .EmbConstant import *
+from .EmbProgress import NO_PROGRESS, progress_for
 from .EmbThread import EmbThread
 
 SEQUIN_CONTINGENCY = CONTINGENCY_SEQUIN_STITCH
 FULL_JUMP = True
 
+# Stitches are drawn this many pixels wide unless the linewidth setting is given.
+LINE_WIDTH = 3
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Compressed image data is written out in IDAT chunks of at most this size.
+IDAT_CHUNK_SIZE = 0x100000
+
+FILTER_NONE = 0
+FILTER_SUB = 1
+FILTER_UP = 2
+FILTER_PAETH = 4
+PNG_FILTERS = {
+    "none": FILTER_NONE,
+    "sub": FILTER_SUB,
+    "up": FILTER_UP,
+    "paeth": FILTER_PAETH,
+    "adaptive": None,  # Per row, whichever filter gives the smallest residuals.
+}
+
 # Static characters for writing to image.
 characters = {
     "0": [
@@ -195,40 +221,152 @@ characters = {
 }
 
 
-def write_png(buf, width, height):
-    """
-    Writes PNG file to disk. Buffer must be RGBA * width * height
-    """
-    width_byte_4 = width * 4
-    raw_data = b"".join(
-        b"\x00" + buf[span : span + width_byte_4]
-        for span in range(0, height * width * 4, width_byte_4)
+def png_pack(png_tag, data):
+    chunk_head = png_tag + data
+    return (
+        struct.pack("!I", len(data))
+        + chunk_head
+        + struct.pack("!I", 0xFFFFFFFF & zlib.crc32(chunk_head))
     )
 
-    def png_pack(png_tag, data):
-        chunk_head = png_tag + data
-        return (
-            struct.pack("!I", len(data))
-            + chunk_head
-            + struct.pack("!I", 0xFFFFFFFF & zlib.crc32(chunk_head))
-        )
 
-    return b"".join(
+def _paeth_predictor(a, b, c):
+    p = a + b - c
+    pa = abs(p - a)
+    pb = abs(p - b)
+    pc = abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    if pb <= pc:
+        return b
+    return c
+
+
+def filter_row(filter_type, row, previous, bpp=4):
+    """
+    Applies a PNG filter to row, given the unfiltered previous row.
+    """
+    if filter_type == FILTER_NONE:
+        return bytes(row)
+    if numpy is not None:
+        np = numpy
+        x = np.frombuffer(row, dtype=np.uint8).astype(np.int16)
+        b = np.frombuffer(previous, dtype=np.uint8).astype(np.int16)
+        a = np.zeros_like(x)
+        a[bpp:] = x[:-bpp]
+        if filter_type == FILTER_SUB:
+            predicted = a
+        elif filter_type == FILTER_UP:
+            predicted = b
+        else:
+            c = np.zeros_like(x)
+            c[bpp:] = b[:-bpp]
+            p = a + b - c
+            pa = np.abs(p - a)
+            pb = np.abs(p - b)
+            pc = np.abs(p - c)
+            predicted = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+        return ((x - predicted) & 0xFF).astype(np.uint8).tobytes()
+    left = bytes(bpp) + row[:-bpp]
+    if filter_type == FILTER_SUB:
+        return bytes([(x - a) & 0xFF for x, a in zip(row, left)])
+    if filter_type == FILTER_UP:
+        return bytes([(x - b) & 0xFF for x, b in zip(row, previous)])
+    upper_left = bytes(bpp) + previous[:-bpp]
+    return bytes(
         [
-            b"\x89PNG\r\n\x1a\n",
-            png_pack(b"IHDR", struct.pack("!2I5B", width, height, 8, 6, 0, 0, 0)),
-            png_pack(b"IDAT", zlib.compress(raw_data, 9)),
-            png_pack(b"IEND", b""),
+            (x - _paeth_predictor(a, b, c)) & 0xFF
+            for x, a, b, c in zip(row, left, previous, upper_left)
         ]
     )
 
 
+def _residual_cost(filtered):
+    # Sum of absolute values of the bytes read as signed, the usual heuristic.
+    if numpy is not None:
+        return int(numpy.abs(numpy.frombuffer(filtered, dtype=numpy.int8).astype(numpy.int32)).sum())
+    return sum(v if v < 128 else 256 - v for v in filtered)
+
+
+def stream_png(stream, buf, width, height, compression=9, png_filter="none"):
+    """
+    Writes an RGBA * width * height buffer to stream as a PNG.
+
+    Rows are filtered and compressed one at a time, so apart from the buffer only
+    a row and at most IDAT_CHUNK_SIZE of compressed data are held in memory.
+    compression is the zlib level, 0-9. png_filter is one of PNG_FILTERS.
+    """
+    if png_filter not in PNG_FILTERS:
+        raise ValueError("Unknown PNG filter: %s" % png_filter)
+    filter_type = PNG_FILTERS[png_filter]
+    stream.write(PNG_SIGNATURE)
+    stream.write(png_pack(b"IHDR", struct.pack("!2I5B", width, height, 8, 6, 0, 0, 0)))
+
+    compressor = zlib.compressobj(compression)
+    pending = []
+    pending_size = 0
+
+    def emit(data):
+        nonlocal pending_size
+        if not data:
+            return
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= IDAT_CHUNK_SIZE:
+            idat = b"".join(pending)
+            del pending[:]
+            for start in range(0, len(idat) - IDAT_CHUNK_SIZE + 1, IDAT_CHUNK_SIZE):
+                stream.write(png_pack(b"IDAT", idat[start : start + IDAT_CHUNK_SIZE]))
+            rest = idat[len(idat) - len(idat) % IDAT_CHUNK_SIZE :]
+            pending_size = len(rest)
+            if rest:
+                pending.append(rest)
+
+    view = memoryview(buf)
+    stride = width * 4
+    previous = bytes(stride)
+    for span in range(0, height * stride, stride):
+        row = view[span : span + stride]
+        if filter_type is None:
+            best = None
+            for candidate in (FILTER_NONE, FILTER_SUB, FILTER_UP, FILTER_PAETH):
+                filtered = filter_row(candidate, row, previous)
+                cost = _residual_cost(filtered)
+                if best is None or cost < best[0]:
+                    best = (cost, candidate, filtered)
+            row_filter, filtered = best[1], best[2]
+        else:
+            row_filter = filter_type
+            filtered = filter_row(filter_type, row, previous)
+        emit(compressor.compress(bytes((row_filter,))))
+        emit(compressor.compress(filtered))
+        if filter_type != FILTER_NONE:
+            previous = bytes(row)
+    emit(compressor.flush())
+    view.release()
+    if pending:
+        stream.write(png_pack(b"IDAT", b"".join(pending)))
+    stream.write(png_pack(b"IEND", b""))
+
+
+def write_png(buf, width, height, compression=9, png_filter="none"):
+    """
+    Returns the PNG file bytes for a buffer of RGBA * width * height.
+    """
+    stream = BytesIO()
+    stream_png(stream, buf, width, height, compression, png_filter)
+    return stream.getvalue()
+
+
 class PngBuffer:
-    def __init__(self, width, height):
-        self.width = int(width + 3)
-        self.height = int(height + 3)
+    def __init__(self, width, height, line_width=LINE_WIDTH):
+        # The margin fits lines up to line_width wide centred on the edges, so
+        # points are drawn offset by the half of the line left of them.
+        self.width = int(width + line_width)
+        self.height = int(height + line_width)
+        self.offset = line_width >> 1
         self.buf = bytearray(4 * self.width * self.height)
-        self.line_width = 3
+        self.line_width = line_width
         self.fancy = True
         self._red = 0
         self._green = 0
@@ -241,6 +379,8 @@ class PngBuffer:
         self._gradient_color_position1 = 0.40
         self._gradient_color_position2 = 0.50
         self._gradient_color_position3 = 0.70
+        self._line_pixels_cache = {}
+        self.use_numpy = numpy is not None
 
     def modify_gradient(
         self,
@@ -257,6 +397,7 @@ class PngBuffer:
         self._gradient_color_position1 = gradient_color_position1
         self._gradient_color_position2 = gradient_color_position2
         self._gradient_color_position3 = gradient_color_position3
+        self._line_pixels_cache.clear()
 
     def set_color(self, r, g, b, a=255):
         self._red = r
@@ -267,6 +408,7 @@ class PngBuffer:
         self._distance_from_black = sqrt(
             (((512 + rmean) * r * r) >> 8) + 4 * g * g + (((767 - rmean) * b * b) >> 8)
         )
+        self._line_pixels_cache.clear()
 
     def gradient(self, position_in_line):
         """
@@ -313,12 +455,58 @@ class PngBuffer:
         v = amount * (to_shade - from_shade) + from_shade
         return max(min(v, 1.0), 0.0)
 
+    def gradient_array(self, positions):
+        """
+        Vectorised gradient() for a NumPy array of positions within lines.
+        """
+        p1 = self._gradient_color_position1
+        p2 = self._gradient_color_position2
+        p3 = self._gradient_color_position3
+        ends = self._gradient_shade_ends
+        edge = self._gradient_shade_edge
+        center = self._gradient_shade_center
+        if numpy.any(positions > 1):
+            raise ValueError("Did not occur within line.")
+        conditions = [positions <= p1, positions <= p2, positions <= p3]
+        start = numpy.select(conditions, [0, p1, p2], p3)
+        span = numpy.select(conditions, [p1 - 0, p2 - p1, p3 - p2], 1 - p3)
+        from_shade = numpy.select(conditions, [ends, edge, center], edge)
+        to_shade = numpy.select(conditions, [edge, center, edge], ends)
+        amount = (positions - start) * (1 / span)
+        v = amount * (to_shade - from_shade) + from_shade
+        return numpy.maximum(numpy.minimum(v, 1.0), 0.0)
+
     def background(self, red, green, blue, alpha):
-        for i in range(0, len(self.buf), 4):
-            self.buf[i] = red
-            self.buf[i + 1] = green
-            self.buf[i + 2] = blue
-            self.buf[i + 3] = alpha
+        self.buf[:] = bytes((red, green, blue, alpha)) * (self.width * self.height)
+
+    def _pixel(self, index, max_pos):
+        """
+        RGBA bytes an opaque plot() writes at index of a line with max_pos steps.
+        """
+        v = self.gradient(index / max_pos) if self.fancy and max_pos > 0 else 1.0
+        if self._distance_from_black < 15:
+            # black is drawn dark gray so that it shows highlights.
+            r = g = b = 35
+        else:
+            r = self._red
+            g = self._green
+            b = self._blue
+        # v is within 0-1 so the channels need no clamping. Opaque plots leave
+        # alpha at 255 less 4 for background tint.
+        return bytes((int(r * v), int(g * v), int(b * v), 251))
+
+    def line_pixels(self, max_pos):
+        """
+        RGBA bytes for every index of a line with max_pos steps. Profiles depend only
+        on the line length, so they are cached until the color or gradient changes.
+        """
+        key = (self.fancy, max_pos)
+        pixels = self._line_pixels_cache.get(key)
+        if pixels is None:
+            pixel = self._pixel
+            pixels = [pixel(index, max_pos) for index in range(max_pos + 1)]
+            self._line_pixels_cache[key] = pixels
+        return pixels
 
     def plot(self, x, y, v=None, a=None):
         """
@@ -333,8 +521,8 @@ class PngBuffer:
         if v is None:
             v = 1.0
         try:
-            x += 1
-            y += 1
+            x += self.offset
+            y += self.offset
             pos = (self.width * y) + x
             idx = pos * 4
             background_a = self.buf[idx + 3]
@@ -386,7 +574,148 @@ class PngBuffer:
         except IndexError:
             pass
 
+    def _put_pixel(self, x, y, pixel):
+        """
+        Writes RGBA bytes at x, y, with the same bounds behavior as plot().
+        """
+        buf = self.buf
+        offset = self.offset
+        idx = ((self.width * (y + offset)) + x + offset) * 4
+        size = len(buf)
+        if -size <= idx < size:
+            if idx < 0:
+                idx += size
+            buf[idx : idx + 4] = pixel
+
     def draw_line(self, x0, y0, x1, y1):
+        """
+        Draws a line of line_width, shaded by the gradient when fancy.
+        Opaque colors are drawn as precomputed spans of pixels; translucent
+        colors are blended pixel by pixel with plot().
+        """
+        if self._alpha != 255:
+            self.plot_line(x0, y0, x1, y1)
+            return
+        odx = abs(x1 - x0)
+        ody = abs(y1 - y0)
+        step_x = -1 if x1 < x0 else 1
+        step_y = -1 if y1 < y0 else 1
+        w = self.line_width
+        left = w >> 1
+        buf = self.buf
+        size = len(buf)
+        width = self.width
+        offset = self.offset
+        put_pixel = self._put_pixel
+        if odx > ody:
+            # x-major: Bresenham y for each x step, with a vertical span per point.
+            pixels = self.line_pixels(odx)
+            dx2 = odx << 1
+            dy2 = ody << 1
+            for k in range(odx + 1):
+                x = x0 + step_x * k
+                y = y0 + step_y * ((dy2 * k + odx) // dx2)
+                pixel = pixels[k]
+                for pos in range(y - left, y - left + w):
+                    idx = ((width * (pos + offset)) + x + offset) * 4
+                    if 0 <= idx < size:
+                        buf[idx : idx + 4] = pixel
+                    else:
+                        put_pixel(x, pos, pixel)
+        else:
+            # y-major: the span for each point is contiguous in the buffer.
+            # Only the first point starts the gradient, see plot_line().
+            span_first = self._pixel(0, ody) * w
+            span_rest = self._pixel(1, ody) * w if ody > 0 else span_first
+            dx2 = odx << 1
+            dy2 = ody << 1
+            for k in range(ody + 1):
+                y = y0 + step_y * k
+                x = x0 + step_x * ((dx2 * k + ody) // dy2) if ody else x0
+                span = span_rest if k else span_first
+                idx = ((width * (y + offset)) + x - left + offset) * 4
+                if 0 <= idx and idx + len(span) <= size:
+                    buf[idx : idx + len(span)] = span
+                else:
+                    pixel = span[:4]
+                    for pos in range(x - left, x - left + w):
+                        put_pixel(pos, y, pixel)
+
+    def draw_polyline(self, points):
+        """
+        Draws lines between consecutive integer points, as draw_line() would.
+        """
+        if self.use_numpy and self._alpha == 255 and len(points) > 2:
+            self._draw_polyline_numpy(points)
+            return
+        last_x = None
+        last_y = None
+        for x, y in points:
+            if last_x is not None:
+                self.draw_line(last_x, last_y, x, y)
+            last_x = x
+            last_y = y
+
+    def _draw_polyline_numpy(self, points):
+        np = numpy
+        points = np.asarray(points, dtype=np.int64)
+        x0 = points[:-1, 0]
+        y0 = points[:-1, 1]
+        dx = points[1:, 0] - x0
+        dy = points[1:, 1] - y0
+        odx = np.abs(dx)
+        ody = np.abs(dy)
+        x_major = odx > ody
+        major = np.where(x_major, odx, ody)
+        minor = np.where(x_major, ody, odx)
+        counts = major + 1
+
+        # One entry per Bresenham point, k counting the steps along its line.
+        line = np.repeat(np.arange(len(major)), counts)
+        k = np.arange(len(line)) - np.repeat(np.cumsum(counts) - counts, counts)
+        line_major = major[line]
+        line_x_major = x_major[line]
+        n = (2 * minor[line] * k + line_major) // (2 * np.maximum(line_major, 1))
+        x = x0[line] + np.where(dx < 0, -1, 1)[line] * np.where(line_x_major, k, n)
+        y = y0[line] + np.where(dy < 0, -1, 1)[line] * np.where(line_x_major, n, k)
+
+        if self.fancy:
+            index = np.where(line_x_major, k, np.minimum(k, 1))
+            v = np.ones(len(line))
+            shaded = line_major > 0
+            v[shaded] = self.gradient_array(index[shaded] / line_major[shaded])
+        else:
+            v = np.ones(len(line))
+        if self._distance_from_black < 15:
+            base = np.array([35, 35, 35])
+        else:
+            base = np.array([self._red, self._green, self._blue])
+        rgb = np.minimum(np.maximum(base * v[:, None], 0), 255).astype(np.uint8)
+        colors = np.empty((len(line), 4), dtype=np.uint8)
+        colors[:, :3] = rgb
+        colors[:, 3] = 251
+
+        # Expand each point to a span across the line, then address the buffer.
+        w = self.line_width
+        offsets = np.arange(-(w >> 1), w - (w >> 1))
+        span_x = x[:, None] + np.where(line_x_major[:, None], 0, offsets)
+        span_y = y[:, None] + np.where(line_x_major[:, None], offsets, 0)
+        offset = self.offset
+        pos = ((self.width * (span_y + offset)) + span_x + offset).ravel()
+        colors = np.repeat(colors, w, axis=0)
+        pixel_count = len(self.buf) // 4
+        inside = (pos >= -pixel_count) & (pos < pixel_count)
+        pos = pos[inside] % pixel_count
+        colors = colors[inside]
+
+        # Later plots overwrite earlier ones, keep the last write per pixel.
+        unique, first = np.unique(pos[::-1], return_index=True)
+        last = len(pos) - 1 - first
+        canvas = np.frombuffer(self.buf, dtype=np.uint8).reshape(-1, 4)
+        canvas[unique] = colors[last]
+        del canvas
+
+    def plot_line(self, x0, y0, x1, y1):
         dy = y1 - y0  # BRESENHAM LINE DRAW ALGORITHM
         dx = x1 - x0
         if dy < 0:
@@ -502,41 +831,136 @@ def draw_guides(draw_buff, extends):
         draw_buff.draw_line(0, y, 30, y)
 
 
+def downsample(buf, width, height, factor):
+    """
+    Box filters an RGBA buffer down by factor, returning (buf, width, height).
+    Colors are averaged weighted by alpha so that transparent pixels do not darken
+    the edges of lines. Partial blocks at the right and bottom average what they cover.
+    """
+    out_width = -(-width // factor)
+    out_height = -(-height // factor)
+    if numpy is not None:
+        np = numpy
+        # Premultiplied sums of up to 16 pixels fit comfortably in 32 bits.
+        pixels = np.zeros((out_height * factor, out_width * factor, 4), dtype=np.uint32)
+        pixels[:height, :width] = np.frombuffer(buf, dtype=np.uint8).reshape(height, width, 4)
+        alpha = pixels[:, :, 3:]
+        pixels[:, :, :3] *= alpha
+        blocks = pixels.reshape(out_height, factor, out_width, factor, 4).sum(axis=(1, 3))
+        rows = np.minimum(height - np.arange(out_height) * factor, factor)
+        columns = np.minimum(width - np.arange(out_width) * factor, factor)
+        counts = rows[:, None] * columns[None, :]
+        alpha_sum = blocks[:, :, 3]
+        out = np.zeros((out_height, out_width, 4), dtype=np.uint8)
+        divisor = np.maximum(alpha_sum, 1)[:, :, None]
+        out[:, :, :3] = (blocks[:, :, :3] + divisor // 2) // divisor
+        out[:, :, 3] = (alpha_sum + counts // 2) // counts
+        return bytearray(out.tobytes()), out_width, out_height
+    out = bytearray(4 * out_width * out_height)
+    for out_y in range(out_height):
+        sums = [0] * (4 * out_width)
+        for y in range(out_y * factor, min(height, (out_y + 1) * factor)):
+            row = y * width * 4
+            for x in range(width):
+                i = row + 4 * x
+                a = buf[i + 3]
+                if a:
+                    o = (x // factor) * 4
+                    sums[o] += buf[i] * a
+                    sums[o + 1] += buf[i + 1] * a
+                    sums[o + 2] += buf[i + 2] * a
+                    sums[o + 3] += a
+        rows = min(height - out_y * factor, factor)
+        for out_x in range(out_width):
+            o = out_x * 4
+            alpha_sum = sums[o + 3]
+            if not alpha_sum:
+                continue
+            count = rows * min(width - out_x * factor, factor)
+            idx = (out_y * out_width + out_x) * 4
+            half = alpha_sum // 2
+            out[idx] = (sums[o] + half) // alpha_sum
+            out[idx + 1] = (sums[o + 1] + half) // alpha_sum
+            out[idx + 2] = (sums[o + 2] + half) // alpha_sum
+            out[idx + 3] = (alpha_sum + count // 2) // count
+    return out, out_width, out_height
+
+
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     guides = settings.get("guides", False)
     extends = pattern.bounds()
     pattern.translate(-extends[0], -extends[1])
     width = int(extends[2] - extends[0])
     height = int(extends[3] - extends[1])
-    draw_buff = PngBuffer(width, height)
+
+    # Thumbnails transform stitches into output pixels before rasterising, so the
+    # canvas scales with max_size rather than the design. The "scale" setting is
+    # applied to the stitches by the encoder before they get here.
+    supersample = int(settings.get("supersample", 1))
+    linewidth = settings.get("linewidth")
+    if not isinstance(linewidth, int):
+        linewidth = LINE_WIDTH
+    scale = 1.0
+    max_size = settings.get("max_size")
+    if max_size is not None:
+        # PngBuffer adds a margin of the line width, so lines are narrowed to
+        # keep that margin inside max_size.
+        linewidth = max(min(linewidth, max_size - 1), 1)
+        extent = max(width, height)
+        if extent and extent + linewidth > max_size:
+            scale = max(max_size - linewidth, 0) / extent
+    thumbnail = scale != 1.0 or supersample > 1
+    scale *= supersample
+    # Supersampled lines are drawn wider, and so need a wider margin.
+    if thumbnail:
+        draw_buff = PngBuffer(int(width * scale), int(height * scale), linewidth * supersample)
+    else:
+        draw_buff = PngBuffer(width, height, linewidth)
     draw_buff.fancy = settings.get("fancy", False)
-    if settings is not None:
-        background = settings.get("background")
-        if background is not None:
-            b = EmbThread()
-            b.set(background)
-            draw_buff.background(b.get_red(), b.get_green(), b.get_blue(), 0xFF)
-        linewidth = settings.get("linewidth")
-        if linewidth is not None and isinstance(linewidth, int):
-            draw_buff.line_width = linewidth
+    background = settings.get("background")
+    if background is not None:
+        b = EmbThread()
+        b.set(background)
+        draw_buff.background(b.get_red(), b.get_green(), b.get_blue(), 0xFF)
 
+    progress = progress_for(settings, len(pattern.stitches))
+    done = 0
     for stitchblock in pattern.get_as_stitchblock():
         block = stitchblock[0]
         thread = stitchblock[1]
         draw_buff.set_color(
             thread.get_red(), thread.get_green(), thread.get_blue(), 255
         )
-        last_x = None
-        last_y = None
-        for stitch in block:
-            x = int(stitch[0])
-            y = int(stitch[1])
-            if last_x is not None:
-                draw_buff.draw_line(last_x, last_y, x, y)
-            last_x = x
-            last_y = y
+        if thumbnail:
+            points = [(int(stitch[0] * scale), int(stitch[1] * scale)) for stitch in block]
+        else:
+            points = [(int(stitch[0]), int(stitch[1])) for stitch in block]
+        if progress is NO_PROGRESS or len(points) <= progress.step:
+            draw_buff.draw_polyline(points)
+        else:
+            # Long blocks are drawn in pieces that share their end points.
+            for start in range(0, len(points) - 1, progress.step):
+                draw_buff.draw_polyline(points[start : start + progress.step + 1])
+                progress.update(done + start)
+        done += len(block)
+        if done >= progress.next:
+            progress.update(done)
+    progress.finish()
 
-    if guides:
+    if guides and not thumbnail:
+        # The guides are labelled in mm and only drawn at full size.
         draw_guides(draw_buff, extends)
 
-    f.write(write_png(draw_buff.buf, draw_buff.width, draw_buff.height))
+    buf = draw_buff.buf
+    width = draw_buff.width
+    height = draw_buff.height
+    if supersample > 1:
+        buf, width, height = downsample(buf, width, height, supersample)
+    stream_png(
+        f,
+        buf,
+        width,
+        height,
+        compression=settings.get("compression", 9),
+        png_filter=settings.get("png_filter", "none"),
+    )
@@ -0,0 +1,103 @@
+import gc
+import json
+import sys
+from array import array
+from base64 import b64decode
+from itertools import compress
+from typing import BinaryIO
+
+from .EmbPattern import EmbPattern
+from .EmbThread import EmbThread
+from .PystWriter import FLAG_X_INTS, FLAG_Y_INTS, HEADER, MAGIC, VERSION, padding
+from .ReadHelper import read_view
+
+TYPECODE_SIZES = {"i": 4, "I": 4, "d": 8, "q": 8}
+
+
+def decode_value(value):
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if isinstance(value, dict):
+        if "$tuple" in value:
+            return tuple(decode_value(value["$tuple"]))
+        if "$bytes" in value:
+            return b64decode(value["$bytes"])
+        if "$bytearray" in value:
+            return bytearray(b64decode(value["$bytearray"]))
+        if "$dict" in value:
+            return {key: decode_value(item) for key, item in value["$dict"].items()}
+    return value
+
+
+def decode_thread(fields):
+    if fields is None:
+        return None
+    thread = EmbThread()
+    (
+        thread.color,
+        thread.description,
+        thread.catalog_number,
+        thread.details,
+        thread.brand,
+        thread.chart,
+        thread.weight,
+    ) = [decode_value(field) for field in fields]
+    return thread
+
+
+def read(f: BinaryIO, out: EmbPattern, settings=None):
+    # Memory-mapped and in-memory sources are viewed in place, not copied.
+    data = read_view(f)
+    magic, version, flags, typecodes, reserved, count, metadata_length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a pystitch native file")
+    if version > VERSION:
+        raise ValueError("pystitch native file version %d is not supported" % version)
+    if flags & ~(FLAG_X_INTS | FLAG_Y_INTS):
+        raise ValueError("pystitch native file flags %#x are not supported" % flags)
+    position = HEADER.size
+    metadata = json.loads(bytes(data[position : position + metadata_length]).decode("utf8"))
+    position += metadata_length + len(padding(metadata_length))
+
+    columns = []
+    masks = []
+    for typecode, flag in zip(typecodes[:3].decode("ascii"), (FLAG_X_INTS, FLAG_Y_INTS, 0)):
+        length = count * TYPECODE_SIZES[typecode]
+        column = data[position : position + length]
+        if column.nbytes != length:
+            raise ValueError("pystitch native file is truncated")
+        if sys.byteorder == "little":
+            column = column.cast(typecode)
+        else:
+            column = array(typecode, bytes(column))
+            column.byteswap()
+        columns.append(column)
+        position += length + len(padding(length))
+        if flags & flag:
+            mask = data[position : position + count]
+            if mask.nbytes != count:
+                raise ValueError("pystitch native file is truncated")
+            masks.append((len(columns) - 1, mask))
+            position += count + len(padding(count))
+
+    out.threadlist.extend(decode_thread(fields) for fields in metadata["threads"])
+    out.extras.update(
+        (key, decode_value(value)) for key, value in metadata["extras"].items()
+    )
+    # Building the stitch lists allocates millions of objects none of which
+    # can be garbage; pausing the collector for it halves the load time.
+    start = len(out.stitches)
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        out.stitches.extend(map(list, zip(*columns)))
+    finally:
+        if collecting:
+            gc.enable()
+    # Columns mixing ints and floats restore the ints the mask marks.
+    stitches = out.stitches
+    for axis, mask in masks:
+        for index in compress(range(start, start + count), mask):
+            stitch = stitches[index]
+            stitch[axis] = int(stitch[axis])
+    out._previousX, out._previousY = metadata["previous"]
@@ -0,0 +1,174 @@
+"""pystitch native binary format: a lossless snapshot of an EmbPattern.
+
+Layout, little-endian throughout:
+
+* header, HEADER: magic b"PYST", version, flags, the array typecodes of the
+  x, y and command columns, reserved (0), stitch count, metadata length.
+* metadata: UTF-8 JSON of the threads, extras and last needle position.
+* x, y and command columns, packed arrays of stitch count items each. When
+  FLAG_X_INTS or FLAG_Y_INTS is set, that coordinate column holds both ints
+  and floats and is followed by a mask of one byte per stitch, 1 for ints.
+
+Metadata, each column and each mask are padded with zeros to a multiple of 8
+bytes so the columns can be viewed in place in a memory-mapped file.
+
+Loading views the columns in place but still builds a list for every stitch,
+because pattern.stitches is a plain list of mutable lists. Load time therefore
+grows with the stitch count: the format is a few times faster to read than the
+machine formats, not constant-time. Loading stitches lazily would need a
+stitch container other than a list, which is out of scope here.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from base64 import b64encode
+from itertools import compress
+from operator import itemgetter
+from typing import BinaryIO
+
+from .EmbPattern import EmbPattern
+
+ENCODE = False
+
+MAGIC = b"PYST"
+VERSION = 1
+HEADER = struct.Struct("<4sHH4sIQQ")
+ALIGNMENT = 8
+
+# Coordinates are stored as 32-bit or 64-bit ints when they all are ints,
+# otherwise as doubles. Commands carry thread, needle and order bits in all 32
+# bits, and are widened to 64 bits only when needed.
+INT_CODE = "i"
+FLOAT_CODE = "d"
+COMMAND_CODE = "I"
+WIDE_CODE = "q"
+
+FLAG_X_INTS = 1
+FLAG_Y_INTS = 2
+
+
+def padding(length):
+    return b"\0" * (-length % ALIGNMENT)
+
+
+def encode_value(value):
+    """Returns value as JSON-ready data, tagging tuples and bytes so they load
+    back as the same types. Returns NotImplemented for anything else."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, list):
+        items = [encode_value(item) for item in value]
+        if NotImplemented in items:
+            return NotImplemented
+        return items
+    if isinstance(value, tuple):
+        items = encode_value(list(value))
+        if items is NotImplemented:
+            return NotImplemented
+        return {"$tuple": items}
+    if isinstance(value, (bytes, bytearray)):
+        key = "$bytes" if isinstance(value, bytes) else "$bytearray"
+        return {key: b64encode(value).decode("ascii")}
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        items = {key: encode_value(item) for key, item in value.items()}
+        if NotImplemented in items.values():
+            return NotImplemented
+        return {"$dict": items}
+    return NotImplemented
+
+
+def encode_metadata(pattern):
+    threads = []
+    for thread in pattern.threadlist:
+        if thread is None:
+            threads.append(None)
+            continue
+        threads.append(
+            [
+                encode_value(thread.color),
+                encode_value(thread.description),
+                encode_value(thread.catalog_number),
+                encode_value(thread.details),
+                encode_value(thread.brand),
+                encode_value(thread.chart),
+                encode_value(thread.weight),
+            ]
+        )
+    extras = {}
+    for key, value in pattern.extras.items():
+        value = encode_value(value)
+        # Like the JSON writer, values that cannot be represented are dropped.
+        if isinstance(key, str) and value is not NotImplemented:
+            extras[key] = value
+    metadata = {
+        "threads": threads,
+        "extras": extras,
+        "previous": [pattern._previousX, pattern._previousY],
+    }
+    return json.dumps(metadata, separators=(",", ":")).encode("utf8")
+
+
+def pack_coordinates(values):
+    """Returns values packed as ints when they all are ints, otherwise as
+    doubles along with a mask marking the ints, or None if there are none."""
+    for typecode in (INT_CODE, WIDE_CODE):
+        try:
+            return array(typecode, values), None
+        except (TypeError, OverflowError):
+            pass
+    try:
+        column = array(FLOAT_CODE, values)
+    except (TypeError, OverflowError) as error:
+        raise ValueError("Stitch coordinates cannot be stored: %s" % error)
+    ints = bytes([isinstance(value, int) for value in values])
+    if 1 not in ints:
+        return column, None
+    for value, stored in zip(compress(values, ints), compress(column, ints)):
+        if stored != value:
+            raise ValueError("Coordinate %d cannot be stored exactly beside floats" % value)
+    return column, ints
+
+
+def pack_commands(values):
+    """Returns values packed as 32-bit unsigned ints, or as 64-bit ints when
+    they do not all fit."""
+    try:
+        return array(COMMAND_CODE, values)
+    except (TypeError, OverflowError):
+        pass
+    try:
+        return array(WIDE_CODE, values)
+    except (TypeError, OverflowError) as error:
+        raise ValueError("Commands must be 64-bit ints to be stored: %s" % error)
+
+
+def write(pattern: EmbPattern, f: BinaryIO, settings=None):
+    stitches = pattern.stitches
+    x, x_ints = pack_coordinates(list(map(itemgetter(0), stitches)))
+    y, y_ints = pack_coordinates(list(map(itemgetter(1), stitches)))
+    columns = (x, y, pack_commands(list(map(itemgetter(2), stitches))))
+    if sys.byteorder != "little":
+        for column in columns:
+            column.byteswap()
+    flags = 0
+    if x_ints is not None:
+        flags |= FLAG_X_INTS
+    if y_ints is not None:
+        flags |= FLAG_Y_INTS
+    metadata = encode_metadata(pattern)
+    typecodes = "".join(column.typecode for column in columns).encode("ascii") + b"\0"
+    parts = [
+        HEADER.pack(MAGIC, VERSION, flags, typecodes, 0, len(stitches), len(metadata)),
+        metadata,
+        padding(len(metadata)),
+    ]
+    for column, ints in zip(columns, (x_ints, y_ints, None)):
+        data = column.tobytes()
+        parts.append(data)
+        parts.append(padding(len(data)))
+        if ints is not None:
+            parts.append(ints)
+            parts.append(padding(len(ints)))
+    f.write(b"".join(parts))
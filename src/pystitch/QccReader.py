@@ -1,14 +1,19 @@
 import re
 from typing import TextIO
 
+from .EmbConstant import JUMP, STITCH
 from .EmbPattern import EmbPattern
 
 READ_FILE_IN_TEXT_MODE = True
 TENTH_MM_PER_INCH = 254
 
+COORDS = re.compile(r"[X,Y]([-+]?\d+\.\d*)")
+
 
 def read(f: TextIO, out: EmbPattern, settings=None):
-    for line in f.readlines():
+    # Moves are collected and appended to the pattern in bulk.
+    stitches = []
+    for line in f:
         line = line.strip()
         if "M02" in line:
             break
@@ -17,11 +22,12 @@ def read(f: TextIO, out: EmbPattern, settings=None):
             x, y = get_coords(line)
             x = float(x) * TENTH_MM_PER_INCH
             y = -float(y) * TENTH_MM_PER_INCH
-            out.move_abs(x, y)
-            out.stitch_abs(x, y)
+            stitches.append([x, y, JUMP])
+            stitches.append([x, y, STITCH])
         except ValueError:
             pass
+    out.add_stitches_absolute(stitches)
 
 
 def get_coords(line):
-    return re.findall(r"[X,Y]([-+]?\d+\.\d*)", line)
+    return COORDS.findall(line)
@@ -1,3 +1,93 @@
+import io
+
+
+class BufferReader(io.BufferedIOBase):
+    """Read-only, seekable binary stream over a buffer-protocol object.
+
+    ``read()`` returns ``bytes`` like any binary file. ``read_view()`` returns
+    a ``memoryview`` slice of the underlying buffer instead, so bytes, bytearray,
+    memoryview and mmap data can be decoded without being copied.
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read_view(self, size=-1):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        length = len(self._view)
+        start = min(self._position, length)
+        if size is None or size < 0:
+            end = length
+        else:
+            end = min(start + size, length)
+        self._position = end
+        return self._view[start:end]
+
+    def read(self, size=-1):
+        return bytes(self.read_view(size))
+
+    read1 = read
+
+    def readinto(self, b):
+        data = self.read_view(len(b))
+        count = len(data)
+        memoryview(b).cast("B")[:count] = data
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError("invalid whence (%r)" % whence)
+        if position < 0:
+            raise ValueError("negative seek position %r" % position)
+        self._position = position
+        return position
+
+    def tell(self):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            # Releasing the view lets an mmap or bytearray owner close/resize again.
+            self._view.release()
+        super().close()
+
+
+def read_view(stream, size=-1):
+    """Reads up to size bytes (default: the rest of the stream) as a memoryview.
+
+    BufferReader and BytesIO streams are sliced in place; any other stream is
+    read once and the resulting bytes are wrapped without a further copy."""
+    if isinstance(stream, BufferReader):
+        return stream.read_view(size)
+    if isinstance(stream, io.BytesIO):
+        start = stream.tell()
+        view = stream.getbuffer()[start:]
+        if size is not None and size >= 0:
+            view = view[:size]
+        stream.seek(start + len(view))
+        return view
+    return memoryview(stream.read(size))
+
+
 def signed8(b):
     if b > 127:
         return -256 + b
@@ -1,37 +1,42 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
-from .EmbThreadSew import get_thread_set
-from .ReadHelper import read_int_16le, signed8
+from .EmbThreadSew import get_thread_palette
+from .ReadHelper import read_int_16le, read_view, signed8
 
 
 def read_sew_stitches(f: BinaryIO, out: EmbPattern):
-    while True:
-        b = bytearray(f.read(2))
-        if len(b) != 2:
-            break
-        if b[0] != 0x80:
-            out.stitch(signed8(b[0]), -signed8(b[1]))
+    data = read_view(f)
+    i = 0
+    end = len(data) - 1
+    while i < end:
+        b0 = data[i]
+        b1 = data[i + 1]
+        i += 2
+        if b0 != 0x80:
+            out.stitch(signed8(b0), -signed8(b1))
             continue
-        control = b[1]
-        b = bytearray(f.read(2))
-        if len(b) != 2:
+        control = b1
+        if i >= end:
             break
+        b0 = data[i]
+        b1 = data[i + 1]
+        i += 2
         if control & 1:
             out.color_change()
             continue
         if control == 0x04 or control == 0x02:
-            out.move(signed8(b[0]), -signed8(b[1]))
+            out.move(signed8(b0), -signed8(b1))
             continue
         if control == 0x10:
-            out.stitch(signed8(b[0]), -signed8(b[1]))
+            out.stitch(signed8(b0), -signed8(b1))
             continue
         break
     out.end()
 
 
 def read(f: BinaryIO, out: EmbPattern, settings=None):
-    threads = get_thread_set()
+    threads = get_thread_palette().copies()
     colors = read_int_16le(f)
     for c in range(0, colors):
         index = read_int_16le(f)
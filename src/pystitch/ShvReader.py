@@ -3,7 +3,7 @@ from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
 from .EmbConstant import *
-from .EmbThreadShv import get_thread_set
+from .EmbThreadShv import get_thread_palette
 from .ReadHelper import (
     read_int_8,
     read_int_16be,
@@ -27,7 +27,7 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     f.seek(4 + int(skip), 1)
     color_count = read_int_8(f)
     f.seek(18, 1)
-    threads = get_thread_set()
+    threads = get_thread_palette().copies()
     stitch_per_color = {}
     for i in range(color_count):
         stitch_count = read_int_32be(f)
@@ -12,4 +12,4 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     dunno_block_start_position = read_int_32le(f)
     stitch_start_position = read_int_32le(f)
     f.seek(stitch_start_position, 0)
-    read_exp_stitches(f, out)
+    read_exp_stitches(f, out, settings)
@@ -30,6 +30,73 @@ ATTR_STROKE_WIDTH = "stroke-width"
 VALUE_NONE = "none"
 
 
+# Paths are written out in pieces of this many points.
+POINTS_PER_WRITE = 1024
+
+
+def number_formatter(precision=None):
+    """Returns a function formatting numbers for svg attributes.
+
+    With precision None numbers are written in full, as str() gives them.
+    Otherwise they are rounded to that many decimals, dropping trailing zeros."""
+    if precision is None:
+        return str
+    template = "%%.%df" % precision
+
+    def format_number(value):
+        text = template % value
+        if "." in text:
+            text = text.rstrip("0").rstrip(".")
+        if text == "-0":
+            return "0"
+        return text
+
+    return format_number
+
+
+def _segment_distance_sq(px, py, ax, ay, bx, by):
+    dx = bx - ax
+    dy = by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        t = 0.0
+    else:
+        t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    ex = ax + t * dx - px
+    ey = ay + t * dy - py
+    return ex * ex + ey * ey
+
+
+def simplify_points(points, tolerance):
+    """Drops points within tolerance of the simplified path (Ramer-Douglas-Peucker).
+
+    Distances are measured to the segment rather than the infinite line, so
+    stitches that double back along the same line are kept."""
+    count = len(points)
+    if count < 3:
+        return points
+    tolerance_sq = tolerance * tolerance
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        start, end = stack.pop()
+        ax, ay = points[start][0], points[start][1]
+        bx, by = points[end][0], points[end][1]
+        farthest = -1.0
+        index = start
+        for i in range(start + 1, end):
+            d = _segment_distance_sq(points[i][0], points[i][1], ax, ay, bx, by)
+            if d > farthest:
+                farthest = d
+                index = i
+        if farthest > tolerance_sq:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
 def create_svg_dom(pattern: EmbPattern):
     root = Element(NAME_SVG)
     root.set(ATTR_VERSION, VALUE_SVG_VERSION)
@@ -50,11 +117,7 @@ def create_svg_dom(pattern: EmbPattern):
         block = stitchblock[0]
         thread = stitchblock[1]
         path = SubElement(root, NAME_PATH)
-        data = "M"
-        for stitch in block:
-            x = stitch[0]
-            y = stitch[1]
-            data += " " + str(x) + "," + str(y)
+        data = "M" + "".join([" " + str(stitch[0]) + "," + str(stitch[1]) for stitch in block])
         path.set(ATTR_DATA, data)
         path.set(ATTR_FILL, VALUE_NONE)
         path.set(ATTR_STROKE, thread.hex_color())
@@ -63,6 +126,72 @@ def create_svg_dom(pattern: EmbPattern):
 
 
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
-    """Writes an svg file of the stitchblocks."""
-    tree = create_svg_dom(pattern)
-    tree.write(f)
+    """Writes an svg file of the stitchblocks.
+
+    The document is written path by path rather than built in memory first.
+    settings may give "precision", the number of decimals for coordinates, and
+    "simplify", a distance below which points are dropped from paths."""
+    precision = None
+    tolerance = None
+    if settings is not None:
+        precision = settings.get("precision")
+        tolerance = settings.get("simplify")
+    number = number_formatter(precision)
+
+    extends = pattern.bounds()
+    width = extends[2] - extends[0]
+    height = extends[3] - extends[1]
+    header = (
+        '<%s %s="%s" %s="%s" %s="%s" %s="%s" %s="%s" %s="%s" %s="%s %s %s %s"'
+        % (
+            NAME_SVG,
+            ATTR_VERSION,
+            VALUE_SVG_VERSION,
+            ATTR_XMLNS,
+            VALUE_XMLNS,
+            ATTR_XMLNS_LINK,
+            VALUE_XLINK,
+            ATTR_XMLNS_EV,
+            VALUE_XMLNS_EV,
+            ATTR_WIDTH,
+            number(width),
+            ATTR_HEIGHT,
+            number(height),
+            ATTR_VIEWBOX,
+            number(extends[0]),
+            number(extends[1]),
+            number(width),
+            number(height),
+        )
+    )
+    f.write(header.encode("ascii"))
+    empty = True
+    for stitchblock in pattern.get_as_stitchblock():
+        if empty:
+            f.write(b">")
+            empty = False
+        block = stitchblock[0]
+        thread = stitchblock[1]
+        if tolerance:
+            block = simplify_points(block, tolerance)
+        f.write(b'<%s %s="M' % (NAME_PATH.encode(), ATTR_DATA.encode()))
+        for start in range(0, len(block), POINTS_PER_WRITE):
+            data = "".join(
+                [
+                    " " + number(stitch[0]) + "," + number(stitch[1])
+                    for stitch in block[start : start + POINTS_PER_WRITE]
+                ]
+            )
+            f.write(data.encode("ascii"))
+        tail = '" %s="%s" %s="%s" %s="3" />' % (
+            ATTR_FILL,
+            VALUE_NONE,
+            ATTR_STROKE,
+            thread.hex_color(),
+            ATTR_STROKE_WIDTH,
+        )
+        f.write(tail.encode("ascii"))
+    if empty:
+        f.write(b" />")
+    else:
+        f.write(b"</%s>" % NAME_SVG.encode())
@@ -2,7 +2,7 @@ from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
 from .EmbThread import EmbThread
-from .ReadHelper import read_int_8, read_int_24be, signed8, read_string_8
+from .ReadHelper import read_int_8, read_int_24be, signed8, read_string_8, read_view
 
 
 def read(f: BinaryIO, out: EmbPattern, settings=None):
@@ -23,13 +23,11 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     f.seek(0x600, 0)
 
     needle = 0
-    while True:
-        byte = bytearray(f.read(3))
-        if len(byte) != 3:
-            break
-        x = byte[0]
-        y = byte[1]
-        ctrl = byte[2]
+    data = read_view(f)
+    for i in range(0, len(data) - 2, 3):
+        x = data[i]
+        y = data[i + 1]
+        ctrl = data[i + 2]
         if ctrl == 0x80:
             out.stitch(signed8(x), -signed8(y))
             continue
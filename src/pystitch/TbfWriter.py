@@ -3,7 +3,7 @@ from typing import BinaryIO
 from . import decode_embroidery_command
 from .EmbPattern import EmbPattern
 from .EmbConstant import *
-from .WriteHelper import write_string_utf8, write_int_8
+from .WriteHelper import buffered, pad_to, write_string_utf8, write_int_8
 
 FULL_JUMP = False
 ROUND = True
@@ -13,6 +13,7 @@ THREAD_CHANGE_COMMAND = NEEDLE_SET
 EXPLICIT_TRIM = True
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     if settings is not None and "ct0" in settings:
         ct0 = settings.get("ct0")
@@ -21,8 +22,7 @@ def write(pattern: EmbPattern, f: BinaryIO, settings=None):
 
     name = pattern.get_metadata("name", "Untitled")
     write_string_utf8(f, "3.00")
-    for i in range(f.tell(), 0x80):
-        f.write(b"\x20")  # space
+    pad_to(f, 0x80, b"\x20")
     write_string_utf8(f, "LA:%-16s\r" % name)
     write_string_utf8(f, "ST:%7d\r" % pattern.count_stitches())
     write_string_utf8(f, "CO:%3d\r" % pattern.count_needle_sets())
@@ -79,15 +79,13 @@ def write(pattern: EmbPattern, f: BinaryIO, settings=None):
             write_int_8(f, 0x20)
 
     # Padding to 501
-    for i in range(f.tell(), 0x376):
-        f.write(b"\x20")  # space
+    pad_to(f, 0x376, b"\x20")
 
     # Seen in only some files.
     f.write(b"\x0d\x1A")
 
     # Pad to the end of the header.
-    for i in range(f.tell(), 0x600):
-        f.write(b"\x20")  # space
+    pad_to(f, 0x600, b"\x20")
     # END HEADER
 
     stitches = pattern.stitches
@@ -130,15 +128,14 @@ def write_ct0(pattern: EmbPattern, filename, settings=None):
         _write_ct0(pattern, f, settings=settings)
 
 
+@buffered
 def _write_ct0(pattern: EmbPattern, f: BinaryIO, settings=None):
     write_string_utf8(f, "TAJ-DGML-PULSE  1-1A 2060(550.0")
     write_int_8(f, 0x81)
     write_string_utf8(f, "~400.0)S         2.00")
-    for i in range(f.tell(), 0x60):
-        f.write(b"\x20")
+    pad_to(f, 0x60, b"\x20")
     write_string_utf8(f, "DC1:100\rDC2:100\rDC3:  0\rDC4:N\rDC5:S\r")
-    for i in range(f.tell(), 0x108):
-        f.write(b"\x20")
+    pad_to(f, 0x108, b"\x20")
     write_string_utf8(f, "NS1:11")
     index = 0
     for stitch in pattern.stitches:
@@ -148,19 +145,14 @@ def _write_ct0(pattern: EmbPattern, f: BinaryIO, settings=None):
             write_int_8(f, needle + 0x30)
             write_int_8(f, 0x31)
             index += 1
-    for i in range(f.tell(), 0x30D):
-        f.write(b"\x20")
+    pad_to(f, 0x30D, b"\x20")
     write_string_utf8(f, "\rRP0:N\rRP1:  \rRP2:  \rRP3:      \rRP4:      \rRP5: \rRP6: \rRP7: \rST1:")
-    for i in range(f.tell(), 0x434):
-        f.write(b"\x20")
+    pad_to(f, 0x434, b"\x20")
     write_string_utf8(f, "ST0:0\rAO1:0\rAO2:0\rAO3:0\rOF1:            \rOF2:            \rOF3:            \rNS2:")
     for i in range(index):
         write_int_8(f, 0x30)
-    for i in range(f.tell(), 0x583):
-        f.write(b"\x20")
+    pad_to(f, 0x583, b"\x20")
     write_string_utf8(f, "\rNS3:")
-    for i in range(f.tell(), 0x778):
-        f.write(b"\x20")
+    pad_to(f, 0x778, b"\x20")
     write_string_utf8(f, "\r\x1A")
-    for i in range(f.tell(), 0x790):
-        f.write(b"\x20")
+    pad_to(f, 0x790, b"\x20")
@@ -1,19 +1,21 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
+from .EmbProgress import progress_for
 from .EmbConstant import *
+from .ReadHelper import read_view
 
 
-def read_u01_stitches(f: BinaryIO, out: EmbPattern):
-    count = 0
-    while True:
-        count += 1
-        byte = bytearray(f.read(3))
-        if len(byte) != 3:
-            break
-        ctrl = byte[0]
-        dy = -byte[1]
-        dx = byte[2]
+def read_u01_stitches(f: BinaryIO, out: EmbPattern, settings=None):
+    data = read_view(f)
+    progress = progress_for(settings, len(data))
+    checkpoint = progress.next
+    for i in range(0, len(data) - 2, 3):
+        if i >= checkpoint:
+            checkpoint = progress.update(i)
+        ctrl = data[i]
+        dy = -data[i + 1]
+        dx = data[i + 2]
         if (ctrl & 0x20) != 0:
             dx = -dx
         if (ctrl & 0x40) != 0:
@@ -83,10 +85,11 @@ def read_u01_stitches(f: BinaryIO, out: EmbPattern):
         if ctrl == 0x2B:
             break  # Rare postfix data from machine. Do not read this.
         break  # Uncaught Command
+    progress.finish()
     out.end()
 
 
 def read(f: BinaryIO, out: EmbPattern, settings=None):
     f.seek(0x80, 1)
     f.seek(0x80, 1)
-    read_u01_stitches(f, out)
+    read_u01_stitches(f, out, settings)
@@ -2,7 +2,7 @@ from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
 from .EmbFunctions import *
-from .WriteHelper import write_int_16le, write_int_32le
+from .WriteHelper import buffered, pad_to, write_int_16le, write_int_32le
 
 THREAD_CHANGE_COMMAND = NEEDLE_SET
 SEQUIN_CONTINGENCY = CONTINGENCY_SEQUIN_JUMP
@@ -12,6 +12,7 @@ MAX_JUMP_DISTANCE = 127
 MAX_STITCH_DISTANCE = 127
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     stitches = pattern.stitches
     stitch_count = len(stitches)
@@ -30,8 +31,7 @@ def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     last_stitch = stitches[stitch_count - 1]
     write_int_16le(f, int(last_stitch[0]))
     write_int_16le(f, -int(last_stitch[1]))
-    for i in range(f.tell(), 0x100):
-        f.write(b"\x00")
+    pad_to(f, 0x100, b"\x00")
     xx = 0
     yy = 0
     trigger_fast = False
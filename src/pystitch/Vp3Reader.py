@@ -1,6 +1,7 @@
 from typing import BinaryIO
 
 from .EmbPattern import EmbPattern
+from .EmbProgress import progress_for
 from .EmbThread import EmbThread
 from .ReadHelper import (
     read_int_8,
@@ -63,10 +64,14 @@ def read(f: BinaryIO, out: EmbPattern, settings=None):
     f.seek(24, 1)
     skip_vp3_string(f)  # "Produced by     Software Ltd"
     count_colors = read_int_16be(f)
+    progress = progress_for(settings, count_colors)
     for i in range(0, count_colors):
+        if i >= progress.next:
+            progress.update(i)
         vp3_read_colorblock(f, out, center_x, center_y)
         if (i + 1) < count_colors:  # Don't add the color change on the final read.
             out.color_change()
+    progress.finish()
     out.end()
 
 
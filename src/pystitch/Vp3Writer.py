@@ -3,6 +3,9 @@ from typing import BinaryIO
 from .EmbConstant import *
 from .EmbPattern import EmbPattern
 from .WriteHelper import (
+    buffered,
+    patch,
+    placeholder,
     write_int_8,
     write_int_16be,
     write_int_24be,
@@ -38,11 +41,8 @@ def vp3_write_length_and_bytes(stream, bytestring):
 
 
 def vp3_patch_byte_offset(stream, offset):
-    current_pos = stream.tell()
-    stream.seek(offset, 0)  # Absolute position seek.
-    position = current_pos - offset - 4  # 4 bytes int32
-    write_int_32be(stream, position)
-    stream.seek(current_pos, 0)  # Absolute position seek.
+    position = stream.tell() - offset - 4  # 4 bytes int32
+    patch(stream, offset, ">I", position)
 
 
 def get_as_colorblocks(pattern: EmbPattern):
@@ -62,6 +62,7 @@ def get_as_colorblocks(pattern: EmbPattern):
     yield (pattern.stitches[last_pos:end], thread)
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     pattern.fix_color_count()
 
@@ -73,8 +74,7 @@ def write(pattern: EmbPattern, f: BinaryIO, settings=None):
 
 def write_file(pattern: EmbPattern, f: BinaryIO):
     f.write(b"\x00\x02\x00")
-    placeholder_distance_end_of_file_block_020 = f.tell()
-    write_int_32be(f, 0)  # placeholder
+    placeholder_distance_end_of_file_block_020 = placeholder(f, ">I")
     # This refers to the end of the final block, not entire bytes.
 
     vp3_write_string_16(f, "")
@@ -114,8 +114,7 @@ def write_file(pattern: EmbPattern, f: BinaryIO):
 
 def write_design_block(f: BinaryIO, extends, colorblocks):
     f.write(b"\x00\x03\x00")
-    placeholder_distance_end_of_design_block_030 = f.tell()
-    write_int_32be(f, 0)
+    placeholder_distance_end_of_design_block_030 = placeholder(f, ">I")
 
     count_colorblocks_total = len(colorblocks)
 
@@ -166,8 +165,7 @@ def write_design_block(f: BinaryIO, extends, colorblocks):
 
 def write_vp3_colorblock(f: BinaryIO, first, center_x, center_y, stitches, thread):
     f.write(b"\x00\x05\x00")
-    placeholder_distance_end_of_color_block_050 = f.tell()
-    write_int_32be(f, 0)
+    placeholder_distance_end_of_color_block_050 = placeholder(f, ">I")
 
     if len(stitches) > 0:
         first_pos_x = stitches[0][0]
@@ -222,8 +220,7 @@ def vp3_write_thread(f: BinaryIO, thread):
 def write_stitches_block(f: BinaryIO, stitches, first_pos_x, first_pos_y):
     # The 0, x, 0 bytes come before placeholders
     f.write(b"\x00\x01\x00")
-    placeholder_distance_to_end_of_stitches_block_010 = f.tell()
-    write_int_32be(f, 0)  # placeholder
+    placeholder_distance_to_end_of_stitches_block_010 = placeholder(f, ">I")
 
     f.write(b"\x0A\xF6\x00")
     last_x = first_pos_x
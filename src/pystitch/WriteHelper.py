@@ -1,109 +1,165 @@
+import errno
+import io
 import struct
-
+from functools import wraps
+
+_pack_uint_16le = struct.Struct("<H").pack
+_pack_uint_16be = struct.Struct(">H").pack
+_pack_uint_32le = struct.Struct("<I").pack
+_pack_uint_32be = struct.Struct(">I").pack
+_pack_float_32le = struct.Struct("<f").pack
+
+
+class BinaryBuilder:
+    """In-memory output that binary writers assemble a file into.
+
+    Fields are appended to a single bytearray, and the finished file reaches
+    the destination in one write. Values that are only known once later data
+    is written, such as block lengths and offsets, are reserved with
+    ``placeholder()`` and filled in with ``patch()``.
+    """
+
+    __slots__ = ("data", "write")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.write = self.data.extend
+
+    def __len__(self):
+        return len(self.data)
+
+    def tell(self):
+        return len(self.data)
+
+    def pack(self, fmt, *values):
+        """Appends values packed with the given struct format."""
+        self.data += struct.pack(fmt, *values)
+
+    def placeholder(self, fmt="<I"):
+        """Reserves zeroed space for a struct format, returning its offset."""
+        offset = len(self.data)
+        self.data += bytes(struct.calcsize(fmt))
+        return offset
+
+    def patch(self, offset, fmt, *values):
+        """Packs values over previously written bytes at offset."""
+        struct.pack_into(fmt, self.data, offset, *values)
+
+    def pad_to(self, offset, fill=b"\x00"):
+        """Appends single-byte fill until the output is offset bytes long."""
+        if len(self.data) < offset:
+            self.data += fill * (offset - len(self.data))
+
+    def getvalue(self):
+        return bytes(self.data)
+
+    def write_to(self, stream):
+        """Writes the output to stream front to back, without seeking.
+
+        Most streams take everything in one write. Raw streams such as pipes
+        and sockets may accept only part of a write, so writing to those
+        continues until everything is taken. A raw write that would block,
+        returning None, raises BlockingIOError, and one that accepts nothing
+        raises IOError, rather than the rest of the output being dropped."""
+        if not isinstance(stream, io.RawIOBase):
+            stream.write(self.data)
+            return
+        view = memoryview(self.data)
+        done = 0
+        try:
+            while done < len(view):
+                written = stream.write(view[done:])
+                if written is None:
+                    raise BlockingIOError(errno.EAGAIN, "write would block", done)
+                if written <= 0:
+                    raise IOError("stream accepted no data after %d bytes" % done)
+                done += written
+        finally:
+            view.release()
+
+
+def buffered(write):
+    """Decorates a ``write(pattern, f, settings)`` writer function so the file
+    is assembled in a BinaryBuilder and written to f with a single call."""
+
+    @wraps(write)
+    def buffered_write(pattern, f, settings=None):
+        out = BinaryBuilder()
+        result = write(pattern, out, settings)
+        out.write_to(f)
+        return result
+
+    return buffered_write
+
+
+# The functions below do the same as the BinaryBuilder methods of the same
+# name, and also work on seekable files so writer helpers can still be given a
+# file directly.
+
+
+def placeholder(stream, fmt="<I"):
+    """Reserves zeroed space for a struct format, returning its offset."""
+    if isinstance(stream, BinaryBuilder):
+        return stream.placeholder(fmt)
+    offset = stream.tell()
+    stream.write(bytes(struct.calcsize(fmt)))
+    return offset
+
+
+def patch(stream, offset, fmt, *values):
+    """Packs values over previously written bytes at offset."""
+    if isinstance(stream, BinaryBuilder):
+        stream.patch(offset, fmt, *values)
+        return
+    position = stream.tell()
+    stream.seek(offset, 0)
+    stream.write(struct.pack(fmt, *values))
+    stream.seek(position, 0)
+
+
+def pad_to(stream, offset, fill=b"\x00"):
+    """Appends single-byte fill until the output is offset bytes long."""
+    if isinstance(stream, BinaryBuilder):
+        stream.pad_to(offset, fill)
+        return
+    position = stream.tell()
+    if position < offset:
+        stream.write(fill * (offset - position))
 
 def write_int_array_8(stream, int_array):
-    for value in int_array:
-        v = bytes(
-            bytearray(
-                [
-                    value & 0xFF,
-                ]
-            )
-        )
-        stream.write(v)
+    stream.write(bytes([value & 0xFF for value in int_array]))
 
 
 def write_int_8(stream, value):
-    v = bytes(
-        bytearray(
-            [
-                value & 0xFF,
-            ]
-        )
-    )
-    stream.write(v)
+    stream.write(bytes((value & 0xFF,)))
 
 
 def write_int_16le(stream, value):
-    v = bytes(
-        bytearray(
-            [
-                (value >> 0) & 0xFF,
-                (value >> 8) & 0xFF,
-            ]
-        )
-    )
-    stream.write(v)
+    stream.write(_pack_uint_16le(value & 0xFFFF))
 
 
 def write_int_16be(stream, value):
-    v = bytes(
-        bytearray(
-            [
-                (value >> 8) & 0xFF,
-                (value >> 0) & 0xFF,
-            ]
-        )
-    )
-    stream.write(v)
+    stream.write(_pack_uint_16be(value & 0xFFFF))
 
 
 def write_int_24le(stream, value):
-    v = bytes(
-        bytearray(
-            [
-                (value >> 0) & 0xFF,
-                (value >> 8) & 0xFF,
-                (value >> 16) & 0xFF,
-            ]
-        )
-    )
-    stream.write(v)
+    stream.write((value & 0xFFFFFF).to_bytes(3, "little"))
 
 
 def write_int_24be(stream, value):
-    v = bytes(
-        bytearray(
-            [
-                (value >> 16) & 0xFF,
-                (value >> 8) & 0xFF,
-                (value >> 0) & 0xFF,
-            ]
-        )
-    )
-    stream.write(v)
+    stream.write((value & 0xFFFFFF).to_bytes(3, "big"))
 
 
 def write_int_32le(stream, value):
-    v = bytes(
-        bytearray(
-            [
-                (value >> 0) & 0xFF,
-                (value >> 8) & 0xFF,
-                (value >> 16) & 0xFF,
-                (value >> 24) & 0xFF,
-            ]
-        )
-    )
-    stream.write(v)
+    stream.write(_pack_uint_32le(value & 0xFFFFFFFF))
 
 
 def write_int_32be(stream, value):
-    v = bytes(
-        bytearray(
-            [
-                (value >> 24) & 0xFF,
-                (value >> 16) & 0xFF,
-                (value >> 8) & 0xFF,
-                (value >> 0) & 0xFF,
-            ]
-        )
-    )
-    stream.write(v)
+    stream.write(_pack_uint_32be(value & 0xFFFFFFFF))
 
 
 def write_float_32le(stream, value):
-    stream.write(struct.pack("<f", float(value)))
+    stream.write(_pack_float_32le(float(value)))
 
 
 def write_string(stream, string, encoding="utf8"):
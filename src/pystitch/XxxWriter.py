@@ -2,7 +2,7 @@ from typing import BinaryIO
 
 from .EmbConstant import *
 from .EmbPattern import EmbPattern
-from .WriteHelper import write_int_8, write_int_16le, write_int_32le
+from .WriteHelper import buffered, patch, placeholder, write_int_8, write_int_16le, write_int_32le
 
 FULL_JUMP = False
 ROUND = True
@@ -126,15 +126,12 @@ def write_xxx_colors(pattern: EmbPattern, f: BinaryIO):
     write_int_8(f, 0x01)
 
 
+@buffered
 def write(pattern: EmbPattern, f: BinaryIO, settings=None):
     write_xxx_header_b(pattern, f)
-    place_holder_for_end_of_stitches = f.tell()
-    write_int_32le(f, 0x00000000)
+    place_holder_for_end_of_stitches = placeholder(f, "<I")
     write_xxx_stitches(pattern, f)
-    end_of_stitches = f.tell()
-    f.seek(place_holder_for_end_of_stitches, 0)
-    write_int_32le(f, end_of_stitches)
-    f.seek(end_of_stitches, 0)
+    patch(f, place_holder_for_end_of_stitches, "<I", f.tell())
     write_int_8(f, 0x7F)
     write_int_8(f, 0x7F)
     write_int_8(f, 0x02)
@@ -1,5 +1,7 @@
 name = "pystitch"
 
+import importlib
+
 # items available at the top level (e.g. pystitch.read)
 from .EmbConstant import *
 from .EmbFunctions import *
@@ -7,111 +9,133 @@ from .EmbMatrix import EmbMatrix
 from .EmbPattern import EmbPattern
 from .EmbThread import EmbThread
 from .EmbCompress import compress, expand
-import pystitch.GenericWriter as GenericWriter
-
-# items available in a sub-heirarchy (e.g. pystitch.PecGraphics.get_graphic_as_string)
-from .PecGraphics import get_graphic_as_string
+from .EmbInstrument import Instrument, PhaseRecord
+from .EmbProgress import CancelToken, ConversionCancelled
+from .EmbFormats import FormatRegistry, resolve as _resolve
 from .pystitch import *
 
-import pystitch.A10oReader as A10oReader
-import pystitch.A100Reader as A100Reader
-# pystitch.ArtReader as ArtReader
-import pystitch.BroReader as BroReader
-import pystitch.ColReader as ColReader
-import pystitch.ColWriter as ColWriter
-import pystitch.CsvReader as CsvReader
-import pystitch.CsvWriter as CsvWriter
-import pystitch.DatReader as DatReader
-import pystitch.DsbReader as DsbReader
-import pystitch.DstReader as DstReader
-import pystitch.DstWriter as DstWriter
-import pystitch.DszReader as DszReader
-import pystitch.EdrReader as EdrReader
-import pystitch.EdrWriter as EdrWriter
-import pystitch.EmdReader as EmdReader
-import pystitch.ExpReader as ExpReader
-import pystitch.ExpWriter as ExpWriter
-import pystitch.ExyReader as ExyReader
-import pystitch.FxyReader as FxyReader
-import pystitch.GcodeReader as GcodeReader
-import pystitch.GcodeWriter as GcodeWriter
-import pystitch.InkstitchGcodeWriter as InkstitchGcodeWriter
-import pystitch.GtReader as GtReader
-import pystitch.HusReader as HusReader
-import pystitch.InbReader as InbReader
-import pystitch.InfReader as InfReader
-import pystitch.InfWriter as InfWriter
-import pystitch.IqpReader as IqpReader
-import pystitch.JefReader as JefReader
-import pystitch.JefWriter as JefWriter
-import pystitch.JpxReader as JpxReader
-import pystitch.JsonReader as JsonReader
-import pystitch.JsonWriter as JsonWriter
-import pystitch.KsmReader as KsmReader
-import pystitch.MaxReader as MaxReader
-import pystitch.MitReader as MitReader
-import pystitch.NewReader as NewReader
-import pystitch.PcdReader as PcdReader
-import pystitch.PcmReader as PcmReader
-import pystitch.PcqReader as PcqReader
-import pystitch.PcsReader as PcsReader
-import pystitch.PecReader as PecReader
-import pystitch.PecWriter as PecWriter
-import pystitch.PesReader as PesReader
-import pystitch.PesWriter as PesWriter
-import pystitch.PhbReader as PhbReader
-import pystitch.PhcReader as PhcReader
-import pystitch.PltReader as PltReader
-import pystitch.PltWriter as PltWriter
-import pystitch.PmvReader as PmvReader
-import pystitch.PmvWriter as PmvWriter
-import pystitch.PngWriter as PngWriter
-import pystitch.QccReader as QccReader
-import pystitch.QccWriter as QccWriter
-import pystitch.SewReader as SewReader
-import pystitch.ShvReader as ShvReader
-import pystitch.SpxReader as SpxReader
-import pystitch.StcReader as StcReader
-import pystitch.StxReader as StxReader
-import pystitch.SvgWriter as SvgWriter
-import pystitch.TapReader as TapReader
-import pystitch.TbfReader as TbfReader
-import pystitch.TbfWriter as TbfWriter
-import pystitch.TxtWriter as TxtWriter
-import pystitch.U01Reader as U01Reader
-import pystitch.U01Writer as U01Writer
-import pystitch.Vp3Reader as Vp3Reader
-import pystitch.Vp3Writer as Vp3Writer
-import pystitch.XxxReader as XxxReader
-import pystitch.XxxWriter as XxxWriter
-import pystitch.ZhsReader as ZhsReader
-import pystitch.ZxyReader as ZxyReader
+# reader/writer modules are imported on first access (e.g. pystitch.DstReader)
+# through __getattr__ below, so `import pystitch` stays cheap.
+_LAZY_MODULES = frozenset(
+    (
+        "GenericWriter",
+        "aio",
+        "A10oReader",
+        "A100Reader",
+        "BroReader",
+        "ColReader",
+        "ColWriter",
+        "CsvReader",
+        "CsvWriter",
+        "DatReader",
+        "DsbReader",
+        "DstReader",
+        "DstWriter",
+        "DszReader",
+        "EdrReader",
+        "EdrWriter",
+        "EmdReader",
+        "ExpReader",
+        "ExpWriter",
+        "ExyReader",
+        "FxyReader",
+        "GcodeReader",
+        "GcodeWriter",
+        "InkstitchGcodeWriter",
+        "GtReader",
+        "HusReader",
+        "InbReader",
+        "InfReader",
+        "InfWriter",
+        "IqpReader",
+        "JefReader",
+        "JefWriter",
+        "JpxReader",
+        "JsonReader",
+        "JsonWriter",
+        "KsmReader",
+        "MaxReader",
+        "MitReader",
+        "NewReader",
+        "PcdReader",
+        "PcmReader",
+        "PcqReader",
+        "PcsReader",
+        "PecReader",
+        "PecWriter",
+        "PesReader",
+        "PesWriter",
+        "PhbReader",
+        "PhcReader",
+        "PltReader",
+        "PltWriter",
+        "PmvReader",
+        "PmvWriter",
+        "PngWriter",
+        "PystReader",
+        "PystWriter",
+        "QccReader",
+        "QccWriter",
+        "SewReader",
+        "ShvReader",
+        "SpxReader",
+        "StcReader",
+        "StxReader",
+        "SvgWriter",
+        "TapReader",
+        "TbfReader",
+        "TbfWriter",
+        "TxtWriter",
+        "U01Reader",
+        "U01Writer",
+        "Vp3Reader",
+        "Vp3Writer",
+        "XxxReader",
+        "XxxWriter",
+        "ZhsReader",
+        "ZxyReader",
+    )
+)
+
+_LAZY_ATTRIBUTES = {
+    "get_graphic_as_string": "PecGraphics",
+    "convert_many": "EmbBatch",
+    "iter_convert_many": "EmbBatch",
+    "ConversionCache": "EmbCache",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        value = importlib.import_module("." + name, __name__)
+    elif name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module("." + _LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | _LAZY_MODULES | set(_LAZY_ATTRIBUTES))
 
 
 def read(filename, settings=None, pattern=None):
     """Reads file, assuming type by extension"""
     extension = EmbPattern.get_extension_by_filename(filename)
-    extension = extension.lower()
-    for file_type in supported_formats():
-        if file_type["extension"] != extension:
-            continue
-        reader = file_type.get("reader", None)
-        return EmbPattern.read_embroidery(reader, filename, settings, pattern)
-    return None
+    reader = format_registry.get_reader(extension)
+    return EmbPattern.read_embroidery(reader, filename, settings, pattern)
 
 
 def write(pattern, filename, settings=None):
     """Writes file, assuming type by extension"""
-    extension = EmbPattern.get_extension_by_filename(filename)
-    extension = extension.lower()
-    supported_extensions = [file_type["extension"] for file_type in supported_formats()]
-
-    if extension not in supported_extensions:
+    extension = EmbPattern.get_extension_by_filename(filename).lower()
+    file_type = format_registry.get(extension)
+    if file_type is None:
         raise IOError("Conversion to file type '{extension}' is not supported".format(extension=extension))
 
-    ext_to_file_type_lookup = {file_type["extension"]: file_type for file_type in supported_formats()}
-    writer = ext_to_file_type_lookup[extension].get("writer")
-
+    writer = format_registry.get_writer(extension)
     if writer:
         EmbPattern.write_embroidery(writer, pattern, filename, settings)
     else:
@@ -132,14 +156,41 @@ def supported_formats():
     Metadata gives a list of metadata read and/or written by that type.
 
     Options provides accepted options by the format and their accepted values.
+
+    Formats added with register_format() are included. Each entry is a fresh
+    dict and iterating imports each format's modules; use format_registry for
+    cached, read-only lookups that import only the format being used.
     """
+    for file_type in format_registry.formats():
+        file_type = dict(file_type)
+        for key in ("reader", "writer"):
+            if key in file_type:
+                file_type[key] = _resolve(file_type[key])
+        yield file_type
+
+
+def register_format(file_type):
+    """Registers a third-party format so read(), write() and convert() use it.
+
+    file_type is a dict with the same keys supported_formats() yields. A format
+    with the same primary extension as an existing one replaces it."""
+    format_registry.register(file_type)
+
+
+def unregister_format(extension):
+    """Removes a format previously added with register_format()."""
+    format_registry.unregister(extension)
+
+
+def _builtin_formats():
+    """Generates the dictionary entries for the formats shipped with pystitch."""
     # yield ({
     #     "description": "Art Embroidery Format",
     #     "extension": "art",
     #     "extensions": ("art",),
     #     "mimetype": "application/x-art",
     #     "category": "embroidery",
-    #     "reader": ArtReader,
+    #     "reader": "pystitch.ArtReader",
     #     "metadata": ("name")
     # })
     yield (
@@ -149,8 +200,8 @@ def supported_formats():
             "extensions": ("pec",),
             "mimetype": "application/x-pec",
             "category": "embroidery",
-            "reader": PecReader,
-            "writer": PecWriter,
+            "reader": "pystitch.PecReader",
+            "writer": "pystitch.PecWriter",
             "metadata": ("name"),
         }
     )
@@ -161,8 +212,8 @@ def supported_formats():
             "extensions": ("pes",),
             "mimetype": "application/x-pes",
             "category": "embroidery",
-            "reader": PesReader,
-            "writer": PesWriter,
+            "reader": "pystitch.PesReader",
+            "writer": "pystitch.PesWriter",
             "versions": ("1", "6", "1t", "6t"),
             "metadata": ("name", "author", "category", "keywords", "comments"),
         }
@@ -174,8 +225,8 @@ def supported_formats():
             "extensions": ("exp",),
             "mimetype": "application/x-exp",
             "category": "embroidery",
-            "reader": ExpReader,
-            "writer": ExpWriter,
+            "reader": "pystitch.ExpReader",
+            "writer": "pystitch.ExpWriter",
         }
     )
     # yield (
@@ -185,7 +236,7 @@ def supported_formats():
     #         "extensions": ("cnd",),
     #         "mimetype": "application/x-cnd",
     #         "category": "embroidery",
-    #         "reader": CndReader,
+    #         "reader": "pystitch.CndReader",
     #     }
     # )
     yield (
@@ -195,8 +246,8 @@ def supported_formats():
             "extensions": ("dst",),
             "mimetype": "application/x-dst",
             "category": "embroidery",
-            "reader": DstReader,
-            "writer": DstWriter,
+            "reader": "pystitch.DstReader",
+            "writer": "pystitch.DstWriter",
             "read_options": {
                 "trim_distance": (None, 3.0, 50.0),
                 "trim_at": (2, 3, 4, 5, 6, 7, 8),
@@ -214,8 +265,8 @@ def supported_formats():
             "extensions": ("jef",),
             "mimetype": "application/x-jef",
             "category": "embroidery",
-            "reader": JefReader,
-            "writer": JefWriter,
+            "reader": "pystitch.JefReader",
+            "writer": "pystitch.JefWriter",
             "read_options": {
                 "trim_distance": (None, 3.0, 50.0),
                 "trims": (True, False),
@@ -235,8 +286,8 @@ def supported_formats():
             "extensions": ("vp3",),
             "mimetype": "application/x-vp3",
             "category": "embroidery",
-            "reader": Vp3Reader,
-            "writer": Vp3Writer,
+            "reader": "pystitch.Vp3Reader",
+            "writer": "pystitch.Vp3Writer",
         }
     )
     yield (
@@ -246,7 +297,7 @@ def supported_formats():
             "extensions": ("svg", "svgz"),
             "mimetype": "image/svg+xml",
             "category": "vector",
-            "writer": SvgWriter,
+            "writer": "pystitch.SvgWriter",
         }
     )
     yield (
@@ -256,8 +307,8 @@ def supported_formats():
             "extensions": ("csv",),
             "mimetype": "text/csv",
             "category": "debug",
-            "reader": CsvReader,
-            "writer": CsvWriter,
+            "reader": "pystitch.CsvReader",
+            "writer": "pystitch.CsvWriter",
             "versions": ("default", "delta", "full"),
         }
     )
@@ -268,8 +319,8 @@ def supported_formats():
             "extensions": ("xxx",),
             "mimetype": "application/x-xxx",
             "category": "embroidery",
-            "reader": XxxReader,
-            "writer": XxxWriter,
+            "reader": "pystitch.XxxReader",
+            "writer": "pystitch.XxxWriter",
         }
     )
     yield (
@@ -279,7 +330,7 @@ def supported_formats():
             "extensions": ("sew",),
             "mimetype": "application/x-sew",
             "category": "embroidery",
-            "reader": SewReader,
+            "reader": "pystitch.SewReader",
         }
     )
     yield (
@@ -289,8 +340,8 @@ def supported_formats():
             "extensions": ("u00", "u01", "u02"),
             "mimetype": "application/x-u01",
             "category": "embroidery",
-            "reader": U01Reader,
-            "writer": U01Writer,
+            "reader": "pystitch.U01Reader",
+            "writer": "pystitch.U01Writer",
         }
     )
     yield (
@@ -300,7 +351,7 @@ def supported_formats():
             "extensions": ("shv",),
             "mimetype": "application/x-shv",
             "category": "embroidery",
-            "reader": ShvReader,
+            "reader": "pystitch.ShvReader",
         }
     )
     yield (
@@ -310,7 +361,7 @@ def supported_formats():
             "extensions": ("10o",),
             "mimetype": "application/x-10o",
             "category": "embroidery",
-            "reader": A10oReader,
+            "reader": "pystitch.A10oReader",
         }
     )
     yield (
@@ -320,7 +371,7 @@ def supported_formats():
             "extensions": ("100",),
             "mimetype": "application/x-100",
             "category": "embroidery",
-            "reader": A100Reader,
+            "reader": "pystitch.A100Reader",
         }
     )
     yield (
@@ -330,7 +381,7 @@ def supported_formats():
             "extensions": ("bro",),
             "mimetype": "application/x-Bro",
             "category": "embroidery",
-            "reader": BroReader,
+            "reader": "pystitch.BroReader",
         }
     )
     yield (
@@ -340,7 +391,7 @@ def supported_formats():
             "extensions": ("dat",),
             "mimetype": "application/x-dat",
             "category": "embroidery",
-            "reader": DatReader,
+            "reader": "pystitch.DatReader",
         }
     )
     yield (
@@ -350,7 +401,7 @@ def supported_formats():
             "extensions": ("dsb",),
             "mimetype": "application/x-dsb",
             "category": "embroidery",
-            "reader": DsbReader,
+            "reader": "pystitch.DsbReader",
         }
     )
     yield (
@@ -360,7 +411,7 @@ def supported_formats():
             "extensions": ("dsz",),
             "mimetype": "application/x-dsz",
             "category": "embroidery",
-            "reader": DszReader,
+            "reader": "pystitch.DszReader",
         }
     )
     yield (
@@ -370,7 +421,7 @@ def supported_formats():
             "extensions": ("emd",),
             "mimetype": "application/x-emd",
             "category": "embroidery",
-            "reader": EmdReader,
+            "reader": "pystitch.EmdReader",
         }
     )
     yield (
@@ -380,7 +431,7 @@ def supported_formats():
             "extensions": ("e00", "e01", "e02"),
             "mimetype": "application/x-exy",
             "category": "embroidery",
-            "reader": ExyReader,
+            "reader": "pystitch.ExyReader",
         }
     )
     yield (
@@ -390,7 +441,7 @@ def supported_formats():
             "extensions": ("f00", "f01", "f02"),
             "mimetype": "application/x-fxy",
             "category": "embroidery",
-            "reader": FxyReader,
+            "reader": "pystitch.FxyReader",
         }
     )
     yield (
@@ -400,7 +451,7 @@ def supported_formats():
             "extensions": ("gt",),
             "mimetype": "application/x-exy",
             "category": "embroidery",
-            "reader": GtReader,
+            "reader": "pystitch.GtReader",
         }
     )
     yield (
@@ -410,7 +461,7 @@ def supported_formats():
             "extensions": ("inb",),
             "mimetype": "application/x-inb",
             "category": "embroidery",
-            "reader": InbReader,
+            "reader": "pystitch.InbReader",
         }
     )
     yield (
@@ -420,8 +471,8 @@ def supported_formats():
             "extensions": ("tbf",),
             "mimetype": "application/x-tbf",
             "category": "embroidery",
-            "reader": TbfReader,
-            "writer": TbfWriter,
+            "reader": "pystitch.TbfReader",
+            "writer": "pystitch.TbfWriter",
         }
     )
     yield (
@@ -431,7 +482,7 @@ def supported_formats():
             "extensions": ("ksm",),
             "mimetype": "application/x-ksm",
             "category": "embroidery",
-            "reader": KsmReader,
+            "reader": "pystitch.KsmReader",
         }
     )
     yield (
@@ -441,17 +492,17 @@ def supported_formats():
             "extensions": ("tap",),
             "mimetype": "application/x-tap",
             "category": "embroidery",
-            "reader": TapReader,
+            "reader": "pystitch.TapReader",
         }
     )
     yield (
         {
             "description": "Pfaff Embroidery Format",
             "extension": "spx",
-            "extensions": ("spx"),
+            "extensions": ("spx",),
             "mimetype": "application/x-spx",
             "category": "embroidery",
-            "reader": SpxReader,
+            "reader": "pystitch.SpxReader",
         }
     )
     yield (
@@ -461,7 +512,7 @@ def supported_formats():
             "extensions": ("stx",),
             "mimetype": "application/x-stx",
             "category": "embroidery",
-            "reader": StxReader,
+            "reader": "pystitch.StxReader",
         }
     )
     yield (
@@ -471,7 +522,7 @@ def supported_formats():
             "extensions": ("phb",),
             "mimetype": "application/x-phb",
             "category": "embroidery",
-            "reader": PhbReader,
+            "reader": "pystitch.PhbReader",
         }
     )
     yield (
@@ -481,7 +532,7 @@ def supported_formats():
             "extensions": ("phc",),
             "mimetype": "application/x-phc",
             "category": "embroidery",
-            "reader": PhcReader,
+            "reader": "pystitch.PhcReader",
         }
     )
     yield (
@@ -491,7 +542,7 @@ def supported_formats():
             "extensions": ("new",),
             "mimetype": "application/x-new",
             "category": "embroidery",
-            "reader": NewReader,
+            "reader": "pystitch.NewReader",
         }
     )
     yield (
@@ -501,7 +552,7 @@ def supported_formats():
             "extensions": ("max",),
             "mimetype": "application/x-max",
             "category": "embroidery",
-            "reader": MaxReader,
+            "reader": "pystitch.MaxReader",
         }
     )
     yield (
@@ -511,7 +562,7 @@ def supported_formats():
             "extensions": ("mit",),
             "mimetype": "application/x-mit",
             "category": "embroidery",
-            "reader": MitReader,
+            "reader": "pystitch.MitReader",
         }
     )
     yield (
@@ -521,7 +572,7 @@ def supported_formats():
             "extensions": ("pcd",),
             "mimetype": "application/x-pcd",
             "category": "embroidery",
-            "reader": PcdReader,
+            "reader": "pystitch.PcdReader",
         }
     )
     yield (
@@ -531,7 +582,7 @@ def supported_formats():
             "extensions": ("pcq",),
             "mimetype": "application/x-pcq",
             "category": "embroidery",
-            "reader": PcqReader,
+            "reader": "pystitch.PcqReader",
         }
     )
     yield (
@@ -541,7 +592,7 @@ def supported_formats():
             "extensions": ("pcm",),
             "mimetype": "application/x-pcm",
             "category": "embroidery",
-            "reader": PcmReader,
+            "reader": "pystitch.PcmReader",
         }
     )
     yield (
@@ -551,7 +602,7 @@ def supported_formats():
             "extensions": ("pcs",),
             "mimetype": "application/x-pcs",
             "category": "embroidery",
-            "reader": PcsReader,
+            "reader": "pystitch.PcsReader",
         }
     )
     yield (
@@ -561,7 +612,7 @@ def supported_formats():
             "extensions": ("jpx",),
             "mimetype": "application/x-jpx",
             "category": "embroidery",
-            "reader": JpxReader,
+            "reader": "pystitch.JpxReader",
         }
     )
     yield (
@@ -571,7 +622,7 @@ def supported_formats():
             "extensions": ("stc",),
             "mimetype": "application/x-stc",
             "category": "embroidery",
-            "reader": StcReader,
+            "reader": "pystitch.StcReader",
         }
     )
     yield ({
@@ -580,7 +631,7 @@ def supported_formats():
         "extensions": ("zhs",),
         "mimetype": "application/x-zhs",
         "category": "embroidery",
-        "reader": ZhsReader
+        "reader": "pystitch.ZhsReader",
     })
     yield (
         {
@@ -589,7 +640,7 @@ def supported_formats():
             "extensions": ("z00", "z01", "z02"),
             "mimetype": "application/x-zxy",
             "category": "embroidery",
-            "reader": ZxyReader,
+            "reader": "pystitch.ZxyReader",
         }
     )
     yield (
@@ -599,8 +650,8 @@ def supported_formats():
             "extensions": ("pmv",),
             "mimetype": "application/x-pmv",
             "category": "stitch",
-            "reader": PmvReader,
-            "writer": PmvWriter,
+            "reader": "pystitch.PmvReader",
+            "writer": "pystitch.PmvWriter",
         }
     )
     yield (
@@ -610,7 +661,7 @@ def supported_formats():
             "extensions": ("png",),
             "mimetype": "image/png",
             "category": "image",
-            "writer": PngWriter,
+            "writer": "pystitch.PngWriter",
             "write_options": {
                 "background": (0x000000, 0xFFFFFF),
                 "linewidth": (1, 2, 3, 4, 5, 6, 7, 8, 9, 10),
@@ -624,7 +675,7 @@ def supported_formats():
             "extensions": ("txt",),
             "mimetype": "text/plain",
             "category": "debug",
-            "writer": TxtWriter,
+            "writer": "pystitch.TxtWriter",
             "versions": ("default", "embroidermodder"),
         }
     )
@@ -632,11 +683,11 @@ def supported_formats():
         {
             "description": "gcode Format, Text File",
             "extension": "gcode",
-            "extensions": ("gcode", "g-code", "ngc", "nc", ".g"),
+            "extensions": ("gcode", "g-code", "ngc", "nc", "g"),
             "mimetype": "text/plain",
             "category": "embroidery",
-            "reader": GcodeReader,
-            "writer": InkstitchGcodeWriter,
+            "reader": "pystitch.GcodeReader",
+            "writer": "pystitch.InkstitchGcodeWriter",
             "write_options": {
                 "flip_x": (True, False),
                 "flip_y": (True, False),
@@ -652,7 +703,7 @@ def supported_formats():
             "extensions": ("hus",),
             "mimetype": "application/x-hus",
             "category": "embroidery",
-            "reader": HusReader,
+            "reader": "pystitch.HusReader",
         }
     )
     yield(
@@ -662,7 +713,7 @@ def supported_formats():
             "extensions": ("iqp",),
             "mimetype": "application/x-iqp",
             "category": "quilting",
-            "reader": IqpReader,
+            "reader": "pystitch.IqpReader",
         }
     )
     yield(
@@ -672,8 +723,8 @@ def supported_formats():
             "extensions": ("plt",),
             "mimetype": "text/plain",
             "category": "quilting",
-            "reader": PltReader,
-            "writer": PltWriter,
+            "reader": "pystitch.PltReader",
+            "writer": "pystitch.PltWriter",
         }
     )
     yield(
@@ -683,8 +734,8 @@ def supported_formats():
             "extensions": ("qcc",),
             "mimetype": "text/plain",
             "category": "quilting",
-            "reader": QccReader,
-            "writer": QccWriter,
+            "reader": "pystitch.QccReader",
+            "writer": "pystitch.QccWriter",
         }
     )
     yield (
@@ -694,8 +745,8 @@ def supported_formats():
             "extensions": ("edr",),
             "mimetype": "application/x-edr",
             "category": "color",
-            "reader": EdrReader,
-            "writer": EdrWriter,
+            "reader": "pystitch.EdrReader",
+            "writer": "pystitch.EdrWriter",
         }
     )
     yield (
@@ -705,8 +756,8 @@ def supported_formats():
             "extensions": ("col",),
             "mimetype": "application/x-col",
             "category": "color",
-            "reader": ColReader,
-            "writer": ColWriter,
+            "reader": "pystitch.ColReader",
+            "writer": "pystitch.ColWriter",
         }
     )
     yield (
@@ -716,8 +767,8 @@ def supported_formats():
             "extensions": ("inf",),
             "mimetype": "application/x-inf",
             "category": "color",
-            "reader": InfReader,
-            "writer": InfWriter,
+            "reader": "pystitch.InfReader",
+            "writer": "pystitch.InfWriter",
         }
     )
     yield (
@@ -727,138 +778,195 @@ def supported_formats():
             "extensions": ("json",),
             "mimetype": "application/json",
             "category": "debug",
-            "reader": JsonReader,
-            "writer": JsonWriter,
+            "reader": "pystitch.JsonReader",
+            "writer": "pystitch.JsonWriter",
         }
     )
+    yield (
+        {
+            "description": "pystitch Native Binary",
+            "extension": "pyst",
+            "extensions": ("pyst",),
+            "mimetype": "application/x-pystitch",
+            "category": "debug",
+            "reader": "pystitch.PystReader",
+            "writer": "pystitch.PystWriter",
+        }
+    )
+
+
+format_registry = FormatRegistry(_builtin_formats)
+
 
 def read_dst(f, settings=None, pattern=None):
     """Reads fileobject as DST file"""
+    from . import DstReader
     return EmbPattern.read_embroidery(DstReader, f, settings, pattern)
 
 def read_pec(f, settings=None, pattern=None):
     """Reads fileobject as PEC file"""
+    from . import PecReader
     return EmbPattern.read_embroidery(PecReader, f, settings, pattern)
 
 def read_pes(f, settings=None, pattern=None):
     """Reads fileobject as PES file"""
+    from . import PesReader
     return EmbPattern.read_embroidery(PesReader, f, settings, pattern)
 
 def read_exp(f, settings=None, pattern=None):
     """Reads fileobject as EXP file"""
+    from . import ExpReader
     return EmbPattern.read_embroidery(ExpReader, f, settings, pattern)
 
 def read_vp3(f, settings=None, pattern=None):
     """Reads fileobject as VP3 file"""
+    from . import Vp3Reader
     return EmbPattern.read_embroidery(Vp3Reader, f, settings, pattern)
 
 def read_jef(f, settings=None, pattern=None):
     """Reads fileobject as JEF file"""
+    from . import JefReader
     return EmbPattern.read_embroidery(JefReader, f, settings, pattern)
 
 def read_u01(f, settings=None, pattern=None):
     """Reads fileobject as U01 file"""
+    from . import U01Reader
     return EmbPattern.read_embroidery(U01Reader, f, settings, pattern)
 
 def read_csv(f, settings=None, pattern=None):
     """Reads fileobject as CSV file"""
+    from . import CsvReader
     return EmbPattern.read_embroidery(CsvReader, f, settings, pattern)
 
 def read_json(f, settings=None, pattern=None):
     """Reads fileobject as JSON file"""
+    from . import JsonReader
     return EmbPattern.read_embroidery(JsonReader, f, settings, pattern)
 
+def read_pyst(f, settings=None, pattern=None):
+    """Reads fileobject as pystitch native binary file"""
+    from . import PystReader
+    return EmbPattern.read_embroidery(PystReader, f, settings, pattern)
+
 def read_gcode(f, settings=None, pattern=None):
     """Reads fileobject as GCode file"""
+    from . import GcodeReader
     return EmbPattern.read_embroidery(GcodeReader, f, settings, pattern)
 
 def read_xxx(f, settings=None, pattern=None):
     """Reads fileobject as XXX file"""
+    from . import XxxReader
     return EmbPattern.read_embroidery(XxxReader, f, settings, pattern)
 
 def read_tbf(f, settings=None, pattern=None):
     """Reads fileobject as TBF file"""
+    from . import TbfReader
     return EmbPattern.read_embroidery(TbfReader, f, settings, pattern)
 
 def read_iqp(f, settings=None, pattern=None):
     """Reads fileobject as IQP file"""
+    from . import IqpReader
     pattern = EmbPattern.read_embroidery(IqpReader, f, settings, pattern)
     return pattern
 
 def read_plt(f, settings=None, pattern=None):
     """Reads fileobject as PLT file"""
+    from . import PltReader
     pattern = EmbPattern.read_embroidery(PltReader, f, settings, pattern)
     return pattern
 
 def read_qcc(f, settings=None, pattern=None):
     """Reads fileobject as QCC file"""
+    from . import QccReader
     pattern = EmbPattern.read_embroidery(QccReader, f, settings, pattern)
     return pattern
 
 def write_dst(pattern, stream, settings=None):
     """Writes fileobject as DST file"""
+    from . import DstWriter
     EmbPattern.write_embroidery(DstWriter, pattern, stream, settings)
 
 def write_pec(pattern, stream, settings=None):
     """Writes fileobject as PEC file"""
+    from . import PecWriter
     EmbPattern.write_embroidery(PecWriter, pattern, stream, settings)
 
 def write_pes(pattern, stream, settings=None):
     """Writes fileobject as PES file"""
+    from . import PesWriter
     EmbPattern.write_embroidery(PesWriter, pattern, stream, settings)
 
 def write_exp(pattern, stream, settings=None):
     """Writes fileobject as EXP file"""
+    from . import ExpWriter
     EmbPattern.write_embroidery(ExpWriter, pattern, stream, settings)
 
 def write_vp3(pattern, stream, settings=None):
     """Writes fileobject as Vp3 file"""
+    from . import Vp3Writer
     EmbPattern.write_embroidery(Vp3Writer, pattern, stream, settings)
 
 def write_jef(pattern, stream, settings=None):
     """Writes fileobject as JEF file"""
+    from . import JefWriter
     EmbPattern.write_embroidery(JefWriter, pattern, stream, settings)
 
 def write_u01(pattern, stream, settings=None):
     """Writes fileobject as U01 file"""
+    from . import U01Writer
     EmbPattern.write_embroidery(U01Writer, pattern, stream, settings)
 
 def write_csv(pattern, stream, settings=None):
     """Writes fileobject as CSV file"""
+    from . import CsvWriter
     EmbPattern.write_embroidery(CsvWriter, pattern, stream, settings)
 
 def write_json(pattern, stream, settings=None):
     """Writes fileobject as JSON file"""
+    from . import JsonWriter
     EmbPattern.write_embroidery(JsonWriter, pattern, stream, settings)
 
+def write_pyst(pattern, stream, settings=None):
+    """Writes fileobject as pystitch native binary file"""
+    from . import PystWriter
+    EmbPattern.write_embroidery(PystWriter, pattern, stream, settings)
+
 def write_txt(pattern, stream, settings=None):
     """Writes fileobject as CSV file"""
+    from . import TxtWriter
     EmbPattern.write_embroidery(TxtWriter, pattern, stream, settings)
 
 def write_gcode(pattern, stream, settings=None):
     """Writes fileobject as Gcode file"""
+    from . import GcodeWriter
     EmbPattern.write_embroidery(GcodeWriter, pattern, stream, settings)
 
 def write_xxx(pattern, stream, settings=None):
     """Writes fileobject as XXX file"""
+    from . import XxxWriter
     EmbPattern.write_embroidery(XxxWriter, pattern, stream, settings)
 
 def write_tbf(pattern, stream, settings=None):
     """Writes fileobject as TBF file"""
+    from . import TbfWriter
     EmbPattern.write_embroidery(TbfWriter, pattern, stream, settings)
 
 def write_plt(pattern, stream, settings=None):
     """Writes fileobject as PLT file"""
+    from . import PltWriter
     EmbPattern.write_embroidery(PltWriter, pattern, stream, settings)
 
 def write_qcc(pattern, stream, settings=None):
     """Writes fileobject as QCC file"""
+    from . import QccWriter
     EmbPattern.write_embroidery(QccWriter, pattern, stream, settings)
 
 def write_svg(pattern, stream, settings=None):
     """Writes fileobject as DST file"""
+    from . import SvgWriter
     EmbPattern.write_embroidery(SvgWriter, pattern, stream, settings)
 
 def write_png(pattern, stream, settings=None):
     """Writes fileobject as PNG file"""
+    from . import PngWriter
     EmbPattern.write_embroidery(PngWriter, pattern, stream, settings)
@@ -0,0 +1,293 @@
+"""Command line interface: pystitch convert|info|thumb, or python -m pystitch."""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import pystitch
+from pystitch import EmbPattern, format_registry
+
+
+def parse_setting(text):
+    """Parses a -o key=value option. Values are read as JSON where they parse."""
+    key, sep, value = text.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError("expected key=value, got %r" % text)
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass
+    return key, value
+
+
+def find_sources(inputs, recursive=False):
+    """Yields (path, base) for each input file, glob match or readable file in a directory.
+
+    base is the directory that relative output paths are taken from."""
+    for item in inputs:
+        if os.path.isdir(item):
+            if recursive:
+                walk = os.walk(item)
+            else:
+                walk = [(item, [], os.listdir(item))]
+            for directory, subdirectories, files in walk:
+                subdirectories.sort()
+                for name in sorted(files):
+                    if format_registry.can_read(EmbPattern.get_extension_by_filename(name)):
+                        yield os.path.join(directory, name), item
+        elif glob.has_magic(item):
+            for path in sorted(glob.glob(item, recursive=True)):
+                if os.path.isfile(path):
+                    yield path, None
+        else:
+            yield item, None
+
+
+def destination_for(source, base, extension, output_dir=None):
+    stem = os.path.splitext(source)[0]
+    if output_dir is None:
+        return stem + "." + extension
+    if base is None:
+        relative = os.path.basename(stem)
+    else:
+        relative = os.path.relpath(stem, base)
+    return os.path.join(output_dir, relative + "." + extension)
+
+
+def overwrites_source(job):
+    """Returns whether the job's destination is its source file."""
+    source, destination = job[0], job[1]
+    if os.path.exists(destination) and os.path.exists(source):
+        return os.path.samefile(source, destination)
+    return os.path.abspath(source) == os.path.abspath(destination)
+
+
+def run_jobs(jobs, args):
+    """Converts the jobs, reporting progress, and returns the exit status.
+
+    Jobs that would overwrite their source are skipped and make the status
+    non-zero, as a failure would."""
+    skipped = []
+    kept = []
+    for job in jobs:
+        if overwrites_source(job):
+            print("pystitch: skipping %s: output would overwrite it" % job[0], file=sys.stderr)
+            skipped.append(job[0])
+        else:
+            kept.append(job)
+    jobs = kept
+    for job in jobs:
+        directory = os.path.dirname(job[1])
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    start = time.perf_counter()
+    results = []
+    count = len(jobs)
+    for result in pystitch.iter_convert_many(jobs, workers=args.jobs or None, ordered=False):
+        results.append(result)
+        if not args.quiet:
+            if result.ok:
+                status = "%.3fs" % result.elapsed
+            else:
+                status = "FAILED: %s" % result.error
+            print(
+                "[%d/%d] %s -> %s %s" % (len(results), count, result.source, result.destination, status),
+                file=sys.stderr,
+            )
+    results.sort(key=lambda result: result.index)
+    failed = [result for result in results if not result.ok]
+    if args.json:
+        summary = {
+            "total": count,
+            "succeeded": count - len(failed),
+            "failed": len(failed),
+            "skipped": skipped,
+            "elapsed": time.perf_counter() - start,
+            "jobs": [
+                {
+                    "source": result.source,
+                    "destination": result.destination,
+                    "ok": result.ok,
+                    "error": None if result.ok else str(result.error),
+                    "elapsed": result.elapsed,
+                }
+                for result in results
+            ],
+        }
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    return 1 if failed or skipped else 0
+
+
+def command_convert(args):
+    extension = args.format.lower().lstrip(".")
+    if not format_registry.can_write(extension):
+        writable = sorted(
+            entry["extension"] for entry in format_registry.formats() if "writer" in entry
+        )
+        print(
+            "pystitch: cannot write format %r, choose from: %s" % (extension, ", ".join(writable)),
+            file=sys.stderr,
+        )
+        return 2
+    settings = dict(args.option) or None
+    jobs = [
+        (source, destination_for(source, base, extension, args.output_dir), settings)
+        for source, base in find_sources(args.inputs, args.recursive)
+    ]
+    return run_jobs(jobs, args)
+
+
+def command_thumb(args):
+    settings = dict(args.option)
+    settings["max_size"] = args.size
+    if args.supersample > 1:
+        settings["supersample"] = args.supersample
+    jobs = [
+        (source, destination_for(source, base, "png", args.output_dir), settings)
+        for source, base in find_sources(args.inputs, args.recursive)
+    ]
+    return run_jobs(jobs, args)
+
+
+def describe(path):
+    """Returns a json-ready summary of the design in path."""
+    extension = EmbPattern.get_extension_by_filename(path).lower()
+    entry = format_registry.get(extension)
+    pattern = pystitch.read(path)
+    if pattern is None:
+        raise IOError("Reading file type '%s' is not supported" % extension)
+    left, top, right, bottom = pattern.bounds()
+    return {
+        "file": path,
+        "format": extension,
+        "description": entry["description"],
+        "stitches": pattern.count_stitches(),
+        "threads": [
+            {
+                "color": thread.hex_color(),
+                "description": thread.description,
+                "catalog_number": thread.catalog_number,
+                "brand": thread.brand,
+            }
+            for thread in pattern.threadlist
+            if thread is not None
+        ],
+        "color_changes": pattern.count_color_changes(),
+        "bounds": [left, top, right, bottom],
+        "size_mm": [(right - left) / 10.0, (bottom - top) / 10.0],
+        "metadata": {
+            str(key): value
+            for key, value in pattern.extras.items()
+            if isinstance(value, (str, int, float))
+        },
+    }
+
+
+def command_info(args):
+    infos = []
+    status = 0
+    for source, base in find_sources(args.inputs, args.recursive):
+        try:
+            info = describe(source)
+        except Exception as e:
+            info = {"file": source, "error": str(e)}
+            status = 1
+        infos.append(info)
+        if args.json:
+            continue
+        if "error" in info:
+            print("%s: FAILED: %s" % (source, info["error"]))
+            continue
+        print(source)
+        print("  format: %s (%s)" % (info["format"], info["description"]))
+        print("  stitches: %d" % info["stitches"])
+        print("  color changes: %d" % info["color_changes"])
+        print("  size: %.1f x %.1f mm" % tuple(info["size_mm"]))
+        for thread in info["threads"]:
+            details = " ".join(
+                str(thread[key])
+                for key in ("description", "catalog_number", "brand")
+                if thread[key] is not None
+            )
+            print("  thread: %s %s" % (thread["color"], details))
+        for key, value in info["metadata"].items():
+            print("  %s: %s" % (key, value))
+    if args.json:
+        json.dump(infos, sys.stdout, indent=2)
+        print()
+    return status
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="pystitch", description="Convert, inspect and preview embroidery files."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_inputs(command):
+        command.add_argument("inputs", nargs="+", help="files, glob patterns or directories")
+        command.add_argument(
+            "-r", "--recursive", action="store_true", help="search directories recursively"
+        )
+        command.add_argument(
+            "--json", action="store_true", help="print a JSON summary to stdout"
+        )
+
+    def add_jobs(command):
+        command.add_argument(
+            "-d", "--output-dir", help="write outputs here, keeping relative directories"
+        )
+        command.add_argument(
+            "-o",
+            "--option",
+            action="append",
+            type=parse_setting,
+            default=[],
+            metavar="KEY=VALUE",
+            help="reader/writer setting; values are parsed as JSON where possible",
+        )
+        command.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            help="worker processes, 0 for one per CPU (default 1)",
+        )
+        command.add_argument(
+            "-q", "--quiet", action="store_true", help="do not report progress on stderr"
+        )
+
+    convert = commands.add_parser("convert", help="convert designs to another format")
+    add_inputs(convert)
+    convert.add_argument("-f", "--format", required=True, help="output format extension")
+    add_jobs(convert)
+    convert.set_defaults(func=command_convert)
+
+    info = commands.add_parser("info", help="print a summary of each design")
+    add_inputs(info)
+    info.set_defaults(func=command_info)
+
+    thumb = commands.add_parser("thumb", help="render PNG thumbnails")
+    add_inputs(thumb)
+    thumb.add_argument(
+        "-s", "--size", type=int, default=256, help="longest side in pixels (default 256)"
+    )
+    thumb.add_argument(
+        "--supersample", type=int, default=1, help="antialias by drawing 2 or 4 times larger"
+    )
+    add_jobs(thumb)
+    thumb.set_defaults(func=command_thumb)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Asyncio versions of read(), write() and convert().
+
+Decoding, encoding and file I/O run on an executor, the event loop's default
+one unless configure() sets another, so they never block the loop. At most
+max_concurrency of them run at once per event loop; further calls wait their
+turn. A ProcessPoolExecutor may be used as long as the settings passed can be
+pickled.
+
+Sources and destinations may be filenames, or bytes and async streams when the
+format is given::
+
+    pattern = await pystitch.aio.read(await request.read(), format="pes")
+    await pystitch.aio.write(pattern, response, format="dst")
+"""
+
+import asyncio
+import functools
+import inspect
+import io
+import os
+import weakref
+
+from .EmbPattern import EmbPattern
+
+# Encoded output is written to async streams this many bytes at a time.
+STREAM_CHUNK = 0x10000
+
+DEFAULT_MAX_CONCURRENCY = os.cpu_count() or 1
+
+_executor = None
+_max_concurrency = DEFAULT_MAX_CONCURRENCY
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def configure(executor=None, max_concurrency=None):
+    """Sets the executor work runs on (None for the event loop's default) and
+    how many reads, writes and conversions may run on it at once (None for
+    one per CPU)."""
+    global _executor, _max_concurrency
+    if max_concurrency is None:
+        max_concurrency = DEFAULT_MAX_CONCURRENCY
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    _executor = executor
+    _max_concurrency = max_concurrency
+    _semaphores.clear()
+
+
+def _semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(_max_concurrency)
+    return semaphore
+
+
+async def _run(function, *args):
+    async with _semaphore():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, functools.partial(function, *args))
+
+
+def _extension(name, format):
+    if format is not None:
+        return format.lower().lstrip(".")
+    if isinstance(name, str):
+        return EmbPattern.get_extension_by_filename(name).lower()
+    raise ValueError("format must be given when reading or writing streams and bytes")
+
+
+def _decode(data, extension, settings, pattern):
+    from . import format_registry
+
+    reader = format_registry.get_reader(extension)
+    return EmbPattern.read_embroidery(reader, data, settings, pattern)
+
+
+def _encode(pattern, extension, settings):
+    """Returns the bytes write() would store for pattern in the format extension."""
+    from . import format_registry
+
+    if format_registry.get(extension) is None:
+        raise IOError(
+            "Conversion to file type '{extension}' is not supported".format(extension=extension)
+        )
+    writer = format_registry.get_writer(extension)
+    if not writer:
+        raise IOError("No supported writer found.")
+    if getattr(writer, "WRITE_FILE_IN_TEXT_MODE", False):
+        stream = io.StringIO()
+        EmbPattern.write_embroidery(writer, pattern, stream, settings)
+        return stream.getvalue().encode("utf8")
+    stream = io.BytesIO()
+    EmbPattern.write_embroidery(writer, pattern, stream, settings)
+    return stream.getvalue()
+
+
+def _read_file(filename, settings, pattern):
+    from . import read
+
+    return read(filename, settings, pattern)
+
+
+def _write_file(pattern, filename, settings):
+    from . import write
+
+    write(pattern, filename, settings)
+
+
+def _read_bytes(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def _write_bytes(filename, data):
+    with open(filename, "wb") as f:
+        f.write(data)
+
+
+def _convert_file(filename_from, filename_to, settings):
+    from . import convert
+
+    convert(filename_from, filename_to, settings)
+
+
+async def _read_stream(stream):
+    data = stream.read()
+    if inspect.isawaitable(data):
+        data = await data
+    return data
+
+
+async def _write_stream(stream, data):
+    """Writes data to stream a chunk at a time, waiting on drain() where the
+    stream has one so a slow reader holds the writer back."""
+    drain = getattr(stream, "drain", None)
+    view = memoryview(data)
+    for start in range(0, len(view), STREAM_CHUNK):
+        written = stream.write(bytes(view[start : start + STREAM_CHUNK]))
+        if inspect.isawaitable(written):
+            await written
+        if drain is not None:
+            await drain()
+
+
+async def read(source, settings=None, pattern=None, format=None):
+    """Reads a filename, bytes-like object or async stream (anything with an
+    awaitable read()). format is the extension; it is needed unless source
+    is a filename."""
+    extension = _extension(source, format)
+    if isinstance(source, str) and format is None:
+        return await _run(_read_file, source, settings, pattern)
+    if isinstance(source, str):
+        data = await _run(_read_bytes, source)
+    elif hasattr(source, "read"):
+        data = await _read_stream(source)
+    else:
+        data = source
+    return await _run(_decode, data, extension, settings, pattern)
+
+
+async def encode(pattern, format, settings=None):
+    """Returns pattern written in format as bytes."""
+    return await _run(_encode, pattern, _extension(None, format), settings)
+
+
+async def write(pattern, destination, settings=None, format=None):
+    """Writes pattern to a filename, or to an async byte stream. Streams need a
+    write() method, which may be a coroutine, and optionally drain(), as with
+    asyncio.StreamWriter; format is needed for streams."""
+    if isinstance(destination, str) and format is None:
+        await _run(_write_file, pattern, destination, settings)
+        return
+    data = await encode(pattern, _extension(destination, format), settings)
+    if isinstance(destination, str):
+        await _run(_write_bytes, destination, data)
+    else:
+        await _write_stream(destination, data)
+
+
+async def convert(source, destination, settings=None, source_format=None, format=None):
+    """Reads source and writes it to destination, as read() and write() do."""
+    if isinstance(source, str) and isinstance(destination, str):
+        if source_format is None and format is None:
+            await _run(_convert_file, source, destination, settings)
+            return
+    pattern = await read(source, settings, format=source_format)
+    if pattern is None:
+        return
+    await write(pattern, destination, settings, format=format)
@@ -0,0 +1,113 @@
+from __future__ import print_function
+
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from test.cleanup_case import CleanupTestCase
+
+from test.pattern_for_tests import *
+
+import pystitch
+from pystitch import aio
+
+
+class AsyncSink:
+    """An async byte stream like asyncio.StreamWriter."""
+
+    def __init__(self):
+        self.chunks = []
+        self.drains = 0
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    async def drain(self):
+        self.drains += 1
+        await asyncio.sleep(0)
+
+
+class AsyncSource:
+    def __init__(self, data):
+        self.data = data
+
+    async def read(self):
+        return self.data
+
+
+class TestAio(CleanupTestCase):
+
+    def test_read_write_convert_files(self):
+        async def run():
+            await aio.write(get_big_pattern(), "aio.dst")
+            pattern = await aio.read("aio.dst")
+            await aio.convert("aio.dst", "aio.exp")
+            return pattern
+
+        pattern = asyncio.run(run())
+        self.addCleanup(os.remove, "aio.dst")
+        self.addCleanup(os.remove, "aio.exp")
+        assert pattern.stitches == pystitch.read("aio.dst").stitches
+        assert pystitch.read("aio.exp").count_stitch_commands(STITCH) > 0
+
+    def test_streams(self):
+        expected = io.BytesIO()
+        write_pes(get_big_pattern(), expected, {"deterministic": True})
+        sink = AsyncSink()
+
+        async def run():
+            await aio.write(get_big_pattern(), sink, {"deterministic": True}, format="pes")
+            pattern = await aio.read(AsyncSource(expected.getvalue()), format="pes")
+            json_bytes = await aio.encode(pattern, "json")
+            return pattern, json_bytes
+
+        old_chunk = aio.STREAM_CHUNK
+        aio.STREAM_CHUNK = 64
+        try:
+            pattern, json_bytes = asyncio.run(run())
+        finally:
+            aio.STREAM_CHUNK = old_chunk
+        assert b"".join(sink.chunks) == expected.getvalue()
+        assert len(sink.chunks) > 1
+        assert sink.drains == len(sink.chunks)
+        assert pattern.count_stitch_commands(STITCH) > 0
+        assert pystitch.read_json(json_bytes).stitches == pattern.stitches
+
+        try:
+            asyncio.run(aio.read(expected.getvalue()))
+        except ValueError:
+            pass
+        else:
+            assert False, "format is required for bytes"
+
+    def test_bounded_concurrency(self):
+        peak = []
+        executor = ThreadPoolExecutor(4)
+        aio.configure(executor, max_concurrency=2)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(aio.configure)
+
+        active = [0]
+        original = aio._encode
+
+        def counting_encode(*args):
+            active[0] += 1
+            peak.append(active[0])
+            try:
+                return original(*args)
+            finally:
+                active[0] -= 1
+
+        aio._encode = counting_encode
+        self.addCleanup(setattr, aio, "_encode", original)
+
+        async def run():
+            return await asyncio.gather(
+                *[aio.encode(get_big_pattern(), "dst") for _ in range(8)]
+            )
+
+        results = asyncio.run(run())
+        assert len(set(results)) == 1
+        assert len(peak) == 8
+        assert max(peak) <= 2
+        assert aio._max_concurrency == 2
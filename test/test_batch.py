@@ -0,0 +1,59 @@
+from __future__ import print_function
+
+from test.cleanup_case import CleanupTestCase
+
+from test.pattern_for_tests import *
+
+import pystitch
+
+
+class TestConvertMany(CleanupTestCase):
+
+    def make_sources(self, count):
+        sources = []
+        for i in range(count):
+            source = "batch_%d.dst" % i
+            pattern = get_shift_pattern()
+            pattern.stitch_abs(i * 10, i * 10)
+            pystitch.write(pattern, source)
+            self.addCleanup(os.remove, source)
+            sources.append(source)
+        return sources
+
+    def test_convert_many(self):
+        sources = self.make_sources(6)
+        jobs = []
+        for i, source in enumerate(sources):
+            destination = "batch_%d.%s" % (i, ("pes", "exp", "json")[i % 3])
+            jobs.append((source, destination, {"tie_on": True}) if i % 2 else (source, destination))
+        jobs.append(("batch_missing.dst", "batch_missing.pes"))
+        jobs.append((sources[0], "batch_bad.nosuchformat"))
+        results = pystitch.convert_many(jobs, workers=2, chunksize=2)
+        for job in jobs[:6]:
+            self.addCleanup(os.remove, job[1])
+
+        assert [result.index for result in results] == list(range(len(jobs)))
+        for i, result in enumerate(results[:6]):
+            assert result.ok, result.traceback
+            assert result.elapsed > 0
+            expected = "batch_expected_%d.%s" % (i, jobs[i][1].split(".")[-1])
+            pystitch.convert(jobs[i][0], expected, *jobs[i][2:])
+            self.addCleanup(os.remove, expected)
+            assert pystitch.read(expected).stitches == pystitch.read(jobs[i][1]).stitches
+        assert isinstance(results[6].error, (IOError, OSError))
+        assert isinstance(results[7].error, IOError)
+        assert "nosuchformat" in results[7].traceback
+        assert not results[7].ok
+
+    def test_convert_many_unordered_and_in_process(self):
+        sources = self.make_sources(4)
+        jobs = [(source, source[:-3] + "exp") for source in sources]
+        for job in jobs:
+            self.addCleanup(os.remove, job[1])
+        unordered = pystitch.convert_many(jobs, workers=2, chunksize=1, ordered=False)
+        assert sorted(result.index for result in unordered) == [0, 1, 2, 3]
+        assert all(result.ok for result in unordered)
+
+        in_process = list(pystitch.iter_convert_many(jobs, workers=1))
+        assert [result.destination for result in in_process] == [job[1] for job in jobs]
+        assert pystitch.convert_many([]) == []
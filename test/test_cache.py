@@ -0,0 +1,82 @@
+from __future__ import print_function
+
+import shutil
+
+from test.cleanup_case import CleanupTestCase
+
+from test.pattern_for_tests import *
+
+import pystitch
+
+
+class TestConversionCache(CleanupTestCase):
+
+    def make_cache(self, **kwargs):
+        self.addCleanup(shutil.rmtree, "cache_test", True)
+        return pystitch.ConversionCache("cache_test", **kwargs)
+
+    def read_bytes(self, filename):
+        with open(filename, "rb") as f:
+            return f.read()
+
+    def test_convert_hits(self):
+        cache = self.make_cache()
+        pystitch.write(get_shift_pattern(), "cache_source.dst")
+        self.addCleanup(os.remove, "cache_source.dst")
+        self.addCleanup(os.remove, "cache_first.jef")
+        self.addCleanup(os.remove, "cache_second.jef")
+
+        assert not cache.convert("cache_source.dst", "cache_first.jef")
+        assert cache.convert("cache_source.dst", "cache_second.jef")
+        assert (cache.hits, cache.misses) == (1, 1)
+        # The date JEF embeds is pinned, so outputs are reproducible.
+        assert self.read_bytes("cache_first.jef") == self.read_bytes("cache_second.jef")
+
+        assert not cache.convert("cache_source.dst", "cache_second.jef", {"trims": True})
+        pystitch.write(get_big_pattern(), "cache_source.dst")
+        assert not cache.convert("cache_source.dst", "cache_second.jef")
+        assert cache.misses == 3
+
+    def test_write_hits(self):
+        cache = self.make_cache()
+        self.addCleanup(os.remove, "cache_write.json")
+        assert not cache.write(get_shift_pattern(), "cache_write.json")
+        expected = self.read_bytes("cache_write.json")
+        os.remove("cache_write.json")
+        assert cache.write(get_shift_pattern(), "cache_write.json")
+        assert self.read_bytes("cache_write.json") == expected
+
+        pattern = get_shift_pattern()
+        pattern.extras["name"] = "changed"
+        assert not cache.write(pattern, "cache_write.json")
+
+    def test_store_scans_only_to_evict(self):
+        cache = self.make_cache(max_size=1000)
+        scans = []
+        entries = cache._entries
+
+        def counting_entries():
+            scans.append(1)
+            return entries()
+
+        cache._entries = counting_entries
+        for i in range(11):
+            cache.put(cache.key("input%d" % i, "", "dst"), bytes(100))
+        # One scan for the starting size and one to evict down to 900 bytes.
+        assert len(scans) == 2
+        assert cache.size() == 900
+
+    def test_evicts_least_recently_used(self):
+        cache = self.make_cache(max_size=250)
+        keys = [cache.key("input%d" % i, "", "dst") for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, bytes(100))
+            os.utime(cache.path(key), (i, i))
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[1]) == bytes(100)
+        cache.put(cache.key("input3", "", "dst"), bytes(100))
+        assert cache.get(keys[1]) is not None
+        assert cache.get(keys[2]) is None
+        assert cache.size() == 200
+        cache.clear()
+        assert cache.size() == 0
@@ -0,0 +1,95 @@
+from __future__ import print_function
+
+import json
+import shutil
+import struct
+
+from test.cleanup_case import CleanupTestCase
+
+from test.pattern_for_tests import *
+
+import pystitch
+from pystitch.__main__ import main, parse_setting
+
+
+class TestCommandLine(CleanupTestCase):
+
+    def make_tree(self):
+        root = "cli_tree"
+        os.makedirs(os.path.join(root, "sub"))
+        self.addCleanup(shutil.rmtree, root)
+        pattern = get_shift_pattern()
+        pattern.extras["name"] = "shift"
+        pystitch.write(pattern, os.path.join(root, "a.dst"))
+        pystitch.write(get_big_pattern(), os.path.join(root, "sub", "b.pes"))
+        with open(os.path.join(root, "notes.txt"), "w") as f:
+            f.write("not a design")
+        return root
+
+    def test_parse_setting(self):
+        assert parse_setting("tie_on=true") == ("tie_on", True)
+        assert parse_setting("scale=2.5") == ("scale", 2.5)
+        assert parse_setting("version=6t") == ("version", "6t")
+
+    def test_convert_recursive(self, capsys):
+        root = self.make_tree()
+        output = os.path.join(root, "out")
+        status = main(["convert", root, "-r", "-f", "exp", "-d", output, "--json", "-q"])
+        assert status == 0
+        summary = json.loads(capsys.readouterr().out)
+        assert summary["total"] == 2
+        assert summary["failed"] == 0
+        assert os.path.exists(os.path.join(output, "a.exp"))
+        assert os.path.exists(os.path.join(output, "sub", "b.exp"))
+        converted = pystitch.read(os.path.join(output, "sub", "b.exp"))
+        assert converted.count_stitch_commands(STITCH) > 0
+
+    def test_convert_reports_failures(self, capsys):
+        root = self.make_tree()
+        status = main(
+            ["convert", os.path.join(root, "*.dst"), os.path.join(root, "missing.dst"), "-f", "u01"]
+        )
+        self.addCleanup(os.remove, os.path.join(root, "a.u01"))
+        assert status == 1
+        progress = capsys.readouterr().err
+        assert "[2/2]" in progress
+        assert "FAILED" in progress
+        assert main(["convert", os.path.join(root, "a.dst"), "-f", "nosuchformat"]) == 2
+
+    def test_convert_skips_overwriting_source(self, capsys):
+        root = self.make_tree()
+        source = os.path.join(root, "a.dst")
+        with open(source, "rb") as f:
+            original = f.read()
+        status = main(["convert", root, "-r", "-f", "dst", "--json", "-q"])
+        assert status == 1
+        output = capsys.readouterr()
+        assert "skipping %s" % source in output.err
+        summary = json.loads(output.out)
+        assert summary["skipped"] == [source]
+        assert summary["total"] == 1
+        with open(source, "rb") as f:
+            assert f.read() == original
+        assert os.path.exists(os.path.join(root, "sub", "b.dst"))
+
+    def test_info(self, capsys):
+        root = self.make_tree()
+        status = main(["info", os.path.join(root, "a.dst"), os.path.join(root, "sub"), "--json"])
+        assert status == 0
+        infos = json.loads(capsys.readouterr().out)
+        assert [info["format"] for info in infos] == ["dst", "pes"]
+        assert infos[0]["metadata"]["name"] == "shift"
+        assert infos[0]["stitches"] > 0
+        assert len(infos[1]["threads"]) > 0
+
+    def test_thumb(self):
+        root = self.make_tree()
+        output = os.path.join(root, "thumbs")
+        status = main(["thumb", root, "-r", "-s", "48", "-d", output, "-q"])
+        assert status == 0
+        for name in ("a.png", os.path.join("sub", "b.png")):
+            with open(os.path.join(output, name), "rb") as f:
+                header = f.read(24)
+            assert header[:8] == b"\x89PNG\r\n\x1a\n"
+            width, height = struct.unpack(">II", header[16:24])
+            assert max(width, height) <= 48
@@ -169,3 +169,61 @@ class TestConverts(CleanupTestCase):
         print("csv->xxx: ", t_pattern.stitches)
         self.addCleanup(os.remove, file1)
         self.addCleanup(os.remove, file2)
+
+    def test_csv_command_names_roundtrip(self):
+        from pystitch.EmbFunctions import decode_command_name
+
+        file1 = "names.csv"
+        pattern = EmbPattern()
+        pattern.stitch_abs(0, 0)
+        pattern.add_command(encode_thread_change(COLOR_CHANGE, 3, 4, 1))
+        pattern.stitch_abs(10.5, -20)
+        pattern.add_command(encode_thread_change(NEEDLE_SET, None, 2))
+        pattern.stitch_abs(30, 40)
+        pattern.end()
+        write_csv(pattern, file1)
+        self.addCleanup(os.remove, file1)
+        loaded = read_csv(file1)
+        assert loaded.stitches == pattern.stitches
+        assert decode_command_name("COLOR_CHANGE t3 n4 o1") == encode_thread_change(
+            COLOR_CHANGE, 3, 4, 1
+        )
+        assert decode_command_name("STITCH") == STITCH
+
+    def test_plt_qcc_read_streams(self):
+        from io import StringIO
+
+        plt = StringIO("IN;\nSP2;\nPU0,0;\nPD40,-80;\nPD80,-80;\nEN\nPD4000,4000;\n")
+        pattern = read_plt(plt)
+        assert pattern.stitches == [
+            [0, 0, encode_thread_change(NEEDLE_SET, None, 2)],
+            [0.0, -0.0, JUMP],
+            [0.0, -0.0, STITCH],
+            [10.0, 20.0, STITCH],
+            [20.0, 20.0, STITCH],
+        ]
+        qcc = StringIO("X0.100Y0.200\nX1.000Y-1.000\nM02\nX5.000Y5.000\n")
+        pattern = read_qcc(qcc)
+        assert pattern.count_stitch_commands(STITCH) == 2
+        assert pattern.count_stitch_commands(JUMP) == 2
+        assert pattern.stitches[-1][:2] == [254.0, 254.0]
+
+    def test_write_csv_rows_in_chunks(self):
+        from io import BytesIO, TextIOWrapper
+        from pystitch import CsvWriter
+
+        pattern = EmbPattern()
+        for i in range(10000):
+            pattern.stitches.append([i, -i, encode_thread_change(COLOR_CHANGE, i % 3)])
+        for settings in ({}, {"deltas": True}, {"displacement": True}):
+            stream = BytesIO()
+            writes = []
+            stream.write = lambda b, write=stream.write: writes.append(b) or write(b)
+            EmbPattern.write_embroidery(CsvWriter, pattern, stream, settings)
+            stitch_writes = [b for b in writes if b.startswith(b'"*"')]
+            assert len(stitch_writes) == 3
+            lines = stream.getvalue().decode("utf8").splitlines()
+            assert lines[-1].startswith('"*","9999","COLOR_CHANGE t0","9999","-9999"')
+            stream.seek(0)
+            loaded = read_csv(TextIOWrapper(stream, encoding="utf8"))
+            assert loaded.stitches == pattern.stitches
@@ -185,3 +185,51 @@ class TestConverts(CleanupTestCase):
         print("gcode->tbf: ", t_pattern.stitches)
         self.addCleanup(os.remove, file1)
         self.addCleanup(os.remove, file2)
+
+    def test_gcode_parse_command_maps(self):
+        from io import BytesIO
+        from pystitch.GcodeReader import parse
+
+        data = (
+            b"(Thread red)\n"
+            b"G90 ( comment ) X1.5 Y-2\n"
+            b"g1 X 1 0 Y2 ; trailing\r\n"
+            b"/G1 X3 Y4\n"
+            b"\n"
+            b"(unterminated\n"
+            b"G1 X7Y8 (a)(b)"
+        )
+        expected = [
+            {"comment": "Thread red"},
+            {"g": 90.0, "x": 1.5, "y": -2.0, "comment": " comment "},
+            {"g": 1.0, "x": 10.0, "y": 2.0, "comment": " trailing"},
+            {"g": 1.0, "x": 3.0, "y": 4.0},
+            {"comment": "unterminated"},
+            {"g": 1.0, "x": 7.0, "y": 8.0, "comment": "b"},
+        ]
+        assert list(parse(BytesIO(data))) == expected
+        for chunk_size in (1, 2, 5, 13):
+            assert list(parse(BytesIO(data), chunk_size)) == expected
+
+    def test_gcode_read_lines_long_line(self):
+        from io import BytesIO
+
+        from pystitch.GcodeReader import read_lines
+
+        data = b"G1 X1 Y1 " * 50000
+        assert list(read_lines(BytesIO(data), 64)) == [data]
+        assert list(read_lines(BytesIO(data + b"\nM30"), 64)) == [data, b"M30"]
+
+    def test_gcode_read_appends_in_bulk(self):
+        from io import BytesIO
+
+        data = b"G21\nG90\nG1 X1 Y2\nG0 X3 Y4\nM0\nG91\nG1 X1 Y1\nG90\nG1 X5 Y6\nM30\n"
+        pattern = read_gcode(BytesIO(data))
+        assert pattern.stitches == [
+            [-10.0, -20.0, STITCH],
+            [-30.0, -40.0, STITCH],
+            [-30.0, -40.0, COLOR_CHANGE],
+            [-40.0, -50.0, STITCH],
+            [-50.0, -60.0, STITCH],
+            [-50.0, -60.0, END],
+        ]
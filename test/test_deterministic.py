@@ -0,0 +1,60 @@
+from __future__ import print_function
+
+import io
+import random
+
+from test.cleanup_case import CleanupTestCase
+from test.pattern_for_tests import *
+
+from pystitch import format_registry
+from pystitch.EmbFormats import resolve
+
+
+def get_threadless_pattern():
+    pattern = get_big_pattern()
+    # Every other color block gets a random filler thread when written.
+    del pattern.threadlist[1:]
+    return pattern
+
+
+def write_bytes(writer, pattern, settings):
+    text_mode = getattr(writer, "WRITE_FILE_IN_TEXT_MODE", False)
+    stream = io.StringIO() if text_mode else io.BytesIO()
+    EmbPattern.write_embroidery(writer, pattern, stream, settings)
+    return stream.getvalue()
+
+
+class TestDeterministic(CleanupTestCase):
+
+    def test_every_writer_repeats(self):
+        writers = [
+            entry["extension"] for entry in format_registry.formats() if "writer" in entry
+        ]
+        assert "jef" in writers
+        for extension in writers:
+            writer = resolve(format_registry.get(extension)["writer"])
+            outputs = []
+            for seed in (1, 2):
+                random.seed(seed)
+                outputs.append(write_bytes(writer, get_threadless_pattern(), {"deterministic": True}))
+            assert outputs[0] == outputs[1], extension
+
+    def test_seed_and_date(self):
+        pattern = get_threadless_pattern()
+        jef = io.BytesIO()
+        write_jef(pattern, jef, {"deterministic": True})
+        assert b"20000101000000" in jef.getvalue()
+        dated = io.BytesIO()
+        write_jef(pattern, dated, {"deterministic": True, "date": "20240102030405"})
+        assert b"20240102030405" in dated.getvalue()
+
+        first = pattern.copy()
+        first.filler_seed = 1
+        second = pattern.copy()
+        second.filler_seed = 1
+        assert first.get_thread_or_filler(3).color == second.get_thread_or_filler(3).color
+        second.filler_seed = 2
+        assert first.get_thread_or_filler(3).color != second.get_thread_or_filler(3).color
+        # Writing leaves the caller's pattern unseeded.
+        assert pattern.filler_seed is None
+        assert len(pattern.threadlist) == 1
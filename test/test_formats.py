@@ -0,0 +1,123 @@
+from __future__ import print_function
+
+import types
+
+import pytest
+
+from test.cleanup_case import CleanupTestCase
+from test.pattern_for_tests import *
+
+import pystitch
+
+
+def third_party_read(f, out, settings=None):
+    for line in f.read().splitlines():
+        x, y = line.split(b",")
+        out.stitch_abs(int(x), int(y))
+    out.end()
+
+
+def third_party_write(pattern, f, settings=None):
+    for stitch in pattern.stitches:
+        f.write(b"%d,%d\n" % (stitch[0], stitch[1]))
+
+
+class TestFormatRegistry(CleanupTestCase):
+
+    def test_registry_matches_supported_formats(self):
+        formats = list(pystitch.supported_formats())
+        assert len(formats) == len(pystitch.format_registry.formats())
+        for file_type in formats:
+            entry = pystitch.format_registry.get(file_type["extension"])
+            assert entry["description"] == file_type["description"]
+            assert pystitch.format_registry.can_read(file_type["extension"]) == (
+                "reader" in file_type
+            )
+            assert pystitch.format_registry.can_write(file_type["extension"]) == (
+                "writer" in file_type
+            )
+
+    def test_registry_entries_are_read_only(self):
+        entry = pystitch.format_registry.get("dst")
+        with pytest.raises(TypeError):
+            entry["writer"] = None
+        assert pystitch.format_registry.get("DST") is entry
+
+    def test_registry_secondary_extensions(self):
+        assert pystitch.format_registry.get("u02")["extension"] == "u01"
+        assert pystitch.format_registry.get("svgz")["extension"] == "svg"
+        assert pystitch.format_registry.get("spx")["extension"] == "spx"
+        assert pystitch.format_registry.get("s") is None
+        assert pystitch.format_registry.get("nosuchformat") is None
+        # Secondary extensions are for reading only.
+        assert pystitch.format_registry.can_read("u02")
+        assert pystitch.format_registry.can_write("u01")
+        for extension in ("svgz", "u00", "e01", "g"):
+            assert not pystitch.format_registry.can_write(extension)
+            assert pystitch.format_registry.get_writer(extension) is None
+        with pytest.raises(IOError):
+            pystitch.write(get_simple_pattern(), "secondary.svgz")
+        assert not os.path.exists("secondary.svgz")
+
+    def test_registry_mimetype_lookup(self):
+        matches = pystitch.format_registry.get_by_mimetype("application/x-dst")
+        assert [entry["extension"] for entry in matches] == ["dst"]
+        text_formats = pystitch.format_registry.get_by_mimetype("text/plain")
+        assert len(text_formats) > 1
+        assert pystitch.format_registry.get_by_mimetype("application/x-nosuch") == ()
+
+    def test_register_third_party_format(self):
+        module = types.SimpleNamespace(
+            read=third_party_read, write=third_party_write, ENCODE=False
+        )
+        pystitch.register_format(
+            {
+                "description": "Third Party Format",
+                "extension": "tpf",
+                "mimetype": "application/x-tpf",
+                "category": "debug",
+                "reader": module,
+                "writer": module,
+            }
+        )
+        self.addCleanup(pystitch.unregister_format, "tpf")
+        assert any(f["extension"] == "tpf" for f in pystitch.supported_formats())
+
+        file1 = "third_party.tpf"
+        pattern = EmbPattern()
+        pattern += ((0, 0), (10, 20), (30, 40))
+        pystitch.write(pattern, file1)
+        self.addCleanup(os.remove, file1)
+        loaded = pystitch.read(file1)
+        assert loaded.count_stitch_commands(STITCH) == 3
+        assert loaded.stitches[2][:2] == [30, 40]
+
+    def test_unregister_restores_builtin(self):
+        builtin = pystitch.format_registry.get("exp")
+        pystitch.register_format(
+            {
+                "description": "Override",
+                "extension": "exp",
+                "mimetype": "application/x-exp",
+                "category": "embroidery",
+                "writer": types.SimpleNamespace(write=third_party_write),
+            }
+        )
+        assert pystitch.format_registry.get("exp")["description"] == "Override"
+        assert not pystitch.format_registry.can_read("exp")
+        pystitch.unregister_format("exp")
+        assert pystitch.format_registry.get("exp")["description"] == builtin["description"]
+        assert pystitch.format_registry.can_read("exp")
+
+    def test_register_incomplete_format(self):
+        with pytest.raises(ValueError):
+            pystitch.register_format({"extension": "bad"})
+        with pytest.raises(ValueError):
+            pystitch.register_format(
+                {
+                    "description": "No reader or writer",
+                    "extension": "bad",
+                    "mimetype": "application/x-bad",
+                    "category": "debug",
+                }
+            )
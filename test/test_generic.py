@@ -1,5 +1,7 @@
 from __future__ import print_function
 
+import io
+
 from test.cleanup_case import CleanupTestCase
 
 from test.pattern_for_tests import *
@@ -80,3 +82,36 @@ class TestConverts(CleanupTestCase):
         self.addCleanup(os.remove, file1)
         self.addCleanup(os.remove, file2)
         """
+
+    def test_generic_template_fields(self):
+        fields = GenericWriter.template_fields("G00 X{x:.3f} Y{_y:{width}} {{literal}} {extras[0]}")
+        assert fields == {"x", "_y", "width", "extras"}
+        switch = {None: ("{cmd_str}", "{cmd}"), "STITCH": "{dx}"}
+        assert GenericWriter.template_fields(switch) == {"cmd_str", "cmd", "dx"}
+        constant = GenericWriter.compile_template("M30 {{}}\n")
+        assert constant({}) == "M30 {}\n"
+
+    def test_generic_write_computes_referenced_fields(self):
+        pattern = get_fractal_pattern()
+        pattern.fix_color_count()
+        stream = io.BytesIO()
+        writer = GenericWriter.GenericWriter(
+            pattern, stream, {"stitch": "{x},{y}\n", "end": "{index}\n"}
+        )
+        writer.write()
+        assert "dx" not in writer.format_dictionary
+        assert "cmd_str" not in writer.format_dictionary
+        lines = stream.getvalue().decode("utf8").splitlines()
+        assert lines[-1] == str(len(pattern.stitches) - 1)
+        assert len(lines) == pattern.count_stitch_commands(STITCH) + 1
+
+    def test_generic_write_is_buffered(self):
+        pattern = get_big_pattern()
+        stream = io.BytesIO()
+        writes = []
+        stream.write = lambda b, write=stream.write: writes.append(len(b)) or write(b)
+        EmbPattern.write_embroidery(
+            GenericWriter, pattern, stream, {"segment": "{cmd_str} {x},{y}\n"}
+        )
+        assert len(writes) <= len(pattern.stitches) // GenericWriter.WRITE_CHUNK + 1
+        assert sum(writes) == len(stream.getvalue())
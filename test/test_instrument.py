@@ -0,0 +1,46 @@
+from __future__ import print_function
+
+from test.cleanup_case import CleanupTestCase
+
+from test.pattern_for_tests import *
+
+import pystitch
+from pystitch import Instrument
+
+
+class TestInstrument(CleanupTestCase):
+
+    def test_convert_phases(self):
+        pystitch.write(get_big_pattern(), "instrument.dst")
+        self.addCleanup(os.remove, "instrument.dst")
+        self.addCleanup(os.remove, "instrument.pes")
+        instrument = Instrument()
+        pystitch.convert("instrument.dst", "instrument.pes", {"instrument": instrument})
+        phases = [(record.phase, record.depth) for record in instrument.records]
+        assert phases == [
+            ("interpolate_trims", 1),
+            ("read", 0),
+            ("encode", 0),
+            ("interpolate_stop_as_duplicate_color", 1),
+            ("write", 0),
+        ]
+        read = instrument.records[1]
+        assert read.stitches_in == 0
+        assert read.stitches_out == instrument.records[2].stitches_in > 0
+        assert all(record.elapsed >= 0 for record in instrument.records)
+        assert all(record.peak_memory is None for record in instrument.records)
+        assert list(instrument.totals()) == [phase for phase, depth in phases]
+
+    def test_context_and_memory(self):
+        records = []
+        pystitch.write(get_big_pattern(), "instrument.u01", {"instrument": records.append})
+        self.addCleanup(os.remove, "instrument.u01")
+        assert [record.phase for record in records] == ["encode", "write"]
+
+        with Instrument(memory=True) as instrument:
+            pattern = pystitch.read("instrument.u01")
+        assert [record.phase for record in instrument.records] == ["read"]
+        assert instrument.records[0].peak_memory > 0
+        assert instrument.records[0].stitches_out == len(pattern.stitches)
+        pystitch.read("instrument.u01")
+        assert len(instrument.records) == 1
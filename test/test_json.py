@@ -1,8 +1,12 @@
 from __future__ import print_function
 
+import io
+import json
+
 from test.cleanup_case import CleanupTestCase
 
 from test.pattern_for_tests import *
+from pystitch import JsonReader, JsonWriter
 
 
 class TestJson(CleanupTestCase):
@@ -50,3 +54,39 @@ class TestJson(CleanupTestCase):
         for q in range(0, len(pattern.stitches)):
             assert pattern.stitches[q] == w_pattern.stitches[q]
         self.addCleanup(os.remove, file1)
+
+    def test_write_read_json_compact(self):
+        file1 = "compact.json"
+        pattern = get_big_pattern()
+        pattern.fix_color_count()
+        pattern.extras["name"] = "compact"
+        write_json(pattern, file1, {"compact": True})
+        self.addCleanup(os.remove, file1)
+        with open(file1, "r") as f:
+            data = f.read()
+        assert "\n" not in data
+        assert json.loads(data)["stitches"][0][2] == pattern.stitches[0][2]
+        w_pattern = read(file1)
+        assert w_pattern.stitches == pattern.stitches
+        assert w_pattern.threadlist == pattern.threadlist
+        assert w_pattern.extras["name"] == "compact"
+
+    def test_write_json_chunks(self):
+        pattern = EmbPattern()
+        for i in range(10000):
+            pattern.stitches.append([i, -i, encode_thread_change(COLOR_CHANGE, i % 3)])
+        for settings in ({}, {"compact": True}):
+            stream = io.StringIO()
+            EmbPattern.write_embroidery(JsonWriter, pattern, stream, settings)
+            document = json.loads(stream.getvalue())
+            if not settings:
+                assert stream.getvalue() == json.dumps(document, indent=4)
+            loaded = EmbPattern()
+            JsonReader.read(io.StringIO(stream.getvalue()), loaded)
+            assert loaded.stitches == pattern.stitches
+
+    def test_write_json_empty(self):
+        for settings in ({}, {"compact": True}):
+            stream = io.StringIO()
+            EmbPattern.write_embroidery(JsonWriter, EmbPattern(), stream, settings)
+            assert json.loads(stream.getvalue())["stitches"] == []
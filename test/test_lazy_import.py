@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+import pystitch
+
+
+def import_pystitch_with_importtime(statement="import pystitch"):
+    """Runs statement in a fresh interpreter, returning the -X importtime report.
+
+    Each report line is ``import time: <self us> | <cumulative us> | <module>``."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = [field.strip() for field in line[len("import time:") :].split("|")]
+        if not fields[0].isdigit():
+            continue  # header line
+        modules[fields[2]] = int(fields[1])
+    return modules
+
+
+class TestLazyImport:
+    def test_import_does_not_load_format_modules(self):
+        modules = import_pystitch_with_importtime()
+        assert "pystitch" in modules
+        loaded = [
+            name
+            for name in modules
+            if name.startswith("pystitch.") and name.endswith(("Reader", "Writer"))
+        ]
+        assert loaded == []
+        for name in ("GenericWriter", "PecGraphics", "EmbThreadPec", "EmbThreadJef"):
+            assert "pystitch." + name not in modules
+
+    def test_read_imports_only_the_format_used(self):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(sys.path)
+        statement = (
+            "import sys, pystitch; pystitch.format_registry.get_reader('dst'); "
+            "print(' '.join(sorted(m for m in sys.modules if m.endswith(('Reader', 'Writer')))))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", statement],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.split() == ["pystitch.DstReader"]
+
+    def test_lazy_module_attributes(self):
+        assert pystitch.DstReader.read is not None
+        assert pystitch.PngWriter.write is not None
+        assert pystitch.get_graphic_as_string is not None
+        assert "DstReader" in dir(pystitch)
+        from pystitch import GenericWriter, JefWriter
+
+        assert GenericWriter.write is not None
+        assert JefWriter.write is not None
+
+    def test_unknown_attribute(self):
+        try:
+            pystitch.NoSuchReader
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError("expected AttributeError")
+
+    def test_supported_formats_resolves_modules(self):
+        for file_type in pystitch.supported_formats():
+            if "reader" in file_type:
+                assert hasattr(file_type["reader"], "read")
+            if "writer" in file_type:
+                assert hasattr(file_type["writer"], "write")
@@ -1,8 +1,18 @@
 from __future__ import print_function
 
+import copy
+import pickle
+
 from pystitch import *
 from pystitch.EmbThreadPec import *
-from pystitch.EmbThread import build_unique_palette, build_nonrepeat_palette, build_palette
+from pystitch.EmbThread import (
+    ThreadPalette,
+    build_nonrepeat_palette,
+    build_palette,
+    build_unique_palette,
+    find_nearest_color_index,
+    intern_thread,
+)
 
 
 class TestPalettes:
@@ -101,3 +111,111 @@ class TestPalettes:
         palette = build_palette(threadset, pattern.threadlist)
         assert palette[0] == palette[3]  # Red and altered Red
         assert palette[1] == palette[2]  # Blue and Blue
+
+    def test_thread_palette_matches_linear_search(self):
+        """Indexed lookups, gridded or not, agree with the linear search"""
+        import random
+
+        rnd = random.Random(1)
+        threads = [EmbThread(rnd.randint(0, 0xFFFFFF)) for i in range(600)]
+        threads += [EmbThread(t.color) for t in threads[:100]]  # ties pick the later
+        threads[3] = None
+        for chart in (threads, get_thread_set()):
+            thread_palette = ThreadPalette(chart)
+            for i in range(500):
+                color = rnd.randint(0, 0xFFFFFF)
+                index = thread_palette.nearest(color)
+                assert index == find_nearest_color_index(color, chart)
+                assert thread_palette.nearest(color) == index  # memoised
+                excluded = [None if j == index else t for j, t in enumerate(chart)]
+                assert thread_palette.nearest(color, (index,)) == find_nearest_color_index(
+                    color, excluded
+                )
+        assert ThreadPalette(threads)._grid is not None
+
+    def test_shared_thread_palette(self):
+        """The chart palette is built once and never modified by palette builders"""
+        thread_palette = get_thread_palette()
+        assert get_thread_palette() is thread_palette
+        pattern = EmbPattern()
+        for i in range(0, 40):
+            pattern += "black"
+            pattern += "#0000%02x" % (i * 6)
+        before = list(thread_palette)
+        build_unique_palette(thread_palette, pattern.threadlist)
+        build_nonrepeat_palette(thread_palette, pattern.threadlist)
+        assert list(thread_palette) == before
+        assert build_palette(thread_palette, pattern.threadlist) == build_palette(
+            get_thread_set(), pattern.threadlist
+        )
+
+    def test_threads_are_slotted(self):
+        thread = EmbThread("cornflowerblue", "Blue", "4")
+        assert thread.hex_color() == "#6495ed"
+        assert EmbThread("NoSuchColor").color == 0
+        thread.weight = 40
+        for thread in (thread, get_thread_set()[1]):
+            assert not hasattr(thread, "__dict__")
+            try:
+                thread.nonexistent = 1
+            except AttributeError:
+                pass
+            else:
+                raise AssertionError("expected AttributeError")
+            for duplicate in (copy.copy(thread), pickle.loads(pickle.dumps(thread))):
+                assert duplicate == thread
+                assert duplicate.weight == thread.weight
+
+    def test_intern_thread(self):
+        first = intern_thread(EmbThread("#102030", "Navy", "12"))
+        second = intern_thread(EmbThread("#102030", "Navy", "12"))
+        assert first is second
+        assert intern_thread(EmbThread("#102030", "Navy", "13")) is not first
+        assert intern_thread(None) is None
+        unhashable = EmbThread("#102030")
+        unhashable.details = ["list"]
+        assert intern_thread(unhashable) is unhashable
+
+        class NotedThread(EmbThread):
+            pass
+
+        noted = NotedThread("#102030", "Navy", "12")
+        noted.note = "first"
+        other = NotedThread(noted)
+        other.note = "second"
+        assert intern_thread(noted) is noted
+        assert intern_thread(other) is other
+
+    def test_chart_threads_copied_on_read(self):
+        from io import BytesIO
+
+        pattern = EmbPattern()
+        pattern.add_thread("red")
+        pattern.add_thread("blue")
+        pattern.add_block([(0, 0), (10, 10)], 0)
+        pattern.add_block([(0, 0), (10, 10)], 1)
+        stream = BytesIO()
+        write_pec(pattern, stream)
+        first = read_pec(BytesIO(stream.getvalue()))
+        palette = get_thread_palette()
+        shared = {id(thread) for thread in palette}
+        assert not shared.intersection(id(thread) for thread in first.threadlist)
+        first.threadlist[0].set_color(0, 255, 0)
+        first.threadlist[0].description = "edited"
+        second = read_pec(BytesIO(stream.getvalue()))
+        assert second.threadlist[0].hex_color() == "#ed171f"
+        assert second.threadlist[0].description != "edited"
+        assert palette.nearest(0xED171F) == palette.nearest(second.threadlist[0])
+
+        settings = {"intern_threads": True}
+        first = read_pec(BytesIO(stream.getvalue()), settings)
+        second = read_pec(BytesIO(stream.getvalue()), settings)
+        assert first.threadlist[0] is second.threadlist[0]
+        assert id(first.threadlist[0]) not in shared
+
+        stream = BytesIO()
+        write_csv(pattern, stream)
+        first = read_csv(stream.getvalue(), settings)
+        second = read_csv(stream.getvalue(), settings)
+        assert first.threadlist[1] is second.threadlist[1]
+        assert [t.color for t in first.threadlist] == [t.color for t in pattern.threadlist]
@@ -0,0 +1,256 @@
+from __future__ import print_function
+
+import io
+import random
+import struct
+import zlib
+
+import pytest
+
+from test.cleanup_case import CleanupTestCase
+from test.pattern_for_tests import *
+
+from pystitch import PngWriter
+
+
+def rasterise(pattern, mode, linewidth=3, fancy=False):
+    extends = pattern.bounds()
+    pattern = pattern.copy()
+    pattern.translate(-extends[0], -extends[1])
+    draw_buff = PngWriter.PngBuffer(
+        int(extends[2] - extends[0]), int(extends[3] - extends[1])
+    )
+    draw_buff.line_width = linewidth
+    draw_buff.fancy = fancy
+    draw_buff.use_numpy = mode == "numpy"
+    for block, thread in pattern.get_as_stitchblock():
+        draw_buff.set_color(thread.get_red(), thread.get_green(), thread.get_blue(), 255)
+        points = [(int(stitch[0]), int(stitch[1])) for stitch in block]
+        if mode == "plot":
+            for (x0, y0), (x1, y1) in zip(points, points[1:]):
+                draw_buff.plot_line(x0, y0, x1, y1)
+        else:
+            draw_buff.draw_polyline(points)
+    return bytes(draw_buff.buf)
+
+
+def get_edge_pattern():
+    """Thick lines along every edge of the canvas, with a black thread."""
+    pattern = EmbPattern()
+    pattern.add_thread("black")
+    pattern += ((0, 0), (0, 40), (37, 40), (37, 0), (0, 0), (37, 40), (12, 3), (12, 3))
+    pattern.add_thread("#808ff0")
+    pattern.color_change()
+    pattern += ((37, 0), (0, 40), (20, 20))
+    return pattern
+
+
+class TestPng(CleanupTestCase):
+
+    def test_spans_match_plot(self):
+        for pattern in (get_shift_pattern(), get_fractal_pattern(), get_edge_pattern()):
+            pattern.fix_color_count()  # Pin filler threads, which are random.
+            for linewidth in (1, 3, 6):
+                for fancy in (False, True):
+                    expected = rasterise(pattern, "plot", linewidth, fancy)
+                    assert rasterise(pattern, "spans", linewidth, fancy) == expected
+
+    def test_numpy_matches_plot(self):
+        pytest.importorskip("numpy")
+        for pattern in (get_shift_pattern(), get_fractal_pattern(), get_edge_pattern()):
+            pattern.fix_color_count()  # Pin filler threads, which are random.
+            for linewidth in (1, 3, 6):
+                for fancy in (False, True):
+                    expected = rasterise(pattern, "plot", linewidth, fancy)
+                    assert rasterise(pattern, "numpy", linewidth, fancy) == expected
+
+    def test_translucent_lines_blend(self):
+        draw_buff = PngWriter.PngBuffer(10, 10)
+        draw_buff.background(0, 0, 255, 255)
+        draw_buff.set_color(255, 0, 0, 128)
+        draw_buff.draw_polyline([(0, 5), (9, 5)])
+        idx = (draw_buff.width * 6 + 4) * 4
+        assert draw_buff.buf[idx : idx + 4] == bytes((128, 0, 127, 251))
+
+    def png_size(self, data):
+        assert data[:8] == b"\x89PNG\r\n\x1a\n"
+        return struct.unpack(">II", data[16:24])
+
+    def test_thumbnail_max_size(self):
+        pattern = get_big_pattern()
+        full = io.BytesIO()
+        write_png(pattern, full)
+        assert max(self.png_size(full.getvalue())) > 64
+        for supersample in (1, 2, 4):
+            thumb = io.BytesIO()
+            write_png(pattern, thumb, {"max_size": 64, "supersample": supersample})
+            width, height = self.png_size(thumb.getvalue())
+            assert max(width, height) <= 64
+            assert max(width, height) >= 60
+
+    def test_thumbnail_zero_extent(self):
+        single = EmbPattern()
+        single.add_thread("black")
+        single.add_stitch_absolute(STITCH, 5, 5)
+        for pattern in (EmbPattern(), single):
+            for max_size in (1, 2, 64):
+                thumb = io.BytesIO()
+                write_png(pattern, thumb, {"max_size": max_size})
+                assert max(self.png_size(thumb.getvalue())) <= max_size
+
+    def test_thumbnail_smaller_than_line_width(self):
+        for max_size in (1, 2, 3):
+            for supersample in (1, 2, 4):
+                thumb = io.BytesIO()
+                settings = {"max_size": max_size, "supersample": supersample}
+                write_png(get_big_pattern(), thumb, settings)
+                assert self.png_size(thumb.getvalue()) == (max_size, max_size)
+
+    def test_supersample_edges_symmetric(self):
+        pattern = EmbPattern()
+        pattern.add_thread("black")
+        pattern += ((0, 0), (0, 40), (40, 40), (40, 0), (0, 0))
+        for supersample in (1, 2, 4):
+            stream = io.BytesIO()
+            write_png(pattern, stream, {"supersample": supersample})
+            width, height, pixels, filters = decode_png(stream.getvalue())
+            assert (width, height) == (43, 43)
+            row = [pixels[(21 * width + x) * 4 + 3] for x in range(width)]
+            column = [pixels[(y * width + 21) * 4 + 3] for y in range(height)]
+            assert row[:3] == column[:3] == [251, 251, 251]
+            assert row == row[::-1]
+            assert column == column[::-1]
+
+    def test_thumbnail_does_not_enlarge(self):
+        pattern = get_simple_pattern()
+        pattern.fix_color_count()
+        full = io.BytesIO()
+        write_png(pattern, full, {"guides": True})
+        thumb = io.BytesIO()
+        write_png(pattern, thumb, {"max_size": 4096, "guides": True})
+        assert thumb.getvalue() == full.getvalue()
+
+    def test_thumbnail_scale(self):
+        full = io.BytesIO()
+        write_png(get_big_pattern(), full)
+        thumb = io.BytesIO()
+        write_png(get_big_pattern(), thumb, {"scale": 0.25, "supersample": 2})
+        full_width, full_height = self.png_size(full.getvalue())
+        width, height = self.png_size(thumb.getvalue())
+        assert abs(width - full_width / 4) <= 3
+        assert abs(height - full_height / 4) <= 3
+
+    def test_downsample_weights_by_alpha(self):
+        # One opaque red pixel and three transparent ones average to red.
+        buf = bytearray(b"\xff\x00\x00\xff" + b"\x00" * 12)
+        out, width, height = PngWriter.downsample(buf, 2, 2, 2)
+        assert (width, height) == (1, 1)
+        assert out == bytearray(b"\xff\x00\x00\x40")
+
+    def test_downsample_numpy_matches_python(self):
+        pytest.importorskip("numpy")
+        random.seed(2)
+        buf = bytearray(random.getrandbits(8) for _ in range(4 * 19 * 13))
+        expected = PngWriter.downsample(buf, 19, 13, 4)
+        numpy = PngWriter.numpy
+        PngWriter.numpy = None
+        try:
+            assert PngWriter.downsample(buf, 19, 13, 4) == expected
+        finally:
+            PngWriter.numpy = numpy
+
+
+def decode_png(data):
+    """Minimal RGBA8 PNG decoder used to check the encoder's filters."""
+    assert data[:8] == PngWriter.PNG_SIGNATURE
+    pos = 8
+    idat = b""
+    while pos < len(data):
+        length, tag = struct.unpack(">I4s", data[pos : pos + 8])
+        chunk = data[pos + 8 : pos + 8 + length]
+        if tag == b"IHDR":
+            width, height = struct.unpack(">II", chunk[:8])
+        elif tag == b"IDAT":
+            idat += chunk
+        pos += 12 + length
+    raw = zlib.decompress(idat)
+    stride = width * 4
+    out = bytearray()
+    previous = bytearray(stride)
+    filters = set()
+    for y in range(height):
+        line = raw[y * (stride + 1) : (y + 1) * (stride + 1)]
+        filter_type = line[0]
+        filters.add(filter_type)
+        row = bytearray(line[1:])
+        for i in range(stride):
+            a = row[i - 4] if i >= 4 else 0
+            b = previous[i]
+            c = previous[i - 4] if i >= 4 else 0
+            if filter_type == 1:
+                row[i] = (row[i] + a) & 0xFF
+            elif filter_type == 2:
+                row[i] = (row[i] + b) & 0xFF
+            elif filter_type == 4:
+                row[i] = (row[i] + PngWriter._paeth_predictor(a, b, c)) & 0xFF
+        out += row
+        previous = row
+    return width, height, bytes(out), filters
+
+
+class TestPngEncoder(CleanupTestCase):
+
+    def get_image(self):
+        draw_buff = PngWriter.PngBuffer(40, 30)
+        draw_buff.background(10, 200, 30, 255)
+        draw_buff.fancy = True
+        draw_buff.set_color(200, 40, 90, 255)
+        draw_buff.draw_polyline([(0, 0), (39, 29), (5, 20), (30, 2)])
+        return draw_buff
+
+    def test_filters_round_trip(self):
+        draw_buff = self.get_image()
+        for png_filter in ("none", "sub", "up", "paeth", "adaptive"):
+            for compression in (0, 1, 9):
+                data = PngWriter.write_png(
+                    draw_buff.buf, draw_buff.width, draw_buff.height, compression, png_filter
+                )
+                width, height, pixels, filters = decode_png(data)
+                assert (width, height) == (draw_buff.width, draw_buff.height)
+                assert pixels == bytes(draw_buff.buf)
+                if png_filter == "adaptive":
+                    assert len(filters) > 1
+
+    def test_filters_numpy_match_python(self):
+        pytest.importorskip("numpy")
+        draw_buff = self.get_image()
+        size = (draw_buff.width, draw_buff.height)
+        expected = PngWriter.write_png(draw_buff.buf, *size, 6, "adaptive")
+        numpy = PngWriter.numpy
+        PngWriter.numpy = None
+        try:
+            data = PngWriter.write_png(draw_buff.buf, *size, 6, "adaptive")
+        finally:
+            PngWriter.numpy = numpy
+        assert data == expected
+
+    def test_large_image_is_split_into_idat_chunks(self):
+        random.seed(3)
+        width = height = 600
+        buf = bytearray(random.getrandbits(8) for _ in range(width * height * 4))
+        stream = io.BytesIO()
+        PngWriter.stream_png(stream, buf, width, height, compression=1)
+        data = stream.getvalue()
+        assert data.count(b"IDAT") == 2
+        assert decode_png(data)[2] == bytes(buf)
+
+    def test_write_settings(self):
+        pattern = get_big_pattern()
+        pattern.fix_color_count()
+        default = io.BytesIO()
+        write_png(pattern, default, {"compression": 9})
+        fast = io.BytesIO()
+        write_png(pattern, fast, {"compression": 1, "png_filter": "up"})
+        assert decode_png(fast.getvalue())[:3] == decode_png(default.getvalue())[:3]
+        with pytest.raises(ValueError):
+            write_png(get_big_pattern(), io.BytesIO(), {"png_filter": "average"})
@@ -0,0 +1,88 @@
+from __future__ import print_function
+
+import io
+
+from test.cleanup_case import CleanupTestCase
+
+from test.pattern_for_tests import *
+
+import pystitch
+from pystitch import CancelToken, ConversionCancelled
+
+
+def get_long_pattern(count=5000):
+    pattern = EmbPattern()
+    pattern.add_thread("red")
+    for i in range(count):
+        pattern.stitch_abs((i * 7) % 300, (i * 13) % 200)
+    pattern.color_change()
+    pattern.add_thread("blue")
+    for i in range(count):
+        pattern.stitch_abs((i * 11) % 300, (i * 3) % 200)
+    pattern.end()
+    return pattern
+
+
+class TestProgress(CleanupTestCase):
+
+    def test_read_progress(self):
+        for extension in ("dst", "exp", "jef", "pec", "pes", "u01", "vp3"):
+            filename = "progress." + extension
+            pystitch.write(get_long_pattern(), filename)
+            self.addCleanup(os.remove, filename)
+            calls = []
+            pystitch.read(filename, {"progress": lambda done, total: calls.append((done, total))})
+            assert len(calls) > 1, extension
+            assert len(calls) <= 103, extension
+            assert calls[-1][0] == calls[-1][1], extension
+            assert [done for done, total in calls] == sorted(done for done, total in calls)
+
+    def test_encode_and_png_progress(self):
+        calls = []
+        plain = io.BytesIO()
+        write_png(get_long_pattern(), plain)
+        reported = io.BytesIO()
+        write_png(
+            get_long_pattern(),
+            reported,
+            {"progress": lambda done, total: calls.append((done, total))},
+        )
+        assert reported.getvalue() == plain.getvalue()
+        # The encoder reports first, then the rasteriser.
+        finishes = [i for i, (done, total) in enumerate(calls) if done == total]
+        assert len(finishes) == 2
+        assert finishes[-1] == len(calls) - 1
+
+    def test_cancel(self):
+        pystitch.write(get_long_pattern(), "progress.dst")
+        self.addCleanup(os.remove, "progress.dst")
+        token = CancelToken()
+
+        def cancel_later(done, total):
+            if done > total // 2:
+                token.cancel()
+
+        for action in (
+            lambda settings: pystitch.read("progress.dst", settings),
+            lambda settings: pystitch.read("progress.dst", dict(settings, mmap=True)),
+            lambda settings: write_dst(get_long_pattern(), io.BytesIO(), settings),
+            lambda settings: write_png(get_long_pattern(), io.BytesIO(), dict(settings, encode=False)),
+        ):
+            token = CancelToken()
+            try:
+                action({"progress": cancel_later, "cancel": token})
+            except ConversionCancelled:
+                pass
+            else:
+                assert False, "not cancelled"
+            assert token.cancelled
+
+        cancelled = CancelToken()
+        cancelled.cancel()
+        try:
+            pystitch.convert("progress.dst", "progress.csv", {"cancel": cancelled})
+        except ConversionCancelled:
+            pass
+        else:
+            assert False, "not cancelled"
+        assert not os.path.exists("progress.csv")
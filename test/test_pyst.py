@@ -0,0 +1,100 @@
+from __future__ import print_function
+
+from test.cleanup_case import CleanupTestCase
+
+from test.pattern_for_tests import *
+
+import io
+
+import pytest
+
+
+class TestPyst(CleanupTestCase):
+
+    def round_trip(self, pattern, settings=None):
+        stream = io.BytesIO()
+        write_pyst(pattern, stream)
+        return read_pyst(stream.getvalue(), settings)
+
+    def test_pyst_round_trip(self):
+        pattern = get_big_pattern()
+        pattern.add_stitch_absolute(COLOR_CHANGE | 0xFF0A0B00, 1, -1)
+        pattern.threadlist.append(None)
+        pattern.extras["name"] = "pyst"
+        pattern.extras["hoop"] = (100, 100)
+        pattern.extras["raw"] = b"\x00\xff"
+        pattern.extras["unsupported"] = object()
+        loaded = self.round_trip(pattern)
+        assert loaded.stitches == pattern.stitches
+        assert loaded.stitches[-1][2] == COLOR_CHANGE | 0xFF0A0B00
+        assert len(loaded.threadlist) == len(pattern.threadlist)
+        assert loaded.threadlist[-1] is None
+        for a, b in zip(loaded.threadlist[:-1], pattern.threadlist[:-1]):
+            assert (a.color, a.description, a.catalog_number) == (
+                b.color,
+                b.description,
+                b.catalog_number,
+            )
+        assert loaded.extras["name"] == "pyst"
+        assert loaded.extras["hoop"] == (100, 100)
+        assert loaded.extras["raw"] == b"\x00\xff"
+        assert "unsupported" not in loaded.extras
+        assert (loaded._previousX, loaded._previousY) == (pattern._previousX, pattern._previousY)
+        loaded.add_stitch_relative(STITCH, 5, 5)
+        assert loaded.stitches[-1][:2] == [6, 4]
+
+    def test_pyst_float_coordinates(self):
+        pattern = EmbPattern()
+        pattern.add_stitch_absolute(STITCH, 0.25, -1.5)
+        pattern.add_stitch_absolute(STITCH, 3, 4)
+        pattern.add_stitch_absolute(STITCH, 2**40, 4.0)
+        pattern.add_stitch_absolute(END, 3, 4)
+        loaded = self.round_trip(pattern)
+        assert loaded.stitches == pattern.stitches
+        for stitch, original in zip(loaded.stitches, pattern.stitches):
+            assert list(map(type, stitch)) == list(map(type, original))
+
+    def test_pyst_wide_values(self):
+        pattern = EmbPattern()
+        pattern.add_stitch_absolute(STITCH | 1 << 40, -(2**40), 2**62)
+        pattern.add_stitch_absolute(END, 0, 0)
+        loaded = self.round_trip(pattern)
+        assert loaded.stitches == pattern.stitches
+
+    def test_pyst_rejects_unstorable_values(self):
+        for stitches in (
+            [[0, 0, 1 << 64]],
+            [[0, 0, -1 - 2**63]],
+            [[0.5, 0, STITCH], [2**60 + 1, 0, STITCH]],
+            [[None, 0, STITCH]],
+        ):
+            pattern = EmbPattern()
+            pattern.stitches.extend(stitches)
+            with pytest.raises(ValueError):
+                write_pyst(pattern, io.BytesIO())
+
+    def test_pyst_file_mmap(self):
+        pattern = get_shift_pattern()
+        write_pyst(pattern, "file.pyst")
+        self.addCleanup(os.remove, "file.pyst")
+        assert read("file.pyst").stitches == pattern.stitches
+        assert read("file.pyst", {"mmap": True}).stitches == pattern.stitches
+
+    def test_pyst_empty(self):
+        loaded = self.round_trip(EmbPattern())
+        assert loaded.stitches == []
+        assert loaded.threadlist == []
+
+    def test_pyst_rejects_bad_data(self):
+        stream = io.BytesIO()
+        write_pyst(get_shift_pattern(), stream)
+        data = stream.getvalue()
+        with pytest.raises(ValueError):
+            read_pyst(b"NOPE" + data[4:])
+        with pytest.raises(ValueError):
+            read_pyst(data[:-16])
+        with open("truncated.pyst", "wb") as f:
+            f.write(data[:-16])
+        self.addCleanup(os.remove, "truncated.pyst")
+        with pytest.raises(ValueError):
+            read("truncated.pyst", {"mmap": True})
@@ -0,0 +1,69 @@
+from __future__ import print_function
+
+import io
+import mmap
+
+from test.cleanup_case import CleanupTestCase
+from test.pattern_for_tests import *
+
+from pystitch.ReadHelper import BufferReader, read_view
+
+
+class TestReadBuffers(CleanupTestCase):
+
+    def get_file_bytes(self, write_function, pattern):
+        stream = io.BytesIO()
+        write_function(pattern, stream)
+        return stream.getvalue()
+
+    def test_read_buffer_types_match_file_read(self):
+        for write_function, read_function in (
+            (write_dst, read_dst),
+            (write_exp, read_exp),
+            (write_jef, read_jef),
+            (write_pec, read_pec),
+            (write_pes, read_pes),
+            (write_tbf, read_tbf),
+            (write_u01, read_u01),
+            (write_xxx, read_xxx),
+        ):
+            data = self.get_file_bytes(write_function, get_big_pattern())
+            expected = read_function(io.BytesIO(data))
+            for buffer in (data, bytearray(data), memoryview(data)):
+                pattern = read_function(buffer)
+                assert pattern.stitches == expected.stitches
+                assert pattern.threadlist == expected.threadlist
+
+    def test_read_text_format_from_bytes(self):
+        data = self.get_file_bytes(write_csv, get_big_pattern())
+        pattern = read_csv(data)
+        assert pattern.count_stitch_commands(STITCH) == 16 * 5
+        assert pattern.count_threads() == 16
+
+    def test_read_mmap_setting(self):
+        file1 = "mmap.dst"
+        write_dst(get_big_pattern(), file1)
+        self.addCleanup(os.remove, file1)
+        pattern = read(file1, {"mmap": True})
+        assert pattern.stitches == read(file1).stitches
+
+    def test_read_mmap_object(self):
+        file1 = "mmap_object.jef"
+        write_jef(get_big_pattern(), file1)
+        self.addCleanup(os.remove, file1)
+        with open(file1, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                pattern = read_jef(mapped)
+        assert pattern.stitches == read(file1).stitches
+
+    def test_read_view_is_not_a_copy(self):
+        data = bytearray(b"\x01\x02\x03\x04")
+        with BufferReader(data) as stream:
+            stream.seek(1)
+            view = read_view(stream, 2)
+            data[1] = 0xFF
+            assert view.tolist() == [0xFF, 0x03]
+            assert stream.tell() == 3
+            assert stream.read() == b"\x04"
+            view.release()
+        data.append(0)  # resizable again once the reader is closed.
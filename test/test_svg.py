@@ -0,0 +1,66 @@
+from __future__ import print_function
+
+import io
+from xml.etree.ElementTree import fromstring
+
+from test.cleanup_case import CleanupTestCase
+from test.pattern_for_tests import *
+
+from pystitch import SvgWriter
+
+
+def svg_paths(data):
+    root = fromstring(data)
+    return [element.get("d") for element in root.iter("{http://www.w3.org/2000/svg}path")]
+
+
+class TestSvg(CleanupTestCase):
+
+    def test_stream_matches_dom(self):
+        pattern = get_shift_pattern()
+        pattern.fix_color_count()
+        stream = io.BytesIO()
+        write_svg(pattern, stream)
+        dom = io.BytesIO()
+        SvgWriter.create_svg_dom(pattern.get_normalized_pattern()).write(dom)
+        assert stream.getvalue() == dom.getvalue()
+
+    def test_empty_block(self):
+        pattern = EmbPattern()
+        pattern.add_thread("red")
+        pattern.get_as_stitchblock = lambda: iter([([], pattern.threadlist[0])])
+        dom = io.BytesIO()
+        SvgWriter.create_svg_dom(pattern).write(dom)
+        assert svg_paths(dom.getvalue()) == ["M"]
+
+    def test_empty_pattern(self):
+        stream = io.BytesIO()
+        write_svg(EmbPattern(), stream)
+        assert fromstring(stream.getvalue()).get("viewBox") == "0 0 0 0"
+
+    def test_precision(self):
+        pattern = EmbPattern()
+        pattern += ((0.123456, 1.5), (10.0, -0.0001), (2.0499, 3.96))
+        stream = io.BytesIO()
+        write_svg(pattern, stream, {"precision": 1})
+        assert svg_paths(stream.getvalue()) == ["M 0.1,1.5 10,0 2,4"]
+        root = fromstring(stream.getvalue())
+        assert root.get("width") == "9.9"
+
+    def test_simplify(self):
+        pattern = EmbPattern()
+        # A straight run, a sub-unit wobble, then doubling back on itself.
+        pattern += ((0, 0), (10, 0), (20, 0), (30, 0.2), (40, 0), (20, 0), (0, 0))
+        stream = io.BytesIO()
+        write_svg(pattern, stream, {"simplify": 0.5})
+        assert svg_paths(stream.getvalue()) == ["M 0,0 40,0 0,0"]
+
+    def test_simplify_keeps_shape(self):
+        points = [(x, (x % 7) * 3) for x in range(100)]
+        simplified = SvgWriter.simplify_points(points, 0.5)
+        assert simplified[0] == points[0] and simplified[-1] == points[-1]
+        for x, y in points:
+            assert any(
+                SvgWriter._segment_distance_sq(x, y, a[0], a[1], b[0], b[1]) <= 0.25
+                for a, b in zip(simplified, simplified[1:])
+            )
@@ -0,0 +1,184 @@
+from __future__ import print_function
+
+import io
+import os
+import threading
+
+import pytest
+
+from test.cleanup_case import CleanupTestCase
+from test.pattern_for_tests import *
+
+from pystitch import format_registry
+from pystitch.PecWriter import write_pec_block
+from pystitch.Vp3Writer import vp3_patch_byte_offset
+from pystitch.WriteHelper import (
+    BinaryBuilder,
+    pad_to,
+    write_int_16le,
+    write_int_24be,
+    write_int_32be,
+)
+
+BINARY_WRITERS = (
+    write_dst,
+    write_exp,
+    write_jef,
+    write_pec,
+    write_pes,
+    write_tbf,
+    write_u01,
+    write_vp3,
+    write_xxx,
+)
+
+
+class CountingStream(io.RawIOBase):
+    def __init__(self):
+        self.data = bytearray()
+        self.writes = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.writes += 1
+        self.data += b
+        return len(b)
+
+
+class TrickleStream(io.RawIOBase):
+    """Forward-only stream taking at most 1000 bytes per write, like a socket."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        b = bytes(b[:1000])
+        self.data += b
+        return len(b)
+
+
+class StalledStream(io.RawIOBase):
+    """Raw stream accepting 10 bytes, then returning result for every write."""
+
+    def __init__(self, result):
+        self.data = bytearray()
+        self.result = result
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        if self.data:
+            return self.result
+        self.data += b[:10]
+        return 10
+
+
+class WriteOnlySink:
+    """Object with only a write() method, returning nothing."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, b):
+        self.data += b
+
+
+class TestWriteBuffers(CleanupTestCase):
+
+    def test_builder_placeholder_patch(self):
+        out = BinaryBuilder()
+        out.write(b"AB")
+        offset = out.placeholder(">I")
+        write_int_16le(out, -2)
+        write_int_24be(out, 0x010203)
+        out.patch(offset, ">I", out.tell())
+        assert offset == 2
+        assert out.getvalue() == b"AB\x00\x00\x00\x0b\xfe\xff\x01\x02\x03"
+        out.pack("<hB", -1, 7)
+        assert out.getvalue()[-3:] == b"\xff\xff\x07"
+        assert len(out) == 14
+
+    def test_helpers_mask_values(self):
+        out = BinaryBuilder()
+        write_int_32be(out, -1)
+        write_int_16le(out, 0x12345)
+        assert out.getvalue() == b"\xff\xff\xff\xff\x45\x23"
+
+    def test_helpers_on_seekable_file(self):
+        pattern = get_big_pattern()
+        extends = pattern.bounds()
+        results = []
+        for out in (BinaryBuilder(), io.BytesIO()):
+            out.write(b"AB")
+            write_pec_block(pattern, out, extends)
+            offset = out.tell()
+            write_int_32be(out, 0)
+            out.write(b"CDE")
+            vp3_patch_byte_offset(out, offset)
+            pad_to(out, 0x2000, b"\x20")
+            results.append(out.getvalue())
+        assert results[0] == results[1]
+        assert len(results[1]) == 0x2000
+
+    def test_write_to_write_only_sink(self):
+        sink = WriteOnlySink()
+        write_exp(get_big_pattern(), sink)
+        reference = io.BytesIO()
+        write_exp(get_big_pattern(), reference)
+        assert bytes(sink.data) == reference.getvalue()
+
+    def test_write_to_stalled_stream(self):
+        out = BinaryBuilder()
+        out.write(bytes(100))
+        with pytest.raises(BlockingIOError) as raised:
+            out.write_to(StalledStream(None))
+        assert raised.value.characters_written == 10
+        with pytest.raises(IOError):
+            out.write_to(StalledStream(0))
+
+    def test_binary_writers_write_once(self):
+        settings = {"date": "20240101000000"}  # Jef stores the write time.
+        for write in BINARY_WRITERS:
+            stream = CountingStream()
+            write(get_big_pattern(), stream, settings)
+            assert stream.writes == 1, write.__name__
+            reference = io.BytesIO()
+            write(get_big_pattern(), reference, settings)
+            assert bytes(stream.data) == reference.getvalue(), write.__name__
+
+    def test_binary_writers_non_seekable(self):
+        settings = {"date": "20240101000000"}
+        for extension in ("dst", "edr", "exp", "inf", "jef", "pec", "pes", "pmv", "tbf",
+                          "u01", "vp3", "xxx"):
+            writer = format_registry.get_writer(extension)
+            stream = TrickleStream()
+            assert not stream.seekable()
+            EmbPattern.write_embroidery(writer, get_big_pattern(), stream, settings)
+            reference = io.BytesIO()
+            EmbPattern.write_embroidery(writer, get_big_pattern(), reference, settings)
+            assert bytes(stream.data) == reference.getvalue(), extension
+
+    def test_write_pes_to_pipe(self):
+        read_fd, write_fd = os.pipe()
+        received = []
+
+        def drain():
+            with os.fdopen(read_fd, "rb") as pipe:
+                received.append(pipe.read())
+
+        reader = threading.Thread(target=drain)
+        reader.start()
+        with os.fdopen(write_fd, "wb", buffering=0) as pipe:
+            write_pes(get_big_pattern(), pipe, {"version": 6})
+        reader.join()
+        reference = io.BytesIO()
+        write_pes(get_big_pattern(), reference, {"version": 6})
+        assert received[0] == reference.getvalue()
+        pattern = read_pes(io.BytesIO(received[0]))
+        assert pattern.count_stitches() == get_big_pattern().count_stitches()